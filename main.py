@@ -1,89 +1,323 @@
-from utils.extract import scrape_products
-from utils.transform import transform_data
-from utils.load import load_to_csv, load_to_google_sheets, load_to_postgresql
+import argparse
+import signal
+from utils.extract import scrape_products, scrape_product_batches, BATCH_SIZE
+from utils.checkpoint import MAX_AGE
+from utils.resources import PipelineResources
+from utils.scheduler import Scheduler, CronSchedule, IntervalSchedule, RunLock
+from utils.transform import transform_data, transform_batches, RejectionReport
+from utils.sinks import create_sinks, load_dataframe, stream_batches
+from utils import metrics
 
-def main():
+def print_rejection_report(report):
     """
-    Fungsi utama untuk menjalankan seluruh pipeline ETL.
-    """
-    print("=" * 50)
-    print("FASHION STUDIO ETL PIPELINE")
-    print("=" * 50)
+    Mencetak jumlah baris yang ditolak per aturan validasi.
     
-    # 1. Tahap Ekstraksi
-    print("\n🔍 Tahap 1: Ekstraksi data dari website...")
-    print("Mengambil data dari https://fashion-studio.dicoding.dev")
+    Args:
+        report (RejectionReport): Laporan hasil transformasi
+    """
+    print(f"⚠️ Data ditolak: {report.rejected_rows} produk")
+    for name, entry in report.rules.items():
+        if entry['rejected']:
+            print(f"   - {name}: {entry['rejected']}")
+
+def print_sink_results(results):
+    """
+    Mencetak status, waktu, dan throughput setiap sink.
     
-    raw_products = scrape_products()
-    if not raw_products:
-        print("❌ Ekstraksi gagal, tidak ada data yang diambil. Pipeline dihentikan.")
-        return
+    Args:
+        results (list): Hasil per sink dari `load_dataframe` atau `stream_batches`
+    """
+    for result in results:
+        status = "✅" if result['success'] else "❌"
+        detail = f" ({result['error']})" if result['error'] else ""
+        print(f"{status} {result['name']}: {result['rows']} baris, {result['batches']} batch, "
+              f"{result['seconds']:.2f} detik, {result['rows_per_second']:.0f} baris/detik{detail}")
 
-    print(f"✅ Ekstraksi selesai! Total produk ditemukan: {len(raw_products)}")
+def print_metrics(collector):
+    """
+    Mencetak rincian waktu, CPU, dan baris per tahap, serta puncak RSS proses.
+    
+    Args:
+        collector (metrics.Collector): Collector hasil instrumentasi
+    """
+    print("⏱️ Rincian per tahap:")
+    summary = collector.summary()
+    for entry in summary:
+        rows_text = f", {entry['rows']} baris" if entry['rows'] is not None else ""
+        count_text = f" x{entry['count']}" if entry['count'] > 1 else ""
+        print(f"   - {entry['name']}{count_text}: {entry['wall_seconds']:.2f} detik, "
+              f"CPU {entry['cpu_seconds']:.2f} detik{rows_text}")
+    peaks = [entry['process_max_rss_bytes'] for entry in summary
+             if entry['process_max_rss_bytes'] is not None]
+    if peaks:
+        print(f"   Puncak RSS proses: {max(peaks) / (1024 * 1024):.1f} MB")
 
-    # 2. Tahap Transformasi
-    print("\n🔄 Tahap 2: Transformasi dan pembersihan data...")
+def finish_metrics(collector, metrics_path):
+    """
+    Mencetak rincian instrumentasi, menyimpannya, lalu menonaktifkan
+    instrumentasi. Tidak melakukan apa pun jika metrik tidak diminta.
     
-    cleaned_df = transform_data(raw_products)
-    if cleaned_df.empty:
-        print("❌ Transformasi gagal, tidak ada data valid. Pipeline dihentikan.")
+    Args:
+        collector (metrics.Collector): Collector hasil instrumentasi, atau None
+        metrics_path (str): File tujuan (.json atau .prom)
+    """
+    if collector is None:
         return
-        
-    print(f"✅ Transformasi selesai! Data bersih: {len(cleaned_df)} baris")
-    print("\nContoh data yang sudah bersih:")
-    print(cleaned_df.head())
-    
-    print(f"\nInfo dataset:")
-    print(f"- Kolom: {list(cleaned_df.columns)}")
-    print(f"- Tipe data:")
-    print(cleaned_df.dtypes)
+    metrics.disable()
+    print_metrics(collector)
+    try:
+        collector.export(metrics_path)
+        print(f"📈 Metrik disimpan ke {metrics_path}")
+    except OSError as e:
+        print(f"❌ Error saat menyimpan metrik: {e}")
 
-    # 3. Tahap Pemuatan
-    print("\n💾 Tahap 3: Memuat data ke repositori...")
+def print_failed_pages(checkpoint):
+    """
+    Mencetak halaman yang gagal diambil; halaman ini diambil ulang pada run
+    berikutnya, sedangkan halaman lain dilayani dari checkpoint.
     
-    success_count = 0
+    Args:
+        checkpoint (PageCheckpoint): Checkpoint ekstraksi
+    """
+    failed = checkpoint.failed_pages()
+    if failed:
+        print(f"⚠️ Halaman gagal: {failed}. Jalankan ulang untuk mengambil halaman ini saja.")
+
+def main(compact=False, metrics_path=None, checkpoint_max_age=MAX_AGE, resources=None):
+    """
+    Fungsi utama untuk menjalankan seluruh pipeline ETL.
     
+    Args:
+        compact (bool): Pakai skema DataFrame ringkas untuk menghemat memori
+        metrics_path (str): File untuk menyimpan metrik (.json atau .prom)
+        checkpoint_max_age (float): Umur maksimum (detik) hasil halaman di
+            checkpoint yang dipakai ulang tanpa diambil lagi
+        resources (PipelineResources): Session, cache, dan koneksi yang
+            dipakai ulang antar run; default dibuat baru
+    """
+    owns_resources = resources is None
+    if owns_resources:
+        resources = PipelineResources(checkpoint_max_age=checkpoint_max_age)
     try:
-        # Memuat ke CSV
-        print("\n📄 Menyimpan ke CSV...")
-        load_to_csv(cleaned_df, 'products.csv')
-        success_count += 1
+        # Instrumentasi hanya aktif jika metrik diminta dengan --metrics
+        collector = metrics.enable() if metrics_path else None
+        print("=" * 50)
+        print("FASHION STUDIO ETL PIPELINE")
+        print("=" * 50)
+    
+        # 1. Tahap Ekstraksi
+        print("\n🔍 Tahap 1: Ekstraksi data dari website...")
+        print("Mengambil data dari https://fashion-studio.dicoding.dev")
+    
+        # Halaman yang tidak berubah sejak run sebelumnya dilayani dari cache, dan
+        # halaman yang baru saja berhasil diambil dilayani dari checkpoint
+        with metrics.stage('extract') as record:
+            raw_products = scrape_products(session=resources.session, cache=resources.cache,
+                                           checkpoint=resources.checkpoint)
+            record.add_rows(len(raw_products))
+        print_failed_pages(resources.checkpoint)
+        if not raw_products:
+            print("❌ Ekstraksi gagal, tidak ada data yang diambil. Pipeline dihentikan.")
+            return
+
+        print(f"✅ Ekstraksi selesai! Total produk ditemukan: {len(raw_products)}")
+
+        # 2. Tahap Transformasi
+        print("\n🔄 Tahap 2: Transformasi dan pembersihan data...")
+    
+        report = RejectionReport(sample_size=3)
+        with metrics.stage('transform') as record:
+            cleaned_df = transform_data(raw_products, report=report, compact=compact)
+            record.add_rows(len(cleaned_df))
+        if cleaned_df.empty:
+            print("❌ Transformasi gagal, tidak ada data valid. Pipeline dihentikan.")
+            return
         
-    except Exception as e:
-        print(f"❌ Error saat menyimpan ke CSV: {e}")
+        print(f"✅ Transformasi selesai! Data bersih: {len(cleaned_df)} baris")
+        print("\nContoh data yang sudah bersih:")
+        print(cleaned_df.head())
     
-    try:
-        # Memuat ke Google Sheets
-        print("\n📊 Menyimpan ke Google Sheets...")
-        load_to_google_sheets(cleaned_df)
-        success_count += 1
+        print(f"\nInfo dataset:")
+        print(f"- Kolom: {list(cleaned_df.columns)}")
+        print(f"- Tipe data:")
+        print(cleaned_df.dtypes)
+
+        # 3. Tahap Pemuatan
+        print("\n💾 Tahap 3: Memuat data ke repositori...")
+    
+        # Semua sink terdaftar independen, jadi dimuat paralel pada DataFrame yang sama
+        sinks = create_sinks()
+        print(f"Menjalankan {len(sinks)} sink secara paralel...")
+    
+        with metrics.stage('load') as record:
+            results = load_dataframe(cleaned_df, sinks)
+            record.add_rows(len(cleaned_df))
+    
+        success_count = sum(result['success'] for result in results)
+        print()
+        print_sink_results(results)
         
-    except Exception as e:
-        print(f"❌ Error saat menyimpan ke Google Sheets: {e}")
+        # Summary
+        print("\n" + "=" * 50)
+        print("📋 RINGKASAN PIPELINE ETL")
+        print("=" * 50)
+        print(f"✅ Data berhasil diekstrak: {len(raw_products)} produk")
+        print(f"✅ Data berhasil ditransformasi: {len(cleaned_df)} produk")
+        print_rejection_report(report)
+        print(f"✅ Repositori berhasil disimpan: {success_count}/{len(sinks)}")
+        finish_metrics(collector, metrics_path)
+    
+        if success_count == len(sinks):
+            print("🎉 Pipeline ETL berhasil diselesaikan dengan sempurna!")
+        else:
+            print("⚠️ Pipeline ETL selesai dengan beberapa masalah pada tahap pemuatan.")
+    
+        print("=" * 50)
+    finally:
+        # Session dan koneksi checkpoint milik run ini ditutup; milik daemon dipakai ulang
+        if owns_resources:
+            resources.close()
+
+def main_streaming(batch_size=BATCH_SIZE, compact=False, metrics_path=None,
+                   checkpoint_max_age=MAX_AGE, resources=None):
+    """
+    Menjalankan pipeline ETL secara streaming.
     
+    Produk diekstrak, ditransformasi, dan dimuat per batch, sehingga baris
+    pertama sudah dikirim ke repositori selagi halaman berikutnya masih
+    diunduh. Buffer setiap sink dibatasi `batch_size`, sehingga memori
+    hanya menampung sekitar satu batch per sink. Pengecualiannya sink
+    Google Sheets mode sync, yang membutuhkan seluruh data run untuk
+    dibandingkan dengan isi sheet.
+    
+    Args:
+        batch_size (int): Jumlah produk per batch
+        compact (bool): Pakai skema DataFrame ringkas untuk menghemat memori
+        metrics_path (str): File untuk menyimpan metrik (.json atau .prom)
+        checkpoint_max_age (float): Umur maksimum (detik) hasil halaman di
+            checkpoint yang dipakai ulang tanpa diambil lagi
+        resources (PipelineResources): Session, cache, dan koneksi yang
+            dipakai ulang antar run; default dibuat baru
+    """
+    owns_resources = resources is None
+    if owns_resources:
+        resources = PipelineResources(checkpoint_max_age=checkpoint_max_age)
     try:
-        # Memuat ke PostgreSQL
-        print("\n🗄️ Menyimpan ke PostgreSQL...")
-        load_to_postgresql(cleaned_df, 'products')
-        success_count += 1
-        
-    except Exception as e:
-        print(f"❌ Error saat menyimpan ke PostgreSQL: {e}")
-        
-    # Summary
-    print("\n" + "=" * 50)
-    print("📋 RINGKASAN PIPELINE ETL")
-    print("=" * 50)
-    print(f"✅ Data berhasil diekstrak: {len(raw_products)} produk")
-    print(f"✅ Data berhasil ditransformasi: {len(cleaned_df)} produk")
-    print(f"✅ Repositori berhasil disimpan: {success_count}/3")
-    
-    if success_count == 3:
-        print("🎉 Pipeline ETL berhasil diselesaikan dengan sempurna!")
-    else:
-        print("⚠️ Pipeline ETL selesai dengan beberapa masalah pada tahap pemuatan.")
+        # Instrumentasi hanya aktif jika metrik diminta dengan --metrics
+        collector = metrics.enable() if metrics_path else None
+        print("=" * 50)
+        print("FASHION STUDIO ETL PIPELINE (STREAMING)")
+        print("=" * 50)
+    
+        # Buffer sink dibatasi satu batch agar baris tidak tertahan hingga ekstraksi selesai
+        sinks = create_sinks(max_batch_size=batch_size)
+    
+        extracted_count = 0
     
-    print("=" * 50)
+        def counted(batches):
+            nonlocal extracted_count
+            for batch in batches:
+                extracted_count += len(batch)
+                yield batch
+    
+        print(f"\n🔍🔄💾 Ekstraksi, transformasi, dan pemuatan per {batch_size} produk...")
+        raw_batches = counted(scrape_product_batches(batch_size=batch_size, session=resources.session,
+                                                     cache=resources.cache,
+                                                     checkpoint=resources.checkpoint))
+        report = RejectionReport(sample_size=3)
+        with metrics.stage('pipeline') as record:
+            results = stream_batches(transform_batches(raw_batches, report=report, compact=compact), sinks)
+            record.add_rows(report.output_rows)
+    
+        success_count = sum(result['success'] for result in results)
+        print_sink_results(results)
+        print_failed_pages(resources.checkpoint)
+    
+        # Summary
+        print("\n" + "=" * 50)
+        print("📋 RINGKASAN PIPELINE ETL")
+        print("=" * 50)
+        print(f"✅ Data berhasil diekstrak: {extracted_count} produk")
+        print(f"✅ Data berhasil ditransformasi: {report.output_rows} produk")
+        print_rejection_report(report)
+        print(f"✅ Repositori berhasil disimpan: {success_count}/{len(sinks)}")
+        finish_metrics(collector, metrics_path)
+        print("=" * 50)
+    finally:
+        # Session dan koneksi checkpoint milik run ini ditutup; milik daemon dipakai ulang
+        if owns_resources:
+            resources.close()
+
+def run_daemon(schedule, stream=False, run_immediately=False, checkpoint_max_age=MAX_AGE,
+               **options):
+    """
+    Menjalankan pipeline berulang kali sesuai jadwal di dalam satu proses.
+    
+    Session HTTP, cache halaman, klien Google Sheets (beserta token OAuth),
+    dan pool koneksi PostgreSQL dibuat sekali lalu dipakai ulang di setiap
+    run, sehingga run tidak lagi membayar biaya import, otorisasi, dan
+    pembukaan koneksi. Run tidak pernah tumpang tindih. Berhenti dengan
+    Ctrl+C atau SIGTERM setelah run yang sedang berjalan selesai.
+    
+    Args:
+        schedule (CronSchedule | IntervalSchedule): Jadwal run
+        stream (bool): Jalankan pipeline dalam mode streaming
+        run_immediately (bool): Jalankan pipeline sekali saat daemon mulai
+        checkpoint_max_age (float): Umur maksimum hasil halaman di checkpoint
+        **options: Argumen untuk `main` atau `main_streaming`
+    """
+    resources = PipelineResources(checkpoint_max_age=checkpoint_max_age)
+    resources.register_sinks()
+    pipeline = main_streaming if stream else main
+    scheduler = Scheduler(lambda: pipeline(resources=resources, **options), schedule)
+    signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+    
+    try:
+        scheduler.run_forever(run_immediately=run_immediately)
+    finally:
+        resources.close()
+    print(f"Daemon berhenti setelah {scheduler.runs} run "
+          f"({scheduler.failures} gagal, {scheduler.skipped} dilewati).")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    arg_parser = argparse.ArgumentParser(description="Fashion Studio ETL Pipeline")
+    arg_parser.add_argument('--stream', action='store_true',
+                            help="Jalankan ekstraksi, transformasi, dan pemuatan per batch")
+    arg_parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help="Jumlah produk per batch pada mode streaming")
+    arg_parser.add_argument('--compact', action='store_true',
+                            help="Pakai tipe data ringkas (kategori, datetime64, int8, float32)")
+    arg_parser.add_argument('--metrics', metavar='FILE',
+                            help="Ukur setiap tahap dan simpan metriknya ke FILE (.json, atau .prom untuk Prometheus)")
+    arg_parser.add_argument('--checkpoint-max-age', type=float, default=MAX_AGE, metavar='SECONDS',
+                            help="Pakai ulang halaman di checkpoint yang lebih muda dari SECONDS; 0 untuk mengambil semua")
+    schedule_group = arg_parser.add_mutually_exclusive_group()
+    schedule_group.add_argument('--every', type=float, metavar='SECONDS',
+                                help="Jalankan sebagai daemon, pipeline diulang setiap SECONDS detik")
+    schedule_group.add_argument('--cron', metavar='EXPR',
+                                help="Jalankan sebagai daemon dengan jadwal cron, misalnya '0 * * * *'")
+    arg_parser.add_argument('--run-now', action='store_true',
+                            help="Pada mode daemon, jalankan pipeline sekali saat mulai")
+    args = arg_parser.parse_args()
+    
+    options = dict(compact=args.compact, metrics_path=args.metrics,
+                   checkpoint_max_age=args.checkpoint_max_age)
+    if args.stream:
+        options['batch_size'] = args.batch_size
+    
+    if args.every is not None or args.cron is not None:
+        try:
+            schedule = CronSchedule(args.cron) if args.cron else IntervalSchedule(args.every)
+        except ValueError as e:
+            arg_parser.error(str(e))
+        run_daemon(schedule, stream=args.stream, run_immediately=args.run_now, **options)
+    else:
+        # Run manual tidak boleh tumpang tindih dengan daemon yang sedang berjalan
+        lock = RunLock()
+        if not lock.acquire():
+            print("⏭️ Pipeline lain sedang berjalan, run ini dilewati.")
+        else:
+            try:
+                (main_streaming if args.stream else main)(**options)
+            finally:
+                lock.release()
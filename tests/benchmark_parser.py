@@ -0,0 +1,60 @@
+"""
+Benchmark backend parser HTML pada halaman Fashion Studio yang tersimpan.
+
+Jalankan dari root proyek:
+    python -m tests.benchmark_parser
+"""
+import glob
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.parser import available_backends, get_parser, extract_card
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+ROUNDS = 50
+
+def load_pages():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'fashion_studio_page*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+def benchmark_backend(name, pages, rounds=ROUNDS):
+    """
+    Mengukur waktu parsing seluruh halaman dengan satu backend.
+
+    Args:
+        name (str): Nama backend parser
+        pages (list): Daftar HTML halaman
+        rounds (int): Jumlah pengulangan
+
+    Returns:
+        dict: Jumlah halaman per detik dan produk per detik
+    """
+    parser = get_parser(name)
+    products = 0
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        for html in pages:
+            products += len([extract_card(parser, card) for card in parser.cards(html)])
+    elapsed = time.perf_counter() - started_at
+    return {
+        'backend': name,
+        'pages_per_sec': rounds * len(pages) / elapsed,
+        'products_per_sec': products / elapsed,
+    }
+
+def main():
+    pages = load_pages()
+    print(f"Benchmark parser: {len(pages)} halaman x {ROUNDS} putaran")
+    results = [benchmark_backend(name, pages) for name in available_backends()]
+    baseline = next(r for r in results if r['backend'] == 'html.parser')
+    for result in results:
+        speedup = result['pages_per_sec'] / baseline['pages_per_sec']
+        print(f"- {result['backend']:<12} {result['pages_per_sec']:>10.1f} halaman/detik "
+              f"{result['products_per_sec']:>12.1f} produk/detik  ({speedup:.1f}x)")
+
+if __name__ == "__main__":
+    main()
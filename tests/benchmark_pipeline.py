@@ -0,0 +1,442 @@
+"""
+Benchmark offline untuk ekstraksi, transformasi, dan pemuatan.
+
+Halaman Fashion Studio yang tersimpan di tests/fixtures diputar ulang dari
+server HTTP lokal, sedangkan tahap transformasi dan pemuatan memakai
+katalog sintetis (1 ribu hingga 10 juta baris). PostgreSQL diganti double
+berbasis SQLite yang hanya menjalankan COPY, sehingga benchmark PostgreSQL
+mengukur biaya sisi klien, bukan eksekusi statement di server. Google
+Sheets diganti klien palsu di memori, sehingga tidak ada layanan luar
+yang dihubungi.
+
+Setiap run ditambahkan sebagai satu baris JSON ke file hasil beserta
+commit git-nya, sehingga run antar commit dapat dibandingkan.
+
+Jalankan dari root proyek:
+    python -m tests.benchmark_pipeline
+    python -m tests.benchmark_pipeline --sizes 1000 100000 10000000 --no-memory
+    python -m tests.benchmark_pipeline --compare
+"""
+import argparse
+import csv
+import datetime
+import glob
+import http.server
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import extract
+from utils.load import (CsvWriter, ColumnarWriter, GoogleSheetsWriter, PostgresWriter,
+                        pa, write_batches)
+from utils.session import create_session
+from utils.transform import transform_batches
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT_DIR, 'tests', 'fixtures')
+RESULTS_FILE = os.path.join(ROOT_DIR, 'benchmarks', 'results.jsonl')
+
+# Ukuran default katalog sintetis; gunakan --sizes untuk hingga 10 juta baris
+DEFAULT_SIZES = [1000, 10000, 100000]
+CHUNK_SIZE = 100000
+PAGES = 50
+
+# Proporsi baris kotor dan duplikat pada katalog sintetis
+DIRTY_RATIO = 0.05
+DUPLICATE_RATIO = 0.02
+
+SIZES = np.array(['S', 'M', 'L', 'XL', 'XXL'], dtype=object)
+GENDERS = np.array(['Men', 'Women', 'Unisex'], dtype=object)
+PRODUCTS = np.array(['T-shirt', 'Hoodie', 'Pants', 'Outerwear', 'Jacket', 'Shoes'], dtype=object)
+
+class FixtureServer:
+    """
+    Server HTTP lokal yang memutar ulang halaman fixture: `?page=N` dilayani
+    dengan fixture ke-(N-1) secara bergiliran, dan halaman di atas
+    `total_pages` dibalas 404 seperti katalog aslinya.
+    """
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, total_pages=PAGES):
+        pages = []
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, 'fashion_studio_page*.html'))):
+            with open(path, 'rb') as f:
+                pages.append(f.read())
+        if not pages:
+            raise FileNotFoundError(f"Tidak ada halaman fixture di {fixtures_dir}")
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = self.path.partition('?')[2]
+                params = dict(part.partition('=')[::2] for part in query.split('&') if part)
+                page = int(params.get('page', '1') or 1)
+                if page > total_pages:
+                    self.send_error(404)
+                    return
+                body = pages[(page - 1) % len(pages)]
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+def generate_catalogue(rows, seed=0, chunk_size=CHUNK_SIZE):
+    """
+    Generator katalog mentah sintetis dengan format hasil ekstraksi.
+
+    Sebagian kecil baris dibuat kotor ('Unknown Product', harga kosong,
+    rating 'Invalid', dsb.) dan sebagian lagi duplikat, agar semua aturan
+    validasi ikut bekerja.
+
+    Args:
+        rows (int): Jumlah baris total
+        seed (int): Seed acak agar katalog dapat direproduksi
+        chunk_size (int): Jumlah baris per DataFrame
+
+    Yields:
+        pd.DataFrame: Potongan katalog mentah
+    """
+    rng = np.random.default_rng(seed)
+    start_time = datetime.datetime(2024, 1, 1)
+    for start in range(0, rows, chunk_size):
+        n = min(chunk_size, rows - start)
+        ids = np.arange(start, start + n)
+        # Duplikat: salin id baris sebelumnya dalam potongan yang sama
+        duplicate = rng.random(n) < DUPLICATE_RATIO
+        duplicate[0] = False
+        ids[duplicate] = ids[np.flatnonzero(duplicate) - 1]
+
+        titles = PRODUCTS[ids % len(PRODUCTS)] + ' ' + ids.astype(str).astype(object)
+        prices = np.round(10 + (ids * 7919 % 49000) / 100, 2).astype(str).astype(object)
+        ratings = ('⭐ ' + np.round(1 + (ids % 40) / 10, 1).astype(str)).astype(object)
+        colors = (1 + ids % 8).astype(str).astype(object)
+        sizes = SIZES[ids % len(SIZES)].copy()
+        genders = GENDERS[ids % len(GENDERS)].copy()
+        timestamps = [(start_time + datetime.timedelta(microseconds=int(i))).isoformat() for i in ids]
+
+        # Baris kotor dibagi rata ke setiap aturan validasi
+        dirty = np.flatnonzero(rng.random(n) < DIRTY_RATIO)
+        rule = dirty % 5
+        titles[dirty[rule == 0]] = 'Unknown Product'
+        prices[dirty[rule == 1]] = None
+        ratings[dirty[rule == 2]] = 'Invalid'
+        colors[dirty[rule == 3]] = 'N/A'
+        sizes[dirty[rule == 4]] = 'N/A'
+
+        yield pd.DataFrame({
+            'Title': titles, 'Price': prices, 'Rating': ratings, 'Colors': colors,
+            'Size': sizes, 'Gender': genders, 'Timestamp': timestamps,
+        })
+
+class SQLiteCopyCursor:
+    """
+    Cursor mirip psycopg2 di atas SQLite. Perintah SQL PostgreSQL biasa
+    tidak dijalankan (query menghasilkan satu baris NULL atau tanpa baris),
+    sedangkan `copy_expert` membaca buffer CSV dan memasukkannya ke tabel
+    SQLite dengan kolom dari perintah COPY. Yang terukur hanya biaya sisi
+    klien: serialisasi COPY, penulisan baris, dan pengiriman perintah;
+    biaya DELETE, INSERT ... ON CONFLICT, atau TRUNCATE di server tidak.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.rowcount = 0
+
+    def fetchone(self):
+        return (None,)
+
+    def fetchall(self):
+        return []
+
+    def copy_expert(self, sql, buffer):
+        table = sql.split()[1]
+        columns = sql[sql.index('(') + 1:sql.index(')')].split(', ')
+        self.connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})")
+        placeholders = ', '.join('?' for _ in columns)
+        self.connection.executemany(f"INSERT INTO {table} VALUES ({placeholders})", csv.reader(buffer))
+        self.rowcount = self.connection.total_changes
+
+    def close(self):
+        pass
+
+class SQLiteCopyConnection:
+    """Koneksi mirip psycopg2 untuk SQLiteCopyCursor."""
+
+    def __init__(self):
+        self.connection = sqlite3.connect(':memory:')
+
+    def cursor(self):
+        return SQLiteCopyCursor(self.connection)
+
+    def commit(self):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+    def close(self):
+        self.connection.close()
+
+class _MemoryWorksheet:
+    def __init__(self):
+        self.cells = 0
+
+    def clear(self):
+        self.cells = 0
+
+    def update(self, values, range_name):
+        self.cells += sum(len(row) for row in values)
+
+class _MemorySheetsClient:
+    def __init__(self):
+        worksheet = _MemoryWorksheet()
+        self.spreadsheet = type('Spreadsheet', (), {'sheet1': worksheet, 'url': 'memory://'})()
+
+    def open(self, name):
+        return self.spreadsheet
+
+def measure(func, track_memory=True):
+    """
+    Menjalankan fungsi sekali untuk waktu, lalu sekali lagi di bawah
+    tracemalloc untuk puncak memori agar pelacakan tidak memengaruhi waktu.
+    Alokasi di luar Python (misalnya buffer Arrow) tidak ikut terhitung.
+
+    Args:
+        func (callable): Fungsi tanpa argumen yang mengembalikan jumlah unit
+            (halaman atau baris) yang diproses
+        track_memory (bool): Ukur puncak memori dengan run kedua
+
+    Returns:
+        tuple: (jumlah unit, detik, puncak memori dalam MB atau None)
+    """
+    started_at = time.perf_counter()
+    units = func()
+    seconds = time.perf_counter() - started_at
+
+    peak_mb = None
+    if track_memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return units, seconds, peak_mb
+
+def result(benchmark, unit, units, seconds, peak_mb, **extra):
+    return dict({
+        'benchmark': benchmark,
+        unit: units,
+        'seconds': seconds,
+        f'{unit}_per_sec': units / seconds if seconds > 0 else None,
+        'peak_memory_mb': peak_mb,
+    }, **extra)
+
+def benchmark_scrape(track_memory=True, pages=PAGES):
+    """Mengukur scrape_page sekuensial dan scrape_products paralel terhadap server lokal."""
+    results = []
+    original_url = extract.BASE_URL
+    with FixtureServer(total_pages=pages) as server:
+        extract.BASE_URL = server.url
+        try:
+            def scrape_sequential():
+                rows = 0
+                with create_session(headers=extract.HEADERS) as session:
+                    for page in range(1, pages + 1):
+                        rows += len(extract.scrape_page(page, session=session))
+                return rows
+
+            rows, seconds, peak_mb = measure(scrape_sequential, track_memory)
+            results.append(result('scrape_page', 'pages', pages, seconds, peak_mb,
+                                  rows=rows, rows_per_sec=rows / seconds))
+
+            def scrape_parallel():
+                return len(extract.scrape_products(requests_per_second=10000, burst=100))
+
+            rows, seconds, peak_mb = measure(scrape_parallel, track_memory)
+            results.append(result('scrape_products', 'pages', pages, seconds, peak_mb,
+                                  rows=rows, rows_per_sec=rows / seconds))
+        finally:
+            extract.BASE_URL = original_url
+    return results
+
+def benchmark_transform(size, track_memory=True):
+    """Mengukur transformasi katalog sintetis, batch demi batch."""
+    catalogue = list(generate_catalogue(size))
+
+    def run():
+        return sum(len(batch) for batch in transform_batches(iter(catalogue)))
+
+    rows_out, seconds, peak_mb = measure(run, track_memory)
+    return result('transform_data', 'rows', size, seconds, peak_mb, size=size, rows_out=rows_out)
+
+def loader_factories(tmp_dir):
+    factories = [
+        ('csv', lambda: CsvWriter(os.path.join(tmp_dir, 'products.csv'))),
+        ('google_sheets', lambda: GoogleSheetsWriter(client=_MemorySheetsClient())),
+        ('postgresql_copy', lambda: PostgresWriter('products', strategy='delete')),
+        # Hanya fingerprint, COPY ke tabel sementara, dan pengiriman perintah
+        # upsert yang terukur; statement-nya tidak dijalankan double SQLite
+        ('postgresql_upsert_dispatch', lambda: PostgresWriter('products', strategy='upsert')),
+    ]
+    if pa is not None:
+        factories.insert(1, ('parquet', lambda: ColumnarWriter(os.path.join(tmp_dir, 'products.parquet'))))
+    return factories
+
+def benchmark_loaders(size, track_memory=True):
+    """Mengukur setiap loader pada katalog sintetis yang sudah dibersihkan."""
+    cleaned = list(transform_batches(generate_catalogue(size)))
+    rows = sum(len(batch) for batch in cleaned)
+    results = []
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        # PostgreSQL diganti double SQLite; koneksi baru untuk setiap run
+        with patch('utils.load.psycopg2.connect', side_effect=lambda **kwargs: SQLiteCopyConnection()):
+            for name, factory in loader_factories(tmp_dir):
+                _, seconds, peak_mb = measure(lambda: write_batches(factory(), cleaned), track_memory)
+                results.append(result(f'load.{name}', 'rows', rows, seconds, peak_mb, size=size))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(sizes=DEFAULT_SIZES, track_memory=True):
+    """
+    Menjalankan seluruh benchmark.
+
+    Args:
+        sizes (list): Ukuran katalog sintetis untuk transformasi dan pemuatan
+        track_memory (bool): Ukur puncak memori (menambah satu run per benchmark)
+
+    Returns:
+        dict: Satu run berisi metadata lingkungan dan daftar hasil
+    """
+    results = benchmark_scrape(track_memory)
+    for size in sizes:
+        results.append(benchmark_transform(size, track_memory))
+        results.extend(benchmark_loaders(size, track_memory))
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+def result_key(entry):
+    return (entry['benchmark'], entry.get('size'))
+
+def throughput(entry):
+    return entry.get('rows_per_sec') or entry.get('pages_per_sec')
+
+def load_runs(path=RESULTS_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def save_run(run, path=RESULTS_FILE):
+    """Menambahkan satu run ke file hasil (JSON lines)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(run) + '\n')
+
+def compare_runs(baseline, current):
+    """
+    Membandingkan throughput dua run per benchmark.
+
+    Args:
+        baseline (dict): Run pembanding
+        current (dict): Run terbaru
+
+    Returns:
+        list: Tuple (benchmark, ukuran, throughput lama, throughput baru, rasio)
+    """
+    previous = {result_key(entry): entry for entry in baseline['results']}
+    rows = []
+    for entry in current['results']:
+        old = previous.get(result_key(entry))
+        if old is None or not throughput(old) or not throughput(entry):
+            continue
+        rows.append((entry['benchmark'], entry.get('size'), throughput(old), throughput(entry),
+                     throughput(entry) / throughput(old)))
+    return rows
+
+def print_run(run):
+    print(f"Commit {run['commit']} | Python {run['python']} | pandas {run['pandas']}")
+    for entry in run['results']:
+        size = f" [{entry['size']:,} baris]" if entry.get('size') else ""
+        rate = (f"{entry['pages_per_sec']:>10.1f} halaman/detik " if 'pages_per_sec' in entry else "")
+        rows_rate = entry.get('rows_per_sec')
+        memory = (f" {entry['peak_memory_mb']:>8.1f} MB" if entry['peak_memory_mb'] is not None else "")
+        print(f"- {entry['benchmark'] + size:<46} {rate}{rows_rate:>12.0f} baris/detik{memory}")
+
+def print_comparison(baseline, current):
+    print(f"\nPerbandingan dengan commit {baseline['commit']} ({baseline['timestamp']}):")
+    for benchmark, size, old, new, ratio in compare_runs(baseline, current):
+        label = benchmark + (f" [{size:,}]" if size else "")
+        flag = "  ⚠️ regresi" if ratio < 0.9 else ""
+        print(f"- {label:<46} {old:>12.0f} -> {new:>12.0f} ({ratio:.2f}x){flag}")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark offline pipeline ETL")
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                            help="Ukuran katalog sintetis (baris)")
+    arg_parser.add_argument('--no-memory', action='store_true',
+                            help="Lewati pengukuran puncak memori")
+    arg_parser.add_argument('--output', default=RESULTS_FILE, help="File hasil (JSON lines)")
+    arg_parser.add_argument('--compare', action='store_true',
+                            help="Bandingkan dengan run terakhir dari commit lain")
+    args = arg_parser.parse_args()
+
+    previous_runs = load_runs(args.output)
+    run = run_benchmarks(args.sizes, track_memory=not args.no_memory)
+    save_run(run, args.output)
+    print_run(run)
+    print(f"Hasil ditambahkan ke {args.output}")
+
+    if args.compare:
+        baseline = next((old for old in reversed(previous_runs) if old['commit'] != run['commit']),
+                        previous_runs[-1] if previous_runs else None)
+        if baseline is None:
+            print("Belum ada run sebelumnya untuk dibandingkan.")
+        else:
+            print_comparison(baseline, run)
+
+if __name__ == "__main__":
+    main()
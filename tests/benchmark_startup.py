@@ -0,0 +1,204 @@
+"""
+Benchmark waktu startup berdasarkan `python -X importtime`.
+
+Setiap modul target di-import di proses Python baru beberapa kali, lalu
+waktu import kumulatif (median) dan import terberatnya dilaporkan. Backend
+sink yang berat (gspread, google-auth, psycopg2, pyarrow) seharusnya tidak ikut
+ter-import hanya karena `main` atau modul ETL di-import; `--check`
+menghasilkan exit code 1 jika itu terjadi atau jika waktu startup `main`
+melebihi `--budget-ms`.
+
+Setiap run ditambahkan sebagai satu baris JSON ke file hasil beserta
+commit git-nya.
+
+Jalankan dari root proyek:
+    python -m tests.benchmark_startup
+    python -m tests.benchmark_startup --runs 10 --check --budget-ms 1500
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(ROOT_DIR, 'benchmarks', 'startup.jsonl')
+
+# Modul yang diukur dan backend yang seharusnya baru di-import saat sink dipakai
+TARGETS = ['main', 'utils.extract', 'utils.transform', 'utils.sinks']
+LAZY_MODULES = ['gspread', 'google.oauth2', 'google.auth', 'googleapiclient', 'psycopg2',
+                'pyarrow']
+# Backend yang sudah di-import oleh dependensi wajib ini (pandas 3 meng-import
+# pyarrow jika terpasang) tidak dapat ditunda proyek ini dan tidak dihitung
+BASELINE_MODULE = 'pandas'
+RUNS = 5
+TOP_IMPORTS = 8
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+def parse_importtime(output):
+    """
+    Mengurai keluaran `-X importtime`.
+
+    Args:
+        output (str): Isi stderr proses Python
+
+    Returns:
+        list: Tuple (nama modul, kedalaman, waktu sendiri us, waktu kumulatif us)
+            sesuai urutan keluaran
+    """
+    entries = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return entries
+
+def import_once(module):
+    """
+    Meng-import satu modul di proses Python baru.
+
+    Args:
+        module (str): Nama modul
+
+    Returns:
+        list: Hasil `parse_importtime`
+    """
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=ROOT_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Import {module} gagal:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+def lazy_backends(entries):
+    """
+    Backend dari `LAZY_MODULES` yang ter-import menurut hasil `parse_importtime`.
+
+    Args:
+        entries (list): Hasil `parse_importtime`
+
+    Returns:
+        list: Nama backend sesuai urutan `LAZY_MODULES`
+    """
+    loaded = {name for name, _, _, _ in entries}
+    return [lazy for lazy in LAZY_MODULES
+            if any(name == lazy or name.startswith(lazy + '.') for name in loaded)]
+
+_baseline_backends = None
+
+def eager_backends(entries):
+    """
+    Backend yang ikut ter-import, selain yang sudah di-import `BASELINE_MODULE`.
+
+    Args:
+        entries (list): Hasil `parse_importtime` untuk modul target
+
+    Returns:
+        list: Nama backend yang seharusnya baru di-import saat sink dipakai
+    """
+    global _baseline_backends
+    if _baseline_backends is None:
+        _baseline_backends = set(lazy_backends(import_once(BASELINE_MODULE)))
+    return [lazy for lazy in lazy_backends(entries) if lazy not in _baseline_backends]
+
+def benchmark_module(module, runs=RUNS):
+    """
+    Mengukur waktu import satu modul.
+
+    Args:
+        module (str): Nama modul
+        runs (int): Jumlah proses yang diukur; median yang dilaporkan
+
+    Returns:
+        dict: Waktu import median, import langsung terberat, dan backend
+            sink yang ikut ter-import
+    """
+    totals = []
+    for _ in range(runs):
+        entries = import_once(module)
+        index = max(i for i, entry in enumerate(entries) if entry[0] == module and entry[1] == 0)
+        totals.append(entries[index][3])
+
+    # Import langsung modul target (kedalaman 1 tepat sebelum barisnya) dari
+    # run terakhir, diurutkan dari yang terberat
+    children = []
+    for name, depth, _, cumulative in reversed(entries[:index]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((name, cumulative))
+    heaviest = sorted(children, key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]
+    eager = eager_backends(entries)
+    return {
+        'module': module,
+        'runs': runs,
+        'median_ms': statistics.median(totals) / 1000,
+        'min_ms': min(totals) / 1000,
+        'heaviest': [{'module': name, 'ms': cumulative / 1000} for name, cumulative in heaviest],
+        'eager_backends': eager,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save_run(run, path=RESULTS_FILE):
+    """Menambahkan satu run ke file hasil (JSON lines)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(run) + '\n')
+
+def print_result(entry):
+    eager = ", ".join(entry['eager_backends']) or "-"
+    print(f"- {entry['module']:<16} median {entry['median_ms']:>7.1f} ms, "
+          f"min {entry['min_ms']:>7.1f} ms, backend ikut ter-import: {eager}")
+    for heavy in entry['heaviest']:
+        print(f"    {heavy['module']:<28} {heavy['ms']:>7.1f} ms")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark waktu startup (import)")
+    arg_parser.add_argument('--modules', nargs='+', default=TARGETS, help="Modul yang diukur")
+    arg_parser.add_argument('--runs', type=int, default=RUNS, help="Jumlah proses per modul")
+    arg_parser.add_argument('--output', default=RESULTS_FILE, help="File hasil (JSON lines)")
+    arg_parser.add_argument('--check', action='store_true',
+                            help="Exit code 1 jika backend sink ter-import atau budget terlampaui")
+    arg_parser.add_argument('--budget-ms', type=float,
+                            help="Batas median waktu import main dalam milidetik untuk --check")
+    args = arg_parser.parse_args()
+
+    results = [benchmark_module(module, args.runs) for module in args.modules]
+    run = {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    save_run(run, args.output)
+    print(f"Commit {run['commit']} | Python {run['python']}")
+    for entry in results:
+        print_result(entry)
+    print(f"Hasil ditambahkan ke {args.output}")
+
+    if args.check:
+        problems = [f"{entry['module']} meng-import {', '.join(entry['eager_backends'])}"
+                    for entry in results if entry['eager_backends']]
+        if args.budget_ms is not None:
+            problems += [f"{entry['module']} {entry['median_ms']:.1f} ms > {args.budget_ms:.1f} ms"
+                         for entry in results
+                         if entry['module'] == 'main' and entry['median_ms'] > args.budget_ms]
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import pytest
+import tempfile
+import shutil
+from unittest.mock import Mock, patch
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.cache import PageCache
+from utils.extract import scrape_page
+
+PAGE_HTML = '''
+<html>
+    <div class="collection-card">
+        <h3 class="product-title">Cached Product</h3>
+        <span class="price">$10.00</span>
+        <p>Rating: 4.0 / 5</p>
+        <p>Colors 2</p>
+        <p>Size: S</p>
+        <p>Gender: Women</p>
+    </div>
+</html>
+'''
+
+def make_response(status_code, text='', headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    response.raise_for_status.return_value = None
+    return response
+
+class TestPageCache:
+
+    def setup_method(self):
+        """Buat direktori cache sementara"""
+        self.cache_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_put_and_get(self):
+        """Test menyimpan dan mengambil entri cache"""
+        cache = PageCache(self.cache_dir)
+
+        cache.put('https://example.com/?page=1', '<html></html>', etag='"abc"',
+                  last_modified='Wed, 21 Oct 2015 07:28:00 GMT')
+        entry = cache.get('https://example.com/?page=1')
+
+        assert entry['body'] == '<html></html>'
+        assert cache.conditional_headers(entry) == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'
+        }
+        assert cache.get('https://example.com/?page=2') is None
+
+    def test_persisted_between_instances(self):
+        """Test cache tetap tersedia setelah dibuka ulang"""
+        PageCache(self.cache_dir).put('https://example.com/', 'body', etag='"v1"')
+
+        entry = PageCache(self.cache_dir).get('https://example.com/')
+
+        assert entry['etag'] == '"v1"'
+        assert entry['body'] == 'body'
+
+    def test_lru_eviction_by_size(self):
+        """Test entri yang paling lama tidak dipakai dihapus saat melewati batas ukuran"""
+        cache = PageCache(self.cache_dir, max_bytes=25)
+        cache.put('a', 'x' * 10, etag='1')
+        cache.put('b', 'y' * 10, etag='2')
+        cache.get('a')  # 'a' menjadi yang terbaru dipakai
+
+        cache.put('c', 'z' * 10, etag='3')
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert cache.total_bytes == 20
+        assert len(os.listdir(self.cache_dir)) == 3  # dua body + index
+
+    def test_get_does_not_rewrite_index(self):
+        """Test cache hit tidak menulis ulang index; urutan pemakaian disimpan saat close"""
+        cache = PageCache(self.cache_dir)
+        cache.put('a', 'x', etag='1')
+        cache.put('b', 'y', etag='2')
+
+        with patch.object(cache, '_save_index', wraps=cache._save_index) as save_index:
+            cache.get('a')
+            cache.get('b')
+            cache.get('a')
+            assert save_index.call_count == 0
+            cache.close()
+            assert save_index.call_count == 1
+
+        assert list(PageCache(self.cache_dir)._index) == ['b', 'a']
+
+    def test_products_stored_beside_body_and_counted(self):
+        """Test daftar produk disimpan di file terpisah dan ikut dihitung batas ukuran"""
+        products = [{'Title': 'Cached Product', 'Price': '10.00'}]
+        cache = PageCache(self.cache_dir)
+        cache.put('a', 'x' * 10, etag='1', products=products)
+
+        with open(os.path.join(self.cache_dir, 'index.json'), encoding='utf-8') as f:
+            assert 'Cached Product' not in f.read()
+        assert cache.get('a')['products'] == products
+        assert cache.total_bytes > 10
+
+        # Cukup untuk satu entri beserta produknya, tidak untuk dua
+        small = PageCache(self.cache_dir, max_bytes=cache.total_bytes + 5)
+        small.put('b', 'y' * 10, etag='2', products=products)
+        assert 'a' not in small
+        assert sorted(os.listdir(self.cache_dir)) == sorted(
+            [f"{small._key('b')}.html", f"{small._key('b')}.json", 'index.json'])
+
+    def test_legacy_index_with_inline_products(self):
+        """Test index lama yang menyimpan produk di dalam index tetap dapat dibaca"""
+        import json
+        cache = PageCache(self.cache_dir)
+        cache.put('a', 'body', etag='1')
+        path = os.path.join(self.cache_dir, 'index.json')
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+        for entry in entries:
+            del entry['has_products']
+            entry['products'] = [{'Title': 'Old'}]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+
+        entry = PageCache(self.cache_dir).get('a')
+
+        assert entry['body'] == 'body'
+        assert entry['products'] is None
+
+    def test_corrupt_index_is_reset(self):
+        """Test index yang rusak diabaikan"""
+        with open(os.path.join(self.cache_dir, 'index.json'), 'w') as f:
+            f.write('{not json')
+
+        cache = PageCache(self.cache_dir)
+
+        assert len(cache) == 0
+
+    def test_scrape_page_serves_304_from_cache(self):
+        """Test halaman yang tidak berubah dilayani dari cache"""
+        cache = PageCache(self.cache_dir)
+        session = Mock()
+        session.get.side_effect = [
+            make_response(200, PAGE_HTML, {'ETag': '"v1"'}),
+            make_response(304)
+        ]
+
+        first = scrape_page(1, session=session, cache=cache)
+        with patch('utils.extract.extract_card') as mock_extract:
+            second = scrape_page(1, session=session, cache=cache)
+
+        # Permintaan kedua mengirim validator dan tidak mem-parsing ulang
+        assert session.get.call_args_list[1].kwargs['headers']['If-None-Match'] == '"v1"'
+        mock_extract.assert_not_called()
+        assert [{k: v for k, v in p.items() if k != 'Timestamp'} for p in second] == \
+               [{k: v for k, v in p.items() if k != 'Timestamp'} for p in first]
+        assert second[0]['Title'] == 'Cached Product'
+
+    def test_scrape_page_304_reparses_body_without_products(self):
+        """Test body dari cache di-parsing ulang jika produk tidak disimpan"""
+        cache = PageCache(self.cache_dir, store_products=False)
+        session = Mock()
+        session.get.side_effect = [
+            make_response(200, PAGE_HTML, {'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}),
+            make_response(304)
+        ]
+
+        scrape_page(1, session=session, cache=cache)
+        result = scrape_page(1, session=session, cache=cache)
+
+        headers = session.get.call_args_list[1].kwargs['headers']
+        assert headers['If-Modified-Since'] == 'Wed, 21 Oct 2015 07:28:00 GMT'
+        assert result[0]['Title'] == 'Cached Product'
+
+    def test_scrape_page_without_validators_not_cached(self):
+        """Test response tanpa ETag/Last-Modified tidak disimpan"""
+        cache = PageCache(self.cache_dir)
+        session = Mock()
+        session.get.return_value = make_response(200, PAGE_HTML)
+
+        scrape_page(1, session=session, cache=cache)
+
+        assert len(cache) == 0
@@ -0,0 +1,90 @@
+import pytest
+import tempfile
+import shutil
+import requests
+from unittest.mock import patch
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.checkpoint import PageCheckpoint
+from utils.extract import iter_pages
+
+class TestPageCheckpoint:
+
+    def setup_method(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'checkpoint.sqlite')
+        self.checkpoint = PageCheckpoint(self.path, max_age=60)
+
+    def teardown_method(self):
+        self.checkpoint.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_save_and_get(self):
+        """Test hasil halaman tersimpan dan dapat dibaca kembali"""
+        self.checkpoint.save(1, [{'Title': 'A'}])
+
+        assert self.checkpoint.get(1) == [{'Title': 'A'}]
+        assert self.checkpoint.get(2) is None
+
+    def test_persists_across_instances(self):
+        """Test checkpoint bertahan setelah proses dijalankan ulang"""
+        self.checkpoint.save(3, [])
+        self.checkpoint.close()
+
+        self.checkpoint = PageCheckpoint(self.path, max_age=60)
+
+        assert self.checkpoint.get(3) == []
+
+    def test_stale_page_expires(self):
+        """Test halaman di luar jendela kesegaran diambil ulang"""
+        with patch('utils.checkpoint.time.time', return_value=1000.0):
+            self.checkpoint.save(1, [{'Title': 'A'}])
+
+        with patch('utils.checkpoint.time.time', return_value=1059.0):
+            assert self.checkpoint.get(1) == [{'Title': 'A'}]
+        with patch('utils.checkpoint.time.time', return_value=1061.0):
+            assert self.checkpoint.get(1) is None
+
+    def test_failed_pages(self):
+        """Test halaman gagal dicatat dan hilang setelah berhasil"""
+        self.checkpoint.save_error(4, 'timeout')
+        self.checkpoint.save_error(2, 'timeout')
+        self.checkpoint.save(1, [])
+
+        assert self.checkpoint.failed_pages() == [2, 4]
+        assert self.checkpoint.get(2) is None
+        assert self.checkpoint.progress() == {'ok': 1, 'error': 2}
+
+        self.checkpoint.save(2, [])
+        assert self.checkpoint.failed_pages() == [4]
+
+    def test_clear(self):
+        """Test checkpoint dapat dikosongkan"""
+        self.checkpoint.save(1, [])
+        self.checkpoint.clear()
+
+        assert self.checkpoint.get(1) is None
+
+    def test_resume_fetches_only_missing_and_failed_pages(self):
+        """Test run ulang hanya mengambil halaman yang gagal atau belum ada"""
+        def flaky(page, **kwargs):
+            if page == 2:
+                raise requests.exceptions.ConnectionError("reset")
+            return [{'Title': f'P{page}'}]
+
+        with patch('utils.extract.scrape_page', side_effect=flaky) as mock_scrape:
+            first = [p for batch in iter_pages(max_workers=1, checkpoint=self.checkpoint,
+                                               pages=[1, 2, 3]) for p in batch]
+        assert first == [{'Title': 'P1'}, {'Title': 'P3'}]
+        assert mock_scrape.call_count == 3
+        assert self.checkpoint.failed_pages() == [2]
+
+        with patch('utils.extract.scrape_page',
+                   side_effect=lambda page, **kwargs: [{'Title': f'P{page}'}]) as mock_scrape:
+            second = [p for batch in iter_pages(max_workers=1, checkpoint=self.checkpoint,
+                                                pages=[1, 2, 3]) for p in batch]
+
+        assert [call.args[0] for call in mock_scrape.call_args_list] == [2]
+        assert second == [{'Title': 'P1'}, {'Title': 'P2'}, {'Title': 'P3'}]
+        assert self.checkpoint.failed_pages() == []
@@ -0,0 +1,110 @@
+import pytest
+import tempfile
+import shutil
+import pandas as pd
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.dedup import KeyDeduplicator, dedup_key_columns
+from utils.transform import transform_batches, transform_data, RejectionReport
+
+def make_products(titles, timestamp='2024-01-01T00:00:00'):
+    return [{
+        'Title': title,
+        'Price': '10.00',
+        'Rating': '4.0',
+        'Colors': '2',
+        'Size': 'M',
+        'Gender': 'Men',
+        'Timestamp': timestamp,
+    } for title in titles]
+
+class TestKeyDeduplicator:
+
+    def setup_method(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_default_key_ignores_timestamp(self):
+        """Test kunci default adalah semua kolom kecuali Timestamp"""
+        assert dedup_key_columns(['Title', 'Price', 'Timestamp']) == ['Title', 'Price']
+        assert dedup_key_columns(['Title', 'Price'], ['Price']) == ['Price']
+
+    def test_unknown_key_column(self):
+        """Test kolom kunci yang tidak ada ditolak"""
+        with pytest.raises(KeyError):
+            dedup_key_columns(['Title'], ['Title', 'Brand'])
+
+    def test_keep_mask_across_batches(self):
+        """Test duplikat dihapus di dalam batch dan terhadap batch sebelumnya"""
+        deduplicator = KeyDeduplicator()
+        first = pd.DataFrame({'Title': ['A', 'B', 'A'], 'Timestamp': ['1', '2', '3']})
+        second = pd.DataFrame({'Title': ['B', 'C'], 'Timestamp': ['4', '5']})
+
+        assert deduplicator.keep_mask(first).tolist() == [True, True, False]
+        assert deduplicator.keep_mask(second).tolist() == [False, True]
+        assert deduplicator.seen_keys == 3
+
+    def test_custom_key_columns(self):
+        """Test kunci dapat dibatasi ke sebagian kolom"""
+        deduplicator = KeyDeduplicator(key_columns=['Title'])
+        df = pd.DataFrame({'Title': ['A', 'A'], 'Price': [1.0, 2.0], 'Timestamp': ['1', '2']})
+
+        assert deduplicator.keep_mask(df).tolist() == [True, False]
+
+    def test_spills_to_disk_beyond_memory_budget(self):
+        """Test kunci dipindahkan ke SQLite saat melebihi budget dan tetap dikenali"""
+        deduplicator = KeyDeduplicator(memory_keys=2, spill_dir=self.tmp_dir)
+        batches = [pd.DataFrame({'Title': titles})
+                   for titles in (['A', 'B', 'C'], ['D', 'A'], ['B', 'E', 'C', 'F'], ['E', 'G'])]
+
+        masks = [deduplicator.keep_mask(batch).tolist() for batch in batches]
+
+        assert masks == [[True, True, True], [True, False],
+                         [False, True, False, True], [False, True]]
+        assert deduplicator.spills >= 2
+        assert len(deduplicator._memory) <= 2
+        assert len(os.listdir(self.tmp_dir)) == 1
+
+        deduplicator.close()
+        assert os.listdir(self.tmp_dir) == []
+
+class TestTransformDeduplication:
+
+    def test_transform_data_ignores_timestamp(self):
+        """Test produk yang sama dengan Timestamp berbeda dianggap duplikat"""
+        products = (make_products(['A', 'B'], '2024-01-01T00:00:00')
+                    + make_products(['A'], '2024-01-01T00:00:05'))
+        report = RejectionReport()
+
+        result = transform_data(products, report=report, verbose=False)
+
+        assert result['Title'].tolist() == ['A', 'B']
+        assert result.iloc[0]['Timestamp'] == '2024-01-01T00:00:00'
+        assert report.rules['duplicate']['rejected'] == 1
+
+    def test_transform_data_custom_key(self):
+        """Test kunci duplikat dapat diatur"""
+        products = make_products(['A', 'B'])
+        products[1]['Price'] = '20.00'
+
+        result = transform_data(products, verbose=False, key_columns=['Size', 'Gender'])
+
+        assert result['Title'].tolist() == ['A']
+
+    def test_transform_batches_spills_and_matches_in_memory(self):
+        """Test hasil streaming dengan spill ke disk sama dengan deduplikasi di memori"""
+        titles = [f'Product {i % 40}' for i in range(200)]
+        batches = [make_products(titles[i:i + 25], f'2024-01-01T00:00:{i // 25:02d}')
+                   for i in range(0, len(titles), 25)]
+        report = RejectionReport()
+
+        streamed = pd.concat(transform_batches(iter(batches), report=report, memory_keys=8),
+                             ignore_index=True)
+        expected = transform_data([p for batch in batches for p in batch], verbose=False)
+
+        assert len(streamed) == 40
+        assert report.rules['duplicate']['rejected'] == 160
+        pd.testing.assert_frame_equal(streamed, expected.reset_index(drop=True))
@@ -1,10 +1,37 @@
 import pytest
 from unittest.mock import Mock, patch
+import re
 import requests
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.extract import scrape_page, scrape_products
+from utils.extract_data.extract import discover_pages
+from utils.extract import (scrape_page, scrape_products, scrape_product_batches, parse_pagination,
+                           find_last_page, discover_total_pages)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def make_catalogue_session(total_pages, failing=()):
+    """
+    Session palsu dengan katalog `total_pages` halaman dari fixture halaman 1;
+    halaman di `failing` selalu menjawab 503
+    """
+    with open(os.path.join(FIXTURES_DIR, 'fashion_studio_page1.html'), encoding='utf-8') as f:
+        html = f.read()
+    session = Mock()
+
+    def get(url, **kwargs):
+        match = re.search(r'(\d+)$', url)
+        page = int(match.group(1)) if match else 1
+        response = Mock(status_code=200, text=html, headers={})
+        if page > total_pages or page in failing:
+            response.status_code = 503 if page in failing else 404
+            error = requests.exceptions.HTTPError(f"{response.status_code} Error", response=response)
+            response.raise_for_status.side_effect = error
+        return response
+
+    session.get.side_effect = get
+    return session
 
 class TestExtract:
     
@@ -117,7 +144,7 @@ class TestExtract:
         ]
         
         # Test hanya 3 halaman untuk testing
-        with patch('utils.extract.range', return_value=range(1, 4)):
+        with patch('utils.extract.discover_total_pages', return_value=3):
             result = scrape_products()
         
         assert len(result) == 3  # 3 halaman × 1 produk per halaman
@@ -128,7 +155,209 @@ class TestExtract:
         """Test scraping dengan halaman kosong"""
         mock_scrape_page.return_value = []
         
-        with patch('utils.extract.range', return_value=range(1, 4)):
+        with patch('utils.extract.discover_total_pages', return_value=3):
             result = scrape_products()
         
-        assert result == []
\ No newline at end of file
+        assert result == []
+    
+    @patch('utils.extract.scrape_page')
+    def test_scrape_products_concurrent_keeps_page_order(self, mock_scrape_page):
+        """Test scraping paralel tetap mengembalikan produk sesuai urutan halaman"""
+        import time
+        
+        def fake_scrape_page(page, session=None, parser=None, cache=None):
+            # Halaman awal dibuat lebih lambat agar selesai paling akhir
+            time.sleep(0.01 * (5 - page))
+            return [{'Title': f'Product {page}'}]
+        
+        mock_scrape_page.side_effect = fake_scrape_page
+        
+        with patch('utils.extract.discover_total_pages', return_value=4):
+            result = scrape_products(max_workers=4)
+        
+        assert [product['Title'] for product in result] == [
+            'Product 1', 'Product 2', 'Product 3', 'Product 4'
+        ]
+    
+    @patch('utils.extract.scrape_page')
+    def test_scrape_products_sequential_mode(self, mock_scrape_page):
+        """Test scraping sekuensial dengan max_workers=1"""
+        mock_scrape_page.side_effect = lambda page, session=None, parser=None, cache=None: [{'Title': f'Product {page}'}]
+        
+        with patch('utils.extract.discover_total_pages', return_value=3):
+            result = scrape_products(max_workers=1)
+        
+        assert [call.args[0] for call in mock_scrape_page.call_args_list] == [1, 2, 3]
+        assert len(result) == 3
+    
+    def test_scrape_page_uses_session(self):
+        """Test scrape_page memakai session bersama jika diberikan"""
+        mock_session = Mock()
+        mock_response = Mock()
+        mock_response.text = '<html><div class="collection-card"><h3 class="product-title">Test Product</h3></div></html>'
+        mock_response.raise_for_status.return_value = None
+        mock_session.get.return_value = mock_response
+        
+        with patch('utils.extract.requests.get') as mock_get:
+            result = scrape_page(1, session=mock_session)
+        
+        mock_session.get.assert_called_once()
+        mock_get.assert_not_called()
+        assert result[0]['Title'] == 'Test Product'
+
+    
+    @patch('utils.extract.scrape_page')
+    def test_scrape_product_batches(self, mock_scrape_page):
+        """Test produk dikelompokkan menjadi batch sesuai urutan halaman"""
+        mock_scrape_page.side_effect = lambda page, session=None, parser=None, cache=None: [
+            {'Title': f'Product {page}-{i}'} for i in range(3)
+        ]
+        
+        with patch('utils.extract.discover_total_pages', return_value=3):
+            batches = list(scrape_product_batches(batch_size=4, max_workers=2))
+        
+        assert [len(batch) for batch in batches] == [4, 4, 1]
+        assert batches[0][0]['Title'] == 'Product 1-0'
+        assert batches[-1][0]['Title'] == 'Product 3-2'
+    
+    @patch('utils.extract.scrape_page')
+    def test_scrape_product_batches_is_lazy(self, mock_scrape_page):
+        """Test batch pertama tersedia sebelum semua halaman diambil"""
+        mock_scrape_page.side_effect = lambda page, session=None, parser=None, cache=None: [
+            {'Title': f'Product {page}'}
+        ]
+        
+        with patch('utils.extract.discover_total_pages', return_value=50):
+            batches = scrape_product_batches(batch_size=1, max_workers=1)
+            first = next(batches)
+            batches.close()
+        
+        assert first == [{'Title': 'Product 1'}]
+        assert mock_scrape_page.call_count == 1
+
+class TestPageDiscovery:
+
+    def test_parse_pagination_fixture(self):
+        """Test link pagination dan tombol Next dibaca dari halaman asli"""
+        with open(os.path.join(FIXTURES_DIR, 'fashion_studio_page1.html'), encoding='utf-8') as f:
+            assert parse_pagination(f.read()) == (2, True)
+
+    def test_parse_pagination_query_links(self):
+        """Test link ?page=N tanpa tombol Next"""
+        html = '<a href="/?page=2">2</a><a href="/?page=7">7</a>'
+
+        assert parse_pagination(html) == (7, False)
+        assert parse_pagination('<html></html>') == (1, False)
+
+    @pytest.mark.parametrize('total', [1, 2, 3, 50, 64, 65, 999])
+    def test_find_last_page(self, total):
+        """Test probing eksponensial dan binary search menemukan halaman terakhir"""
+        checked = []
+
+        def exists(page):
+            checked.append(page)
+            return page <= total
+
+        assert find_last_page(exists, lower_bound=1) == total
+        assert len(checked) == len(set(checked))
+        assert len(checked) <= 2 * max(1, total).bit_length() + 1
+
+    def test_find_last_page_capped(self):
+        """Test pencarian berhenti di batas atas"""
+        assert find_last_page(lambda page: True, lower_bound=2, max_pages=100) == 100
+
+    @pytest.mark.parametrize('total', [1, 7, 50])
+    def test_discover_total_pages(self, total):
+        """Test jumlah halaman ditemukan dan halaman yang diperiksa disimpan"""
+        session = make_catalogue_session(total)
+        found = {}
+
+        assert discover_total_pages(session=session, found=found) == total
+
+        assert 1 in found
+        assert all(page <= total and products for page, products in found.items())
+
+    def test_discover_without_next_link(self):
+        """Test halaman tertinggi di pagination dipakai jika tidak ada tombol Next"""
+        session = Mock()
+        session.get.return_value = Mock(
+            text='<div class="collection-card"><h3 class="product-title">A</h3></div>'
+                 '<a href="/?page=2">2</a><a href="/?page=3">3</a>')
+
+        assert discover_total_pages(session=session) == 3
+        session.get.assert_called_once()
+
+    def test_discover_falls_back_on_network_error(self):
+        """Test error jaringan memakai jumlah halaman default"""
+        session = Mock()
+        session.get.side_effect = requests.exceptions.ConnectionError("down")
+
+        assert discover_total_pages(session=session) == 50
+
+    def test_scrape_products_fetches_only_existing_pages(self):
+        """Test hanya halaman yang ada yang diambil, masing-masing sekali"""
+        session = make_catalogue_session(7)
+
+        result = scrape_products(session=session, max_workers=2)
+
+        requested = [int(call.args[0].rpartition('page=')[2]) for call in session.get.call_args_list]
+        assert len(result) == 7 * 20
+        assert sorted(page for page in requested if page <= 7) == list(range(1, 8))
+        assert len([page for page in requested if page > 7]) <= 3
+
+    def test_legacy_discover_pages(self):
+        """Test modul lama menemukan jumlah halaman dan menyimpan halaman 1"""
+        session = make_catalogue_session(7)
+        found = {}
+
+        assert discover_pages(session, found) == 7
+        assert len(found[1]) == 20
+        assert all(page <= 7 for page in found)
+
+    def test_legacy_discover_pages_falls_back_on_server_error(self):
+        """Test error selain 404 saat probing tidak memotong katalog"""
+        session = make_catalogue_session(50, failing={32})
+
+        assert discover_pages(session, {}) == 50
+
+    def test_discover_uses_cache_and_checkpoint(self):
+        """Test halaman 1 memakai conditional GET dan halaman segar di checkpoint tidak diambil ulang"""
+        import tempfile
+        import shutil
+        from utils.cache import PageCache
+        from utils.checkpoint import PageCheckpoint
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            cache = PageCache(os.path.join(tmp_dir, 'pages'))
+            checkpoint = PageCheckpoint(os.path.join(tmp_dir, 'checkpoint.sqlite'), max_age=60)
+            session = make_catalogue_session(7)
+            catalogue_get = session.get.side_effect
+
+            def get(url, headers=None, **kwargs):
+                response = catalogue_get(url, **kwargs)
+                response.headers = {'ETag': '"v1"'}
+                if headers and headers.get('If-None-Match') == '"v1"':
+                    response.status_code = 304
+                return response
+
+            session.get.side_effect = get
+            first = {}
+            assert discover_total_pages(session=session, cache=cache, found=first) == 7
+            for page, products in first.items():
+                checkpoint.save(page, products)
+
+            session.get.reset_mock()
+            found = {}
+            assert discover_total_pages(session=session, cache=cache, found=found,
+                                        checkpoint=checkpoint) == 7
+
+            # Selain halaman 1 (304), hanya halaman di luar katalog yang diminta;
+            # halaman yang ada dijawab checkpoint
+            requested = [call.args[0] for call in session.get.call_args_list]
+            assert requested[0].endswith('page=1')
+            assert session.get.call_args_list[0].kwargs['headers']['If-None-Match'] == '"v1"'
+            assert all(int(url.rpartition('=')[2]) > 7 for url in requested[1:])
+            assert found == {}
+            checkpoint.close()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,52 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.lazy import lazy_import
+from tests.benchmark_startup import import_once, parse_importtime, eager_backends
+
+class TestLazyImport:
+
+    def test_module_imported_on_first_use(self):
+        """Test modul baru di-import saat atributnya pertama kali diakses"""
+        decimal = lazy_import('decimal')
+        assert not decimal.loaded
+
+        assert str(decimal.Decimal('1.5')) == '1.5'
+        assert decimal.loaded
+
+    def test_attribute_proxy_is_callable(self):
+        """Test proxy atribut modul dapat dipanggil dan diakses"""
+        dumps = lazy_import('json', 'dumps')
+        ordered = lazy_import('collections', 'OrderedDict')
+
+        assert dumps([1]) == '[1]'
+        assert ordered.fromkeys('ab') == {'a': None, 'b': None}
+
+    def test_attribute_can_be_patched(self):
+        """Test atribut proxy dapat di-patch lalu dipulihkan"""
+        import utils.load
+        with patch('utils.load.psycopg2.connect') as mock_connect:
+            assert utils.load.psycopg2.connect is mock_connect
+        assert utils.load.psycopg2.connect is not mock_connect
+
+    def test_missing_module_raises_on_use(self):
+        """Test modul yang tidak ada baru gagal saat dipakai"""
+        missing = lazy_import('module_yang_tidak_ada')
+
+        with pytest.raises(ImportError):
+            missing.anything
+
+    def test_parse_importtime(self):
+        """Test keluaran -X importtime diurai menjadi nama, kedalaman, dan waktu"""
+        output = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   json.decoder\n"
+                  "import time:       300 |        420 | json\n")
+
+        assert parse_importtime(output) == [('json.decoder', 1, 120, 120), ('json', 0, 300, 420)]
+
+    @pytest.mark.parametrize('module', ['main', 'utils.sinks'])
+    def test_sink_backends_not_imported_at_startup(self, module):
+        """Test import main/sink tidak ikut meng-import gspread, google-auth, psycopg2, dan pyarrow"""
+        assert eager_backends(import_once(module)) == []
@@ -1,12 +1,90 @@
 import pytest
+import threading
+import time
 import pandas as pd
 import tempfile
+import shutil
 import os
 from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.load import load_to_csv, load_to_google_sheets, load_to_postgresql
+from gspread.exceptions import APIError
+from gspread.utils import a1_to_rowcol
+from utils.load import (load_to_csv, load_to_google_sheets, load_to_postgresql, CsvWriter,
+                        ColumnarWriter, load_to_columnar, GoogleSheetsWriter, PostgresWriter, write_batches, product_fingerprint,
+                        run_loaders)
+
+def make_api_error(code, retry_after=None):
+    response = Mock()
+    response.json.return_value = {'error': {'code': code, 'message': 'error', 'status': 'ERROR'}}
+    response.headers = {'Retry-After': retry_after} if retry_after else {}
+    return APIError(response)
+
+class FakeWorksheet:
+    """Worksheet lokal yang mencatat sel dan setiap panggilan API"""
+
+    id = 0
+
+    def __init__(self, failures=None):
+        self.cells = {}
+        self.calls = []
+        self.reads = 0
+        self.failures = list(failures or [])
+
+    def _request(self, name):
+        self.calls.append(name)
+        if self.failures:
+            raise self.failures.pop(0)
+
+    def clear(self):
+        self._request('clear')
+        self.cells = {}
+
+    def update(self, values, range_name):
+        self._request('update')
+        start = int(range_name[1:])
+        for offset, row in enumerate(values):
+            self.cells[start + offset] = list(row)
+
+    def append_row(self, row):
+        self._request('append_row')
+        self.cells[len(self.cells) + 1] = list(row)
+
+    def append_rows(self, values):
+        self._request('append_rows')
+        for row in values:
+            self.cells[len(self.cells) + 1] = list(row)
+
+    def batch_update(self, data):
+        self._request('batch_update')
+        for entry in data:
+            row, col = a1_to_rowcol(entry['range'].split(':')[0])
+            cells = self.cells[row]
+            for offset, value in enumerate(entry['values'][0]):
+                cells[col - 1 + offset] = value
+
+    def spreadsheet_batch_update(self, body):
+        self._request('delete_rows')
+        for request in body['requests']:
+            deleted = request['deleteDimension']['range']
+            start, end = deleted['startIndex'] + 1, deleted['endIndex']
+            rows = [self.cells[row] for row in sorted(self.cells) if not start <= row <= end]
+            self.cells = dict(enumerate(rows, start=1))
+
+    def get_all_values(self):
+        self.reads += 1
+        return [list(self.cells[row]) for row in sorted(self.cells)]
+
+class FakeGspreadClient:
+    """Klien gspread lokal dengan satu spreadsheet"""
+
+    def __init__(self, worksheet):
+        self.spreadsheet = Mock(url='https://docs.google.com/spreadsheets/fake', sheet1=worksheet,
+                                batch_update=worksheet.spreadsheet_batch_update)
+
+    def open(self, name):
+        return self.spreadsheet
 
 class TestLoad:
     
@@ -73,7 +151,8 @@ class TestLoad:
         
         # Verify calls
         mock_worksheet.clear.assert_called_once()
-        mock_worksheet.append_row.assert_called()
+        mock_worksheet.update.assert_called_once()
+        mock_worksheet.append_row.assert_not_called()
     
     @patch('utils.load.os.path.exists')
     def test_load_to_google_sheets_no_credentials(self, mock_exists):
@@ -169,4 +248,645 @@ class TestLoad:
             
         finally:
             if os.path.exists(temp_filename):
-                os.unlink(temp_filename)
\ No newline at end of file
+                os.unlink(temp_filename)
+    
+    def test_csv_writer_streaming_batches(self):
+        """Test CsvWriter menulis header sekali dan menambahkan setiap batch"""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as tmp_file:
+            temp_filename = tmp_file.name
+        
+        try:
+            rows = write_batches(CsvWriter(temp_filename), [self.test_df, self.test_df.iloc[:1]])
+            
+            loaded_df = pd.read_csv(temp_filename)
+            assert rows == 3
+            assert len(loaded_df) == 3
+            assert list(loaded_df.columns) == list(self.test_df.columns)
+            
+        finally:
+            if os.path.exists(temp_filename):
+                os.unlink(temp_filename)
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_postgres_writer_streaming_single_transaction(self, mock_connect):
+        """Test PostgresWriter menulis semua batch dalam satu transaksi"""
+        mock_conn = Mock()
+        mock_connect.return_value = mock_conn
+        
+        rows = write_batches(PostgresWriter('test_table'), [self.test_df, self.test_df])
+        
+        assert rows == 4
+        assert mock_conn.cursor.return_value.copy_expert.call_count == 2
+        mock_conn.commit.assert_called_once()
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_postgres_writer_rollback_on_error(self, mock_connect):
+        """Test transaksi dibatalkan jika salah satu batch gagal"""
+        mock_conn = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value.copy_expert.side_effect = Exception("Copy failed")
+        
+        with pytest.raises(Exception):
+            write_batches(PostgresWriter('test_table'), [self.test_df])
+        
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        mock_conn.close.assert_called_once()
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_postgres_writer_uses_pool(self, mock_connect):
+        """Test koneksi dipinjam dari pool dan dikembalikan setelah commit"""
+        pool = Mock()
+        mock_conn = pool.getconn.return_value
+        
+        write_batches(PostgresWriter('test_table', pool=pool), [self.test_df])
+        
+        mock_connect.assert_not_called()
+        mock_conn.commit.assert_called_once()
+        mock_conn.close.assert_not_called()
+        pool.putconn.assert_called_once_with(mock_conn, close=False)
+    
+    def test_postgres_writer_pool_replaces_dead_connection(self):
+        """Test koneksi pool yang mati saat dipinjam dibuang dan diganti"""
+        import psycopg2
+        dead, alive = Mock(), Mock()
+        dead.cursor.return_value.execute.side_effect = psycopg2.OperationalError("server closed")
+        pool = Mock()
+        pool.getconn.side_effect = [dead, alive]
+        
+        write_batches(PostgresWriter('test_table', pool=pool), [self.test_df])
+        
+        assert pool.putconn.call_args_list == [((dead,), {'close': True}), ((alive,), {'close': False})]
+        alive.commit.assert_called_once()
+        dead.commit.assert_not_called()
+    
+    def test_postgres_writer_pool_discards_failed_connection(self):
+        """Test koneksi yang gagal dibuang dari pool"""
+        pool = Mock()
+        mock_conn = pool.getconn.return_value
+        mock_conn.cursor.return_value.copy_expert.side_effect = Exception("Copy failed")
+        
+        with pytest.raises(Exception):
+            write_batches(PostgresWriter('test_table', pool=pool), [self.test_df])
+        
+        mock_conn.rollback.assert_called_once()
+        pool.putconn.assert_called_once_with(mock_conn, close=True)
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_load_to_postgresql_copy(self, mock_connect):
+        """Test bulk load PostgreSQL melalui COPY FROM STDIN"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        copied = {}
+        
+        def fake_copy_expert(sql, buffer):
+            copied['sql'] = sql
+            copied['data'] = buffer.read()
+        
+        mock_cursor.copy_expert.side_effect = fake_copy_expert
+        df = self.test_df.copy()
+        df.loc[1, 'Title'] = 'Product, "quoted"'
+        df.loc[0, 'Gender'] = None
+        
+        load_to_postgresql(df, 'test_table', method='copy')
+        
+        assert copied['sql'].startswith(
+            "COPY test_table (title, price, rating, colors, size, gender, timestamp) FROM STDIN")
+        lines = copied['data'].splitlines()
+        assert lines[0] == 'Product 1,100000.0,4.5,3,M,\\N,2024-01-01T00:00:00'
+        assert lines[1] == '"Product, ""quoted""",200000.0,3.8,2,L,Male,2024-01-01T00:00:01'
+        mock_conn.commit.assert_called_once()
+    
+    @patch('utils.load.execute_values')
+    @patch('utils.load.psycopg2.connect')
+    def test_load_to_postgresql_values_fallback(self, mock_connect, mock_execute_values):
+        """Test metode execute_values tetap tersedia sebagai fallback"""
+        mock_conn = Mock()
+        mock_connect.return_value = mock_conn
+        
+        load_to_postgresql(self.test_df, 'test_table', method='values')
+        
+        mock_execute_values.assert_called_once()
+        values = mock_execute_values.call_args.args[2]
+        assert values[0][0] == 'Product 1'
+        mock_conn.cursor.return_value.copy_expert.assert_not_called()
+        mock_conn.commit.assert_called_once()
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_load_to_postgresql_unknown_method(self, mock_connect):
+        """Test metode insert yang tidak dikenal"""
+        load_to_postgresql(self.test_df, 'test_table', method='bulk')
+        
+        mock_connect.assert_not_called()
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_load_to_postgresql_swap_strategy(self, mock_connect):
+        """Test strategi swap memuat ke tabel sementara lalu mengganti isi tabel dalam satu transaksi"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        load_to_postgresql(self.test_df, 'products', strategy='swap')
+        
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        assert not any(sql.startswith('DELETE') for sql in executed)
+        assert ('CREATE TEMP TABLE products_staging (LIKE products INCLUDING DEFAULTS) '
+                'ON COMMIT DROP') in executed
+        assert mock_cursor.copy_expert.call_args.args[0].startswith('COPY products_staging ')
+        assert executed[-2:] == ['TRUNCATE products',
+                                 'INSERT INTO products SELECT * FROM products_staging']
+        mock_conn.commit.assert_called_once()
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_load_to_postgresql_swap_keeps_table_grants(self, mock_connect):
+        """Test tabel utama tidak diganti sehingga GRANT dan constraint-nya tetap berlaku"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        load_to_postgresql(self.test_df, 'products', strategy='swap')
+        
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        # GRANT terikat ke tabel products; tabel itu tidak pernah di-rename
+        # atau di-drop, dan tidak ada hak akses yang perlu disalin
+        assert not any('RENAME' in sql or sql.startswith('DROP') for sql in executed)
+        assert not any('GRANT' in sql or 'REVOKE' in sql for sql in executed)
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_load_to_postgresql_swap_keeps_old_table_on_error(self, mock_connect):
+        """Test tabel lama tidak disentuh jika bulk load ke staging gagal"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_cursor.copy_expert.side_effect = Exception("Copy failed")
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        load_to_postgresql(self.test_df, 'products', strategy='swap')
+        
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        assert not any(sql.startswith('TRUNCATE') for sql in executed)
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+    
+    def test_product_fingerprint_stable(self):
+        """Test fingerprint memakai kunci deduplikasi: semua kolom kecuali Timestamp"""
+        changed = self.test_df.copy()
+        changed['Timestamp'] = ['2025-01-01T00:00:00', '2025-01-01T00:00:01']
+        
+        original = product_fingerprint(self.test_df)
+        
+        assert original.tolist() == product_fingerprint(changed).tolist()
+        assert original.str.len().tolist() == [32, 32]
+        assert original.nunique() == 2
+        
+        # Baris yang hanya berbeda Price tetap terpisah, seperti pada deduplikasi
+        changed.loc[0, 'Price'] = 1.0
+        assert product_fingerprint(changed)[0] != original[0]
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_load_to_postgresql_upsert_strategy(self, mock_connect):
+        """Test strategi upsert hanya menulis produk baru/berubah dan menghapus yang hilang"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_cursor.rowcount = 1
+        mock_cursor.fetchone.return_value = (False,)
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        load_to_postgresql(self.test_df, 'products', strategy='upsert')
+        
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        assert not any(sql.startswith('DELETE FROM products;') for sql in executed)
+        assert any('CREATE UNIQUE INDEX IF NOT EXISTS products_fingerprint_key' in sql for sql in executed)
+        
+        # Batch dimuat ke tabel sementara beserta fingerprint
+        copy_sql = mock_cursor.copy_expert.call_args.args[0]
+        assert copy_sql.startswith('COPY products_incoming ')
+        assert 'fingerprint' in copy_sql
+        
+        upsert = next(sql for sql in executed if 'ON CONFLICT (fingerprint) DO NOTHING' in sql)
+        delete = next(sql for sql in executed if sql.startswith('DELETE FROM products WHERE NOT EXISTS'))
+        assert executed.index(upsert) < executed.index(delete)
+        assert not any('is_active' in sql for sql in executed)
+        mock_conn.commit.assert_called_once()
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_postgres_writer_upsert_flags_missing(self, mock_connect):
+        """Test produk yang hilang ditandai tidak aktif alih-alih dihapus"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_cursor.rowcount = 0
+        mock_cursor.fetchone.return_value = (False,)
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        writer = PostgresWriter('products', strategy='upsert', missing='flag')
+        write_batches(writer, [self.test_df])
+        
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        assert not any(sql.startswith('DELETE') for sql in executed)
+        assert any(sql.startswith('UPDATE products SET is_active = FALSE') for sql in executed)
+        assert writer.changes == {'upserted': 0, 'flagged': 0}
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_postgres_writer_upsert_keeps_missing_on_partial_run(self, mock_connect):
+        """Test produk hilang tidak dihapus jika run kosong atau ada halaman gagal"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_cursor.rowcount = 0
+        mock_cursor.fetchone.return_value = (False,)
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        checkpoint = Mock()
+        checkpoint.failed_pages.return_value = [3]
+        
+        empty = PostgresWriter('products', strategy='upsert')
+        write_batches(empty, [])
+        partial = PostgresWriter('products', strategy='upsert', checkpoint=checkpoint)
+        write_batches(partial, [self.test_df])
+        
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        assert not any('NOT EXISTS (SELECT 1 FROM products_incoming' in sql for sql in executed)
+        assert empty.changes['skipped_missing'] == 'tidak ada baris yang dimuat'
+        assert partial.changes['skipped_missing'] == '1 halaman gagal diambil'
+        assert mock_conn.commit.call_count == 2
+    
+    @patch('utils.load.psycopg2.connect')
+    def test_postgres_writer_upsert_backfills_fingerprints(self, mock_connect):
+        """Test baris lama tanpa fingerprint diisi sebelum unique index dibuat"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_cursor.rowcount = 0
+        mock_cursor.fetchone.return_value = (True,)
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+        
+        write_batches(PostgresWriter('products', strategy='upsert'), [self.test_df])
+        
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        expression = ("md5(COALESCE(title::text, '') || chr(31) || COALESCE(price::text, '') || "
+                      "chr(31) || COALESCE(rating::text, '') || chr(31) || COALESCE(colors::text, '') || "
+                      "chr(31) || COALESCE(size::text, '') || chr(31) || COALESCE(gender::text, ''))")
+        dedup = next(i for i, sql in enumerate(executed) if 'ROW_NUMBER()' in sql)
+        backfill = executed.index(
+            f"UPDATE products SET fingerprint = {expression} WHERE fingerprint IS NULL")
+        index = next(i for i, sql in enumerate(executed) if 'CREATE UNIQUE INDEX' in sql)
+        assert dedup < backfill < index
+        assert expression in executed[dedup]
+    
+    def test_product_fingerprint_matches_sql_backfill(self):
+        """Test fingerprint Python sama dengan MD5 kolom ::text PostgreSQL dipisah chr(31)"""
+        import hashlib
+        # float8::text menulis 100000.0 sebagai '100000'
+        key = '\x1f'.join(['Product 1', '100000', '4.5', '3', 'M', 'Unisex'])
+        
+        assert product_fingerprint(self.test_df)[0] == hashlib.md5(key.encode('utf-8')).hexdigest()
+    
+    def test_postgres_writer_unknown_missing_action(self):
+        """Test penanganan produk hilang yang tidak dikenal ditolak"""
+        with pytest.raises(ValueError):
+            PostgresWriter('products', strategy='upsert', missing='ignore')
+
+class TestGoogleSheetsWriter:
+
+    def setup_method(self):
+        """Setup data dengan 7 baris"""
+        self.test_df = pd.DataFrame({
+            'Title': [f'Product {i}' for i in range(7)],
+            'Price': [100000.0] * 7,
+            'Rating': [4.5] * 7,
+            'Colors': [3] * 7,
+            'Size': ['M'] * 7,
+            'Gender': ['Unisex'] * 7,
+            'Timestamp': ['2024-01-01T00:00:00'] * 7
+        })
+
+    def test_writes_in_chunks(self):
+        """Test baris dikirim per chunk, bukan per baris"""
+        worksheet = FakeWorksheet()
+        writer = GoogleSheetsWriter(chunk_size=3, client=FakeGspreadClient(worksheet))
+
+        write_batches(writer, [self.test_df.iloc[:4], self.test_df.iloc[4:]])
+
+        # Header + 7 baris = 8 baris dalam 3 chunk
+        assert worksheet.calls == ['clear', 'update', 'update', 'update']
+        values = worksheet.get_all_values()
+        assert values[0] == list(self.test_df.columns)
+        assert [row[0] for row in values[1:]] == list(self.test_df['Title'])
+        assert values[1][1] == '100000.0'
+        assert writer.rows == 7
+
+    def test_backoff_on_quota_error(self):
+        """Test panggilan dicoba ulang setelah kuota habis"""
+        worksheet = FakeWorksheet()
+        writer = GoogleSheetsWriter(chunk_size=100, client=FakeGspreadClient(worksheet))
+
+        with patch('utils.load.time.sleep') as mock_sleep:
+            writer.open()
+            worksheet.failures = [make_api_error(429), make_api_error(429, retry_after='7')]
+            writer.write(self.test_df)
+            writer.close()
+
+        assert mock_sleep.call_args_list[0].args[0] == writer.backoff_factor
+        assert mock_sleep.call_args_list[1].args[0] == 7.0
+        assert worksheet.calls.count('update') == 3
+        assert len(worksheet.get_all_values()) == 8
+
+    def test_non_quota_error_not_retried(self):
+        """Test error selain kuota/5xx langsung diteruskan"""
+        worksheet = FakeWorksheet(failures=[make_api_error(403)])
+        writer = GoogleSheetsWriter(client=FakeGspreadClient(worksheet))
+
+        with patch('utils.load.time.sleep') as mock_sleep:
+            with pytest.raises(APIError):
+                writer.open()
+
+        mock_sleep.assert_not_called()
+        assert worksheet.calls == ['clear']
+
+    def test_gives_up_after_max_retries(self):
+        """Test error kuota diteruskan setelah batas percobaan"""
+        worksheet = FakeWorksheet(failures=[make_api_error(429)] * 3)
+        writer = GoogleSheetsWriter(max_retries=2, client=FakeGspreadClient(worksheet))
+
+        with patch('utils.load.time.sleep') as mock_sleep:
+            with pytest.raises(APIError):
+                writer.open()
+
+        assert mock_sleep.call_count == 2
+
+    def sync(self, worksheet, dataframe, **kwargs):
+        writer = GoogleSheetsWriter(client=FakeGspreadClient(worksheet), mode='sync', **kwargs)
+        write_batches(writer, [dataframe])
+        return writer
+
+    def test_sync_sends_only_changed_cells(self):
+        """Test mode sync hanya mengirim sel yang berubah dalam satu batchUpdate"""
+        worksheet = FakeWorksheet()
+        self.sync(worksheet, self.test_df)
+        worksheet.calls = []
+
+        changed = self.test_df.copy()
+        changed['Timestamp'] = '2024-01-01T01:00:00'
+        changed.loc[2, 'Price'] = 90000.0
+        changed.loc[5, ['Price', 'Rating']] = [80000.0, 4.9]
+        writer = self.sync(worksheet, changed)
+
+        assert worksheet.calls == ['batch_update']
+        assert worksheet.reads == 2
+        assert writer.changes == {'inserted': 0, 'updated': 2, 'deleted': 0, 'unchanged': 5, 'cells': 5}
+        values = worksheet.get_all_values()
+        assert values[3][1:3] == ['90000.0', '4.5']
+        assert values[6][1:3] == ['80000.0', '4.9']
+        # Timestamp hanya ditulis pada baris yang berubah
+        assert values[3][6] == '2024-01-01T01:00:00'
+        assert values[1][6] == '2024-01-01T00:00:00'
+
+    def test_sync_appends_and_deletes(self):
+        """Test produk baru ditambahkan dan produk hilang dihapus"""
+        worksheet = FakeWorksheet()
+        self.sync(worksheet, self.test_df)
+        worksheet.calls = []
+
+        new = self.test_df.drop(index=[1, 2, 5]).copy()
+        new.loc[10] = ['Product 10', 50000.0, 4.0, 1, 'S', 'Women', '2024-01-01T01:00:00']
+        writer = self.sync(worksheet, new)
+
+        assert worksheet.calls == ['delete_rows', 'append_rows']
+        assert writer.changes['inserted'] == 1
+        assert writer.changes['deleted'] == 3
+        titles = [row[0] for row in worksheet.get_all_values()]
+        assert titles == ['Title', 'Product 0', 'Product 3', 'Product 4', 'Product 6', 'Product 10']
+
+    def test_sync_keeps_missing_when_pages_failed(self):
+        """Test produk hilang tidak dihapus jika checkpoint mencatat halaman gagal"""
+        worksheet = FakeWorksheet()
+        self.sync(worksheet, self.test_df)
+        worksheet.calls = []
+        checkpoint = Mock()
+        checkpoint.failed_pages.return_value = [2]
+
+        writer = self.sync(worksheet, self.test_df.drop(index=[1, 2, 5]), checkpoint=checkpoint)
+
+        assert worksheet.calls == []
+        assert writer.changes['deleted'] == 0
+        assert len(worksheet.get_all_values()) == 8
+
+    def test_sync_unchanged_sends_nothing(self):
+        """Test data yang tidak berubah tidak mengirim request tulis"""
+        worksheet = FakeWorksheet()
+        self.sync(worksheet, self.test_df)
+        worksheet.calls = []
+
+        writer = self.sync(worksheet, self.test_df)
+
+        assert worksheet.calls == []
+        assert writer.changes['unchanged'] == 7
+
+    def test_sync_rewrites_empty_or_changed_header(self):
+        """Test sheet kosong atau header berbeda ditulis ulang penuh"""
+        worksheet = FakeWorksheet()
+        writer = self.sync(worksheet, self.test_df, chunk_size=3)
+
+        assert worksheet.calls == ['clear', 'update', 'update', 'update']
+        assert writer.changes['inserted'] == 7
+
+        worksheet.calls = []
+        self.sync(worksheet, self.test_df.drop(columns=['Rating']))
+
+        assert worksheet.calls == ['clear', 'update']
+        assert 'Rating' not in worksheet.get_all_values()[0]
+
+    def test_invalid_mode(self):
+        """Test mode yang tidak dikenal ditolak"""
+        with pytest.raises(ValueError):
+            GoogleSheetsWriter(mode='append')
+
+class TestRunLoaders:
+
+    def setup_method(self):
+        self.test_df = pd.DataFrame({'Title': ['Product 1'], 'Price': [100000.0]})
+
+    def test_loaders_run_in_parallel(self):
+        """Test semua loader berjalan bersamaan pada DataFrame yang sama"""
+        barrier = threading.Barrier(3, timeout=5)
+        received = []
+
+        def loader(df):
+            received.append(df)
+            barrier.wait()  # Gagal dengan BrokenBarrierError jika dijalankan berurutan
+            return True
+
+        results = run_loaders(self.test_df, [('a', loader), ('b', loader), ('c', loader)])
+
+        assert [result['name'] for result in results] == ['a', 'b', 'c']
+        assert all(result['success'] for result in results)
+        assert all(df is self.test_df for df in received)
+
+    def test_reports_status_and_timing(self):
+        """Test status dan waktu dicatat per loader"""
+        def slow(df):
+            time.sleep(0.05)
+            return True
+
+        def failing(df):
+            raise RuntimeError("boom")
+
+        results = run_loaders(self.test_df, [
+            ('slow', slow),
+            ('false', lambda df: False),
+            ('error', failing),
+            ('legacy', lambda df: None),
+        ])
+
+        status = {result['name']: result['success'] for result in results}
+        assert status == {'slow': True, 'false': False, 'error': False, 'legacy': True}
+        assert results[0]['seconds'] >= 0.05
+        assert results[2]['error'] == 'boom'
+
+    def test_load_functions_return_status(self):
+        """Test fungsi load_* mengembalikan status keberhasilan"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            assert load_to_csv(self.test_df, os.path.join(tmp_dir, 'out.csv')) is True
+            assert load_to_csv(self.test_df, os.path.join(tmp_dir, 'missing', 'out.csv')) is False
+        with patch('utils.load.os.path.exists', return_value=False):
+            assert load_to_google_sheets(self.test_df) is False
+
+class TestColumnarWriter:
+
+    def setup_method(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.test_df = pd.DataFrame({
+            'Title': ['Product 1', 'Product 2', 'Product 3'],
+            'Price': [100000.0, 200000.0, 300000.0],
+            'Rating': [4.5, 3.8, 4.0],
+            'Colors': [3, 2, 1],
+            'Size': ['M', 'L', 'S'],
+            'Gender': ['Unisex', 'Male', 'Women'],
+            'Timestamp': ['2024-01-01T00:00:00', '2024-01-01T00:00:01', '2024-01-01T00:00:02']
+        })
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_parquet_roundtrip_keeps_dtypes(self):
+        """Test Parquet menyimpan tipe kolom tanpa inferensi ulang"""
+        path = os.path.join(self.tmp_dir, 'products.parquet')
+
+        assert load_to_columnar(self.test_df, path) is True
+
+        loaded = pd.read_parquet(path)
+        pd.testing.assert_frame_equal(loaded, self.test_df)
+        assert loaded['Colors'].dtype == 'int64'
+
+    def test_feather_streaming_batches_memory_mapped(self):
+        """Test Feather ditulis per batch dan dapat di-memory-map"""
+        import pyarrow as pa
+        path = os.path.join(self.tmp_dir, 'products.feather')
+
+        rows = write_batches(ColumnarWriter(path), [self.test_df.iloc[:2], self.test_df.iloc[2:]])
+
+        assert rows == 3
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        assert table.num_rows == 3
+        assert table.column('Title').to_pylist() == list(self.test_df['Title'])
+
+    def test_feather_streaming_compact_batches(self):
+        """Test batch skema ringkas dengan kategori berbeda dapat dialirkan ke Feather"""
+        from utils.transform import transform_batches
+        raw = [dict(row, Price='10.00', Rating='4.0', Colors='2')
+               for row in self.test_df.to_dict('records')]
+        path = os.path.join(self.tmp_dir, 'products.feather')
+
+        rows = write_batches(ColumnarWriter(path),
+                             transform_batches(iter([raw[:1], raw[1:]]), compact=True))
+
+        loaded = pd.read_feather(path)
+        assert rows == 3
+        assert loaded['Size'].tolist() == ['M', 'L', 'S']
+        assert loaded['Gender'].tolist() == ['Unisex', 'Male', 'Women']
+
+    def test_configurable_compression(self):
+        """Test kompresi dapat dipilih per format"""
+        import pyarrow.parquet as pq
+        path = os.path.join(self.tmp_dir, 'products.parquet')
+
+        write_batches(ColumnarWriter(path, compression='zstd'), [self.test_df])
+
+        assert pq.ParquetFile(path).metadata.row_group(0).column(0).compression == 'ZSTD'
+        feather = os.path.join(self.tmp_dir, 'products.arrow')
+        write_batches(ColumnarWriter(feather, compression='lz4'), [self.test_df])
+        pd.testing.assert_frame_equal(pd.read_feather(feather), self.test_df)
+
+    def test_abort_leaves_no_partial_file(self):
+        """Test file tujuan tidak dibuat jika penulisan gagal"""
+        path = os.path.join(self.tmp_dir, 'products.parquet')
+        bad_batch = self.test_df.assign(Colors=['x', 'y', 'z'])
+
+        with pytest.raises(Exception):
+            write_batches(ColumnarWriter(path), [self.test_df, bad_batch])
+
+        assert os.listdir(self.tmp_dir) == []
+
+    def test_unknown_extension(self):
+        """Test ekstensi yang tidak dikenal ditolak"""
+        with pytest.raises(ValueError):
+            ColumnarWriter(os.path.join(self.tmp_dir, 'products.txt'))
+        assert load_to_columnar(self.test_df, os.path.join(self.tmp_dir, 'products.txt')) is False
+
+class TestCompactDtypesLoad:
+
+    def setup_method(self):
+        from utils.transform import compact_dtypes
+        self.standard = pd.DataFrame({
+            'Title': ['Product 1', 'Product 2'],
+            'Price': [100000.0, 200000.0],
+            'Rating': [4.8, 3.9],
+            'Colors': [3, 2],
+            'Size': ['M', 'L'],
+            'Gender': ['Unisex', 'Male'],
+            'Timestamp': ['2024-01-01T00:00:00.123456', '2024-01-01T00:00:01']
+        })
+        self.compact = compact_dtypes(self.standard)
+
+    def test_csv_output_identical(self):
+        """Test CSV dari skema ringkas sama persis dengan skema standar"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            outputs = []
+            for name, df in [('standard', self.standard), ('compact', self.compact)]:
+                path = os.path.join(tmp_dir, f'{name}.csv')
+                write_batches(CsvWriter(path), [df])
+                with open(path) as f:
+                    outputs.append(f.read())
+
+        assert outputs[0] == outputs[1]
+        assert '2024-01-01T00:00:00.123456' in outputs[1]
+        assert '4.8,' in outputs[1]
+
+    def test_sheets_values_identical(self):
+        """Test nilai yang dikirim ke Sheets sama untuk kedua skema"""
+        sent = []
+        for df in [self.standard, self.compact]:
+            worksheet = FakeWorksheet()
+            write_batches(GoogleSheetsWriter(client=FakeGspreadClient(worksheet)), [df])
+            sent.append(worksheet.get_all_values())
+
+        assert sent[0] == sent[1]
+
+    @patch('utils.load.psycopg2.connect')
+    def test_postgres_copy_identical(self, mock_connect):
+        """Test buffer COPY sama untuk kedua skema"""
+        buffers = []
+        mock_cursor = Mock()
+        mock_cursor.copy_expert.side_effect = lambda sql, buffer: buffers.append(buffer.getvalue())
+        mock_connect.return_value.cursor.return_value = mock_cursor
+
+        for df in [self.standard, self.compact]:
+            write_batches(PostgresWriter('products'), [df])
+
+        assert buffers[0] == buffers[1]
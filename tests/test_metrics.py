@@ -0,0 +1,138 @@
+import pytest
+import json
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import metrics
+from utils.metrics import Collector, stage
+
+class TestMetrics:
+
+    def setup_method(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        metrics.disable()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_disabled_is_noop(self):
+        """Test instrumentasi nonaktif tidak membaca jam maupun memori"""
+        with patch('utils.metrics.time.perf_counter') as mock_clock, \
+             patch('utils.metrics.process_max_rss_bytes') as mock_rss:
+            with stage('extract', page=1) as record:
+                record.add_rows(10)
+
+        assert record is metrics.NOOP
+        mock_clock.assert_not_called()
+        mock_rss.assert_not_called()
+
+    def test_stage_records_wall_cpu_rss_and_rows(self):
+        """Test tahap mencatat waktu wall, CPU, puncak RSS proses, dan jumlah baris"""
+        collector = metrics.enable()
+
+        with patch('utils.metrics.time.perf_counter', side_effect=[10.0, 12.5]), \
+             patch('utils.metrics.time.process_time', side_effect=[1.0, 1.75]), \
+             patch('utils.metrics.process_max_rss_bytes', return_value=1024):
+            with stage('transform') as record:
+                record.add_rows(3)
+                record.add_rows(2)
+
+        [saved] = collector.records
+        assert saved.to_dict() == {
+            'name': 'transform', 'labels': {}, 'wall_seconds': 2.5,
+            'cpu_seconds': 0.75, 'process_max_rss_bytes': 1024, 'rows': 5,
+        }
+
+    def test_per_thread_uses_thread_time(self):
+        """Test pengukuran per thread memakai waktu CPU thread"""
+        collector = metrics.enable()
+
+        with patch('utils.metrics.time.thread_time', side_effect=[0.0, 0.5]) as mock_thread:
+            with stage('extract.page', per_thread=True, page=3):
+                pass
+
+        assert mock_thread.call_count == 2
+        assert collector.records[0].labels == {'page': 3}
+
+    def test_stage_recorded_on_error(self):
+        """Test tahap yang gagal tetap tercatat dan error diteruskan"""
+        collector = metrics.enable()
+
+        with pytest.raises(ValueError):
+            with stage('load'):
+                raise ValueError("boom")
+
+        assert [record.name for record in collector.records] == ['load']
+
+    def test_summary_aggregates_per_stage(self):
+        """Test ringkasan menggabungkan record per halaman"""
+        collector = Collector()
+        for page, rows in [(1, 20), (2, 0), (3, 20)]:
+            with collector.stage('extract.page', page=page) as record:
+                record.add_rows(rows)
+        with collector.stage('transform'):
+            pass
+
+        summary = collector.summary()
+
+        assert [(entry['name'], entry['count'], entry['rows']) for entry in summary] == [
+            ('extract.page', 3, 40), ('transform', 1, None)]
+
+    def test_export_json(self):
+        """Test export JSON berisi ringkasan dan seluruh record"""
+        collector = Collector()
+        with collector.stage('extract.page', page=1) as record:
+            record.add_rows(20)
+        path = os.path.join(self.tmp_dir, 'metrics.json')
+
+        collector.export(path)
+
+        with open(path) as f:
+            data = json.load(f)
+        assert data['stages'][0]['rows'] == 20
+        assert data['records'][0]['labels'] == {'page': 1}
+
+    def test_export_prometheus(self):
+        """Test export Prometheus textfile"""
+        collector = Collector()
+        with patch('utils.metrics.process_max_rss_bytes', return_value=None):
+            with collector.stage('load.CSV') as record:
+                record.add_rows(7)
+        path = os.path.join(self.tmp_dir, 'etl.prom')
+
+        collector.export(path)
+
+        with open(path) as f:
+            text = f.read()
+        assert '# TYPE etl_stage_wall_seconds gauge' in text
+        assert 'etl_stage_rows{stage="load.CSV"} 7' in text
+        assert 'etl_process_max_rss_bytes' not in text
+        assert os.listdir(self.tmp_dir) == ['etl.prom']
+
+    def test_export_prometheus_process_rss_once(self):
+        """Test puncak RSS proses diekspor sekali tanpa label tahap"""
+        collector = Collector()
+        for name, rss in [('extract', 2048), ('transform', 4096)]:
+            with patch('utils.metrics.process_max_rss_bytes', return_value=rss):
+                with collector.stage(name):
+                    pass
+
+        text = collector.to_prometheus()
+
+        assert 'etl_process_max_rss_bytes 4096' in text
+        assert 'etl_process_max_rss_bytes{' not in text
+
+    def test_scrape_pages_instrumented(self):
+        """Test setiap halaman ekstraksi tercatat dengan nomor halaman"""
+        from utils.extract import scrape_products
+        collector = metrics.enable()
+
+        with patch('utils.extract.discover_total_pages', return_value=2), \
+             patch('utils.extract.scrape_page', side_effect=lambda page, **kwargs: [{'Title': page}] * page):
+            scrape_products(max_workers=1)
+
+        pages = [(r.labels['page'], r.rows) for r in collector.records if r.name == 'extract.page']
+        assert pages == [(1, 1), (2, 2)]
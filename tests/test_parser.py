@@ -0,0 +1,94 @@
+import pytest
+from bs4 import BeautifulSoup
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.parser import available_backends, get_parser, extract_card
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+def reference_extract(html):
+    """Implementasi asli scrape_page (empat kali find per kartu) sebagai acuan"""
+    soup = BeautifulSoup(html, 'html.parser')
+    products = []
+    for product in soup.find_all('div', class_='collection-card'):
+        title_elem = product.find('h3', class_='product-title')
+        price_span = product.find('span', class_='price')
+        rating_p = product.find('p', string=lambda text: text and 'Rating' in text)
+        colors_p = product.find('p', string=lambda text: text and 'Colors' in text)
+        size_p = product.find('p', string=lambda text: text and 'Size:' in text)
+        gender_p = product.find('p', string=lambda text: text and 'Gender:' in text)
+        products.append({
+            "Title": title_elem.text.strip() if title_elem else 'Unknown Product',
+            "Price": price_span.text.strip().replace('$', '') if price_span else 'N/A',
+            "Rating": rating_p.text.split('/')[0].replace('Rating:', '').strip() if rating_p else 'Invalid',
+            "Colors": colors_p.text.replace('Colors', '').strip() if colors_p else 'N/A',
+            "Size": size_p.text.replace('Size:', '').strip() if size_p else 'N/A',
+            "Gender": gender_p.text.replace('Gender:', '').strip() if gender_p else 'N/A',
+        })
+    return products
+
+EDGE_CASE_HTML = '''
+<html>
+    <div class="collection-card featured">
+        <h3 class="product-title"> Nested <b>Title</b> </h3>
+        <span class="price old">$10.00</span>
+        <p>Rating: <span>4.0</span> / 5</p>
+        <p><span>Rating: 3.5 / 5</span></p>
+        <p>Colors 2</p>
+        <p>Gender: Women</p>
+        <p>Size: XL</p>
+    </div>
+    <div class="collection-card">
+        <h3 class="product-title">Empty Card</h3>
+        <p></p>
+        <p> </p>
+    </div>
+</html>
+'''
+
+class TestParser:
+
+    @pytest.mark.parametrize('backend', available_backends())
+    @pytest.mark.parametrize('fixture', ['fashion_studio_page1.html', 'fashion_studio_page2.html'])
+    def test_backend_matches_reference(self, backend, fixture):
+        """Test setiap backend menghasilkan dict yang identik dengan implementasi asli"""
+        html = load_fixture(fixture)
+        parser = get_parser(backend)
+
+        result = [extract_card(parser, card) for card in parser.cards(html)]
+
+        assert result == reference_extract(html)
+        assert len(result) == 20
+
+    @pytest.mark.parametrize('backend', available_backends())
+    def test_backend_edge_cases(self, backend):
+        """Test elemen bersarang dan <p> kosong diperlakukan sama seperti BeautifulSoup"""
+        parser = get_parser(backend)
+
+        result = [extract_card(parser, card) for card in parser.cards(EDGE_CASE_HTML)]
+
+        assert result == reference_extract(EDGE_CASE_HTML)
+        assert result[0]['Rating'] == '3.5'
+
+    @pytest.mark.parametrize('backend', available_backends())
+    def test_backend_empty_page(self, backend):
+        """Test halaman tanpa kartu produk"""
+        parser = get_parser(backend)
+
+        assert list(parser.cards('<html><body>No products found</body></html>')) == []
+        assert list(parser.cards('')) == []
+
+    def test_default_backend_is_fastest_available(self):
+        """Test backend default adalah prioritas tertinggi yang terpasang"""
+        assert get_parser().name == available_backends()[0]
+        assert available_backends()[-1] == 'html.parser'
+
+    def test_unknown_backend(self):
+        """Test nama backend yang tidak dikenal"""
+        with pytest.raises(ValueError):
+            get_parser('regex')
@@ -0,0 +1,118 @@
+import pytest
+from unittest.mock import Mock, patch
+import requests
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.rate_limit import RateLimiter
+from utils.session import RetrySession
+
+class FakeClock:
+    """Jam palsu untuk menggantikan modul time di utils.rate_limit"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestRateLimiter:
+
+    def setup_method(self):
+        """Ganti modul time dengan jam palsu"""
+        self.clock = FakeClock()
+        self.patcher = patch('utils.rate_limit.time', self.clock)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_burst_without_waiting(self):
+        """Test request sebanyak burst dapat dikirim tanpa menunggu"""
+        limiter = RateLimiter(rate=2, burst=3)
+
+        waits = [limiter.acquire() for _ in range(3)]
+
+        assert waits == [0.0, 0.0, 0.0]
+        assert self.clock.sleeps == []
+
+    def test_wait_after_burst_exhausted(self):
+        """Test request setelah burst harus menunggu sesuai rate"""
+        limiter = RateLimiter(rate=2, burst=1)
+
+        limiter.acquire()
+        waited = limiter.acquire()
+
+        assert waited == pytest.approx(0.5)
+
+    def test_tokens_refill_over_time(self):
+        """Test token terisi kembali seiring waktu"""
+        limiter = RateLimiter(rate=4, burst=2)
+        limiter.acquire()
+        limiter.acquire()
+
+        self.clock.now += 0.5
+
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() == 0.0
+
+    def test_backoff_on_throttle_status(self):
+        """Test laju diturunkan saat server membalas 429/503"""
+        limiter = RateLimiter(rate=4, burst=4)
+
+        limiter.record(0.1, 429)
+        assert limiter.rate == pytest.approx(2.0)
+
+        limiter.record(0.1, 503)
+        assert limiter.rate == pytest.approx(1.0)
+
+    def test_backoff_on_high_latency(self):
+        """Test laju diturunkan saat latensi tinggi atau request gagal"""
+        limiter = RateLimiter(rate=4, burst=4, latency_threshold=1.0)
+
+        limiter.record(3.0, 200)
+        slowed_rate = limiter.rate
+        limiter.record(0.5, None)
+
+        assert slowed_rate < 4
+        assert limiter.rate < slowed_rate
+
+    def test_rate_recovers_and_respects_bounds(self):
+        """Test laju pulih bertahap tanpa melewati batas atas dan bawah"""
+        limiter = RateLimiter(rate=2, burst=2, min_rate=0.5)
+
+        for _ in range(10):
+            limiter.record(0.1, 429)
+        assert limiter.rate == pytest.approx(0.5)
+
+        for _ in range(50):
+            limiter.record(0.1, 200)
+        assert limiter.rate == pytest.approx(2.0)
+
+    def test_invalid_configuration(self):
+        """Test konfigurasi rate dan burst yang tidak valid"""
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
+        with pytest.raises(ValueError):
+            RateLimiter(rate=1, burst=0)
+
+    @patch('utils.session.time.sleep')
+    @patch.object(requests.Session, 'request')
+    def test_session_reports_to_limiter(self, mock_request, mock_sleep):
+        """Test session mengambil token dan melaporkan setiap percobaan"""
+        throttled = Mock(status_code=429, headers={'Retry-After': '0'})
+        ok = Mock(status_code=200, headers={})
+        mock_request.side_effect = [throttled, ok]
+        limiter = Mock()
+        session = RetrySession(rate_limiter=limiter)
+
+        session.get('https://example.com')
+
+        assert limiter.acquire.call_count == 2
+        statuses = [call.args[1] for call in limiter.record.call_args_list]
+        assert statuses == [429, 200]
@@ -0,0 +1,97 @@
+import tempfile
+import shutil
+import psycopg2
+from unittest.mock import Mock, patch
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.resources import PipelineResources
+from utils.sinks import SINK_REGISTRY, create_sinks
+
+class TestPipelineResources:
+
+    def setup_method(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.registry = dict(SINK_REGISTRY)
+        with patch('utils.resources.PageCache'), patch('utils.resources.PageCheckpoint'):
+            self.resources = PipelineResources(credentials_path=os.path.join(self.tmp_dir, 'creds.json'))
+
+    def teardown_method(self):
+        self.resources.close()
+        SINK_REGISTRY.clear()
+        SINK_REGISTRY.update(self.registry)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_sheets_client_authorized_once(self):
+        """Test otorisasi Google Sheets hanya dilakukan sekali"""
+        open(self.resources.credentials_path, 'w').close()
+
+        with patch('utils.resources.authorize_sheets') as mock_authorize:
+            first = self.resources.sheets_client()
+            second = self.resources.sheets_client()
+
+        mock_authorize.assert_called_once_with(self.resources.credentials_path)
+        assert first is second
+
+    def test_sheets_client_without_credentials(self):
+        """Test klien None jika kredensial tidak ada, agar writer melaporkan error"""
+        with patch('utils.resources.authorize_sheets') as mock_authorize:
+            assert self.resources.sheets_client() is None
+
+        mock_authorize.assert_not_called()
+
+    def test_postgres_pool_created_once(self):
+        """Test pool PostgreSQL dibuat sekali dan ditutup saat close"""
+        with patch('utils.resources.pg_pool.ThreadedConnectionPool') as mock_pool:
+            pool = self.resources.postgres_pool()
+            assert self.resources.postgres_pool() is pool
+
+        mock_pool.assert_called_once()
+        self.resources.close()
+        pool.closeall.assert_called_once()
+
+    def test_postgres_pool_retried_after_failure(self):
+        """Test kegagalan koneksi tidak di-cache sehingga dicoba lagi pada run berikutnya"""
+        with patch('utils.resources.pg_pool.ThreadedConnectionPool',
+                   side_effect=[psycopg2.OperationalError("down"), Mock()]) as mock_pool:
+            assert self.resources.postgres_pool() is None
+            assert self.resources.postgres_pool() is not None
+
+        assert mock_pool.call_count == 2
+
+    def test_register_sinks_uses_shared_connections(self):
+        """Test sink Google Sheets dan PostgreSQL memakai klien dan pool bersama"""
+        client, pool = Mock(), Mock()
+        self.resources._sheets_client = client
+        self.resources._postgres_pool = pool
+        order = list(SINK_REGISTRY)
+
+        self.resources.register_sinks()
+        sinks = {sink.name: sink for sink in create_sinks(['Google Sheets', 'PostgreSQL'])}
+
+        assert list(SINK_REGISTRY) == order
+        assert sinks['Google Sheets'].writer.client is client
+        assert sinks['Google Sheets'].writer.mode == 'rewrite'
+        assert sinks['Google Sheets'].writer.checkpoint is self.resources.checkpoint
+        assert sinks['PostgreSQL'].writer.pool is pool
+        assert sinks['PostgreSQL'].writer.strategy == 'delete'
+        assert sinks['PostgreSQL'].writer.checkpoint is self.resources.checkpoint
+
+    def test_pipeline_closes_only_own_resources(self):
+        """Test main menutup resources yang dibuatnya sendiri, tetapi tidak milik daemon"""
+        import main
+        created = Mock()
+
+        for pipeline in (main.main, main.main_streaming):
+            created.reset_mock()
+            shared = Mock()
+            with patch('main.PipelineResources', return_value=created), \
+                    patch('main.metrics.enable', side_effect=RuntimeError("stop")):
+                for resources in (None, shared):
+                    try:
+                        pipeline(metrics_path='metrics.json', resources=resources)
+                    except RuntimeError:
+                        pass
+
+            created.close.assert_called_once()
+            shared.close.assert_not_called()
@@ -0,0 +1,156 @@
+import pytest
+import datetime
+import tempfile
+import shutil
+from unittest.mock import Mock, patch
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.scheduler import CronSchedule, IntervalSchedule, RunLock, Scheduler, parse_cron_field
+
+def at(*args):
+    return datetime.datetime(*args).timestamp()
+
+class FakeClock:
+    """Jam palsu untuk menggantikan modul time di utils.scheduler"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class TestSchedules:
+
+    def test_parse_cron_field(self):
+        """Test sintaks field cron yang didukung"""
+        assert parse_cron_field('*/15', 'menit', 0, 59) == {0, 15, 30, 45}
+        assert parse_cron_field('1-5', 'hari', 0, 7) == {1, 2, 3, 4, 5}
+        assert parse_cron_field('8,12-14/2', 'jam', 0, 23) == {8, 12, 14}
+        assert parse_cron_field('50/5', 'menit', 0, 59) == {50, 55}
+
+    @pytest.mark.parametrize('expression', ['* * * *', '60 * * * *', 'x * * * *', '*/0 * * * *'])
+    def test_invalid_cron(self, expression):
+        """Test ekspresi cron yang tidak valid ditolak"""
+        with pytest.raises(ValueError):
+            CronSchedule(expression)
+
+    def test_cron_hourly(self):
+        """Test jadwal setiap jam tepat"""
+        schedule = CronSchedule('0 * * * *')
+
+        assert schedule.next_after(at(2024, 3, 5, 7, 0)) == at(2024, 3, 5, 8, 0)
+        assert schedule.next_after(at(2024, 3, 5, 7, 59, 30)) == at(2024, 3, 5, 8, 0)
+        assert schedule.next_after(at(2024, 12, 31, 23, 15)) == at(2025, 1, 1, 0, 0)
+
+    def test_cron_weekdays_and_months(self):
+        """Test jadwal hari kerja dan bulan tertentu"""
+        # 2024-03-09 adalah hari Sabtu
+        assert CronSchedule('30 6 * * 1-5').next_after(at(2024, 3, 8, 7, 0)) == at(2024, 3, 11, 6, 30)
+        assert CronSchedule('0 0 1 6 *').next_after(at(2024, 3, 5, 0, 0)) == at(2024, 6, 1, 0, 0)
+        # Minggu boleh ditulis 0 atau 7
+        assert CronSchedule('0 0 * * 7').next_after(at(2024, 3, 5, 0, 0)) == at(2024, 3, 10, 0, 0)
+
+    def test_cron_day_or_weekday(self):
+        """Test tanggal dan hari yang sama-sama dibatasi cocok jika salah satunya cocok"""
+        schedule = CronSchedule('0 0 15 * 1')
+
+        # Senin 2024-03-11 datang sebelum tanggal 15
+        assert schedule.next_after(at(2024, 3, 5, 12, 0)) == at(2024, 3, 11, 0, 0)
+
+    def test_cron_never_matches(self):
+        """Test ekspresi yang tidak pernah cocok menghasilkan error"""
+        with pytest.raises(ValueError):
+            CronSchedule('0 0 30 2 *').next_after(at(2024, 1, 1))
+
+    def test_interval(self):
+        """Test jadwal selang waktu tetap"""
+        assert IntervalSchedule(3600).next_after(100.0) == 3700.0
+        with pytest.raises(ValueError):
+            IntervalSchedule(0)
+
+class TestScheduler:
+
+    def setup_method(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.lock_path = os.path.join(self.tmp_dir, 'pipeline.lock')
+        self.clock = FakeClock(now=1000.0)
+        self.patcher = patch('utils.scheduler.time', self.clock)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_run_lock_prevents_overlap(self):
+        """Test run kedua tidak dapat berjalan selama run pertama belum selesai"""
+        first = RunLock(self.lock_path)
+        other_process = RunLock(self.lock_path)
+
+        assert first.acquire()
+        assert not first.acquire()
+        assert not other_process.acquire()
+        first.release()
+        assert other_process.acquire()
+        other_process.release()
+
+    def test_runs_on_interval(self):
+        """Test job dijalankan sesuai selang waktu"""
+        started = []
+        scheduler = Scheduler(lambda: started.append(self.clock.now), IntervalSchedule(60),
+                              lock=RunLock(self.lock_path))
+
+        scheduler.run_forever(max_runs=3)
+
+        assert started == [1060.0, 1120.0, 1180.0]
+        assert scheduler.runs == 3
+
+    def test_overrun_skips_missed_schedule(self):
+        """Test run yang lebih lama dari selang waktu tidak menumpuk"""
+        started = []
+
+        def slow_job():
+            started.append(self.clock.now)
+            self.clock.now += 150
+
+        scheduler = Scheduler(slow_job, IntervalSchedule(60), lock=RunLock(self.lock_path))
+
+        scheduler.run_forever(run_immediately=True, max_runs=2)
+
+        assert started == [1000.0, 1210.0]
+        assert scheduler.skipped == 2
+
+    def test_job_error_does_not_stop_scheduler(self):
+        """Test error pada satu run tidak menghentikan daemon"""
+        job = Mock(side_effect=[RuntimeError("boom"), None])
+        scheduler = Scheduler(job, IntervalSchedule(60), lock=RunLock(self.lock_path))
+
+        scheduler.run_forever(max_runs=2)
+
+        assert job.call_count == 2
+        assert scheduler.failures == 1
+
+    def test_skips_when_locked(self):
+        """Test run dilewati jika pipeline lain sedang berjalan"""
+        job = Mock()
+        scheduler = Scheduler(job, IntervalSchedule(60), lock=RunLock(self.lock_path))
+        other = RunLock(self.lock_path)
+        other.acquire()
+
+        assert scheduler.run_once() is False
+
+        other.release()
+        job.assert_not_called()
+        assert scheduler.skipped == 1
+
+    def test_stop(self):
+        """Test scheduler berhenti setelah run yang sedang berjalan"""
+        scheduler = Scheduler(None, IntervalSchedule(60), lock=RunLock(self.lock_path))
+        scheduler.job = scheduler.stop
+
+        scheduler.run_forever()
+
+        assert scheduler.runs == 1
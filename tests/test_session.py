@@ -0,0 +1,116 @@
+import pytest
+from unittest.mock import Mock, patch
+import requests
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.session import RetrySession, create_session, parse_retry_after
+
+def make_response(status_code, headers=None):
+    """Membuat mock response dengan status code tertentu"""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+class TestSession:
+
+    def test_create_session_pooling_and_headers(self):
+        """Test session memakai adapter dengan pool dan header default"""
+        session = create_session(headers={'User-Agent': 'test-agent'}, pool_size=4)
+
+        adapter = session.get_adapter('https://fashion-studio.dicoding.dev/')
+        assert isinstance(session, RetrySession)
+        assert adapter._pool_maxsize == 4
+        assert session.headers['User-Agent'] == 'test-agent'
+
+    @patch('utils.session.time.sleep')
+    @patch.object(requests.Session, 'request')
+    def test_retry_on_server_error(self, mock_request, mock_sleep):
+        """Test retry ketika server mengembalikan status 5xx"""
+        mock_request.side_effect = [make_response(503), make_response(502), make_response(200)]
+        session = RetrySession(max_retries=3)
+
+        response = session.get('https://example.com')
+
+        assert response.status_code == 200
+        assert mock_request.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch('utils.session.time.sleep')
+    @patch.object(requests.Session, 'request')
+    def test_retry_on_timeout(self, mock_request, mock_sleep):
+        """Test retry ketika terjadi timeout atau error koneksi"""
+        mock_request.side_effect = [
+            requests.exceptions.Timeout("Request timeout"),
+            requests.exceptions.ConnectionError("Handshake failed"),
+            make_response(200)
+        ]
+        session = RetrySession(max_retries=3)
+
+        response = session.get('https://example.com')
+
+        assert response.status_code == 200
+        assert mock_request.call_count == 3
+
+    @patch('utils.session.time.sleep')
+    @patch.object(requests.Session, 'request')
+    def test_retry_exhausted_raises(self, mock_request, mock_sleep):
+        """Test exception diteruskan setelah semua percobaan gagal"""
+        mock_request.side_effect = requests.exceptions.Timeout("Request timeout")
+        session = RetrySession(max_retries=2)
+
+        with pytest.raises(requests.exceptions.Timeout):
+            session.get('https://example.com')
+
+        assert mock_request.call_count == 3
+
+    @patch('utils.session.time.sleep')
+    @patch.object(requests.Session, 'request')
+    def test_retry_exhausted_returns_last_response(self, mock_request, mock_sleep):
+        """Test response terakhir dikembalikan jika status 5xx terus berulang"""
+        mock_request.return_value = make_response(500)
+        session = RetrySession(max_retries=2)
+
+        response = session.get('https://example.com')
+
+        assert response.status_code == 500
+        assert mock_request.call_count == 3
+
+    @patch('utils.session.time.sleep')
+    @patch.object(requests.Session, 'request')
+    def test_honor_retry_after_on_429(self, mock_request, mock_sleep):
+        """Test header Retry-After dihormati untuk status 429"""
+        mock_request.side_effect = [make_response(429, {'Retry-After': '7'}), make_response(200)]
+        session = RetrySession(max_retries=3)
+
+        response = session.get('https://example.com')
+
+        assert response.status_code == 200
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch.object(requests.Session, 'request')
+    def test_no_retry_on_client_error(self, mock_request):
+        """Test status 404 tidak dicoba ulang"""
+        mock_request.return_value = make_response(404)
+        session = RetrySession(max_retries=3)
+
+        response = session.get('https://example.com')
+
+        assert response.status_code == 404
+        assert mock_request.call_count == 1
+
+    def test_backoff_delay_is_bounded(self):
+        """Test waktu tunggu backoff berada dalam batas jitter"""
+        session = RetrySession(backoff_factor=1, max_backoff=5)
+
+        for attempt in range(6):
+            delay = session.backoff_delay(attempt)
+            assert 0 <= delay <= min(5, 2 ** attempt)
+
+    def test_parse_retry_after(self):
+        """Test parsing header Retry-After"""
+        assert parse_retry_after('3') == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('bukan tanggal') is None
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
@@ -0,0 +1,77 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.sheets_sync import column_letter, plan_sync, delete_rows_requests
+
+HEADER = ['Title', 'Price', 'Size', 'Timestamp']
+KEY = ['Title', 'Size']
+
+class TestSheetsSync:
+
+    def test_column_letter(self):
+        """Test konversi indeks kolom ke huruf A1"""
+        assert [column_letter(i) for i in (0, 25, 26, 27, 701, 702)] == ['A', 'Z', 'AA', 'AB', 'ZZ', 'AAA']
+
+    def test_changed_cells_grouped_per_row(self):
+        """Test sel berubah yang berdekatan digabung dalam satu rentang"""
+        current = [HEADER, ['A', '1', 'M', 't0'], ['B', '2', 'L', 't0']]
+        rows = [['A', '1', 'M', 't1'], ['B', '3', 'L', 't1']]
+
+        plan = plan_sync(current, HEADER, rows, KEY, ignore_columns=['Timestamp'])
+
+        assert plan['updates'] == [{'range': 'B3', 'values': [['3']]},
+                                   {'range': 'D3', 'values': [['t1']]}]
+        assert (plan['updated'], plan['unchanged'], plan['cells']) == (1, 1, 2)
+        assert plan['appends'] == [] and plan['deletes'] == []
+
+    def test_adjacent_cells_single_range(self):
+        """Test sel berurutan dikirim sebagai satu rentang"""
+        current = [HEADER, ['A', '1', 'M', 't0']]
+
+        plan = plan_sync(current, HEADER, [['A', '2', 'S', 't1']], ['Title'])
+
+        assert plan['updates'] == [{'range': 'B2:D2', 'values': [['2', 'S', 't1']]}]
+        assert plan['cells'] == 3
+
+    def test_appends_and_deletes(self):
+        """Test baris baru ditambahkan dan baris hilang dihapus dari bawah"""
+        current = [HEADER] + [[t, '1', 'M', 't0'] for t in 'ABCDE']
+        rows = [['A', '1', 'M', 't0'], ['D', '1', 'M', 't0'], ['F', '1', 'M', 't0']]
+
+        plan = plan_sync(current, HEADER, rows, KEY)
+
+        assert plan['appends'] == [['F', '1', 'M', 't0']]
+        # B, C di baris 3-4 dan E di baris 6
+        assert plan['deletes'] == [(6, 6), (3, 4)]
+
+    def test_duplicate_keys_matched_in_order(self):
+        """Test kunci ganda dicocokkan sesuai urutan kemunculan"""
+        current = [HEADER, ['A', '1', 'M', 't0'], ['A', '2', 'M', 't0'], ['A', '3', 'M', 't0']]
+        rows = [['A', '1', 'M', 't0'], ['A', '5', 'M', 't0']]
+
+        plan = plan_sync(current, HEADER, rows, KEY)
+
+        assert plan['updates'] == [{'range': 'B3', 'values': [['5']]}]
+        assert plan['deletes'] == [(4, 4)]
+
+    def test_short_rows_padded(self):
+        """Test baris sheet dengan sel kosong di akhir tetap dibandingkan"""
+        current = [HEADER + [''], ['A', '1', 'M']]
+
+        plan = plan_sync(current, HEADER, [['A', '1', 'M', '']], KEY)
+
+        assert plan['rewrite'] is False
+        assert plan['unchanged'] == 1
+
+    @pytest.mark.parametrize('current', [[], [['Title', 'Price']]])
+    def test_rewrite_when_header_differs(self, current):
+        """Test sheet kosong atau header berbeda perlu ditulis ulang"""
+        assert plan_sync(current, HEADER, [], KEY)['rewrite'] is True
+
+    def test_delete_rows_requests(self):
+        """Test rentang baris diubah menjadi indeks deleteDimension"""
+        [request] = delete_rows_requests(7, [(3, 4)])
+
+        assert request['deleteDimension']['range'] == {
+            'sheetId': 7, 'dimension': 'ROWS', 'startIndex': 2, 'endIndex': 4}
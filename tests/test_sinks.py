@@ -0,0 +1,179 @@
+import pytest
+import pandas as pd
+from unittest.mock import patch
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import sinks as sinks_module
+from utils.sinks import (Sink, SINK_REGISTRY, register_sink, unregister_sink, create_sinks,
+                         load_dataframe, stream_batches)
+
+def make_frame(start, count):
+    return pd.DataFrame({'Title': [f'Product {i}' for i in range(start, start + count)]})
+
+class RecordingWriter:
+    """Writer lokal yang mencatat setiap panggilan"""
+
+    def __init__(self, fail_on_write=False):
+        self.fail_on_write = fail_on_write
+        self.calls = []
+        self.batches = []
+
+    def open(self):
+        self.calls.append('open')
+
+    def write(self, dataframe):
+        if self.fail_on_write:
+            raise RuntimeError("write failed")
+        self.batches.append(dataframe)
+
+    def close(self):
+        self.calls.append('close')
+
+    def abort(self):
+        self.calls.append('abort')
+
+class TestSink:
+
+    def test_rebatches_to_preferred_size(self):
+        """Test batch kecil digabung dan batch besar dipecah sesuai batch_size"""
+        writer = RecordingWriter()
+        sink = Sink('test', writer, batch_size=4)
+
+        sink.open()
+        for batch in [make_frame(0, 3), make_frame(3, 3), make_frame(6, 7)]:
+            sink.write_batch(batch)
+        sink.close()
+
+        assert [len(batch) for batch in writer.batches] == [4, 4, 4, 1]
+        titles = pd.concat(writer.batches)['Title'].tolist()
+        assert titles == [f'Product {i}' for i in range(13)]
+        assert sink.rows == 13
+        assert sink.batches == 4
+        assert writer.calls == ['open', 'close']
+
+    def test_passes_batches_through_without_batch_size(self):
+        """Test batch diteruskan apa adanya jika batch_size None"""
+        writer = RecordingWriter()
+        sink = Sink('test', writer)
+
+        sink.load(make_frame(0, 10))
+
+        assert [len(batch) for batch in writer.batches] == [10]
+
+    def test_records_rows_per_second(self):
+        """Test throughput dihitung dari waktu di dalam writer"""
+        sink = Sink('test', RecordingWriter())
+
+        with patch('utils.sinks.time.perf_counter', side_effect=[0.0, 0.5, 1.0, 2.0, 3.0, 3.5]):
+            sink.load(make_frame(0, 100))
+
+        stats = sink.stats()
+        assert stats['seconds'] == pytest.approx(2.0)
+        assert stats['rows_per_second'] == pytest.approx(50.0)
+
+    def test_load_aborts_on_error(self):
+        """Test writer di-abort dan error diteruskan"""
+        writer = RecordingWriter(fail_on_write=True)
+        sink = Sink('test', writer)
+
+        with pytest.raises(RuntimeError):
+            sink.load(make_frame(0, 1))
+
+        assert writer.calls == ['open', 'abort']
+
+class TestSinkRegistry:
+
+    def setup_method(self):
+        self.saved = dict(SINK_REGISTRY)
+
+    def teardown_method(self):
+        SINK_REGISTRY.clear()
+        SINK_REGISTRY.update(self.saved)
+
+    def test_builtin_sinks_registered(self):
+        """Test sink bawaan terdaftar secara default"""
+        assert list(SINK_REGISTRY) == ['CSV', 'Parquet', 'Snapshot', 'Google Sheets', 'PostgreSQL']
+        assert SINK_REGISTRY['Google Sheets']['batch_size'] == sinks_module.SHEETS_CHUNK_SIZE
+        assert SINK_REGISTRY['PostgreSQL']['batch_size'] == sinks_module.POSTGRES_BATCH_SIZE
+
+    def test_register_and_create(self):
+        """Test sink baru dapat ditambahkan tanpa mengubah pipeline"""
+        SINK_REGISTRY.clear()
+        register_sink('memory', RecordingWriter, batch_size=2)
+
+        created = create_sinks()
+
+        assert [sink.name for sink in created] == ['memory']
+        assert isinstance(created[0].writer, RecordingWriter)
+        assert created[0].batch_size == 2
+
+        unregister_sink('memory')
+        assert create_sinks() == []
+
+    def test_create_sinks_caps_batch_size(self):
+        """Test buffer sink dibatasi ukuran batch pipeline pada mode streaming"""
+        SINK_REGISTRY.clear()
+        register_sink('large', RecordingWriter, batch_size=5000)
+        register_sink('small', RecordingWriter, batch_size=50)
+        register_sink('passthrough', RecordingWriter)
+
+        created = create_sinks(max_batch_size=100)
+
+        assert [sink.batch_size for sink in created] == [100, 50, None]
+
+    def test_create_unknown_sink(self):
+        """Test nama sink yang tidak terdaftar ditolak"""
+        with pytest.raises(ValueError):
+            create_sinks(['parquet-typo'])
+
+    def test_load_dataframe_reports_each_sink(self):
+        """Test DataFrame dimuat ke semua sink dengan status per sink"""
+        good = Sink('good', RecordingWriter(), batch_size=3)
+        bad = Sink('bad', RecordingWriter(fail_on_write=True))
+
+        results = load_dataframe(make_frame(0, 7), [good, bad])
+
+        assert [(r['name'], r['success'], r['rows']) for r in results] == [
+            ('good', True, 7), ('bad', False, 0)]
+        assert results[0]['batches'] == 3
+        assert results[1]['error'] == 'write failed'
+
+    def test_stream_batches_skips_failed_sink(self):
+        """Test sink yang gagal dilewati tanpa menghentikan sink lain"""
+        good_writer = RecordingWriter()
+        bad_writer = RecordingWriter(fail_on_write=True)
+        sinks = [Sink('good', good_writer), Sink('bad', bad_writer)]
+
+        results = stream_batches(iter([make_frame(0, 2), make_frame(2, 2)]), sinks)
+
+        assert [r['success'] for r in results] == [True, False]
+        assert good_writer.calls == ['open', 'close']
+        assert bad_writer.calls == ['open', 'abort']
+        assert results[0]['rows'] == 4
+
+    def test_stream_batches_aborts_sinks_when_source_fails(self):
+        """Test semua sink terbuka di-abort jika sumber batch error"""
+        def failing_batches():
+            yield make_frame(0, 2)
+            raise RuntimeError("extract failed")
+
+        writer = RecordingWriter()
+        sinks = [Sink('good', writer)]
+
+        with pytest.raises(RuntimeError, match="extract failed"):
+            stream_batches(failing_batches(), sinks)
+
+        assert writer.calls == ['open', 'abort']
+
+    def test_stream_batches_without_rows_leaves_sinks_untouched(self):
+        """Test tanpa baris tidak ada sink yang dibuka, ditutup, atau dilaporkan berhasil"""
+        writer = RecordingWriter()
+        sinks = [Sink('good', writer, batch_size=2)]
+
+        results = stream_batches(iter([make_frame(0, 0)]), sinks)
+
+        assert writer.calls == []
+        assert results[0]['success'] is False
+        assert results[0]['error'] == sinks_module.NO_DATA_ERROR
+        assert stream_batches(iter([]), [Sink('empty', RecordingWriter())])[0]['success'] is False
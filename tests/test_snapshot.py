@@ -0,0 +1,106 @@
+import pytest
+import pandas as pd
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.load import write_batches
+from utils.snapshot import SnapshotWriter, partition_path, list_partitions, read_snapshots
+
+def make_run(timestamp, titles, price=100000.0):
+    return pd.DataFrame({
+        'Title': titles,
+        'Price': [price] * len(titles),
+        'Rating': [4.5] * len(titles),
+        'Colors': [3] * len(titles),
+        'Size': ['M'] * len(titles),
+        'Gender': ['Unisex'] * len(titles),
+        'Timestamp': [timestamp] * len(titles)
+    })
+
+class TestSnapshot:
+
+    def setup_method(self):
+        self.base_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def write_run(self, timestamp, titles, format='parquet', price=100000.0):
+        writer = SnapshotWriter(self.base_dir, format=format)
+        write_batches(writer, [make_run(timestamp, titles, price)])
+        return writer
+
+    def test_partition_path(self):
+        """Test path partisi dari Timestamp"""
+        path = partition_path('snapshots', '2024-03-05T07:59:12.123456')
+
+        assert path == os.path.join('snapshots', 'date=2024-03-05', 'run=07')
+
+    def test_run_written_to_single_partition(self):
+        """Test satu run melewati pergantian jam tetap masuk satu partisi"""
+        batches = [make_run('2024-03-05T07:59:58', ['A']), make_run('2024-03-05T08:00:03', ['B'])]
+        writer = SnapshotWriter(self.base_dir)
+
+        write_batches(writer, batches)
+
+        assert writer.path == os.path.join(self.base_dir, 'date=2024-03-05', 'run=07', 'products.parquet')
+        assert len(list_partitions(self.base_dir)) == 1
+        assert pd.read_parquet(writer.path)['Title'].tolist() == ['A', 'B']
+
+    def test_rerun_same_hour_replaces_snapshot(self):
+        """Test run ulang pada jam yang sama menggantikan snapshot"""
+        self.write_run('2024-03-05T07:10:00', ['A', 'B'])
+        self.write_run('2024-03-05T07:40:00', ['C'])
+
+        assert read_snapshots(self.base_dir)['Title'].tolist() == ['C']
+
+    def test_partition_pruning_by_date(self):
+        """Test hanya partisi dalam rentang tanggal yang dibuka"""
+        self.write_run('2024-03-01T07:00:00', ['old'])
+        self.write_run('2024-03-05T07:00:00', ['a'])
+        self.write_run('2024-03-05T19:00:00', ['b'])
+        self.write_run('2024-03-09T07:00:00', ['new'])
+
+        with patch('utils.snapshot.pd.read_parquet', wraps=pd.read_parquet) as mock_read:
+            result = read_snapshots(self.base_dir, start='2024-03-02', end='2024-03-08')
+
+        assert mock_read.call_count == 2
+        assert result['Title'].tolist() == ['a', 'b']
+        assert result['snapshot_run'].tolist() == [7, 19]
+        assert (result['snapshot_date'] == pd.Timestamp('2024-03-05')).all()
+
+    def test_column_projection(self):
+        """Test hanya kolom yang diminta yang dibaca"""
+        self.write_run('2024-03-05T07:00:00', ['a'], price=123.0)
+
+        result = read_snapshots(self.base_dir, columns=['Title', 'Price'])
+
+        assert list(result.columns) == ['Title', 'Price', 'snapshot_date', 'snapshot_run']
+        assert result['Price'].tolist() == [123.0]
+
+    @pytest.mark.parametrize('format', ['feather', 'csv'])
+    def test_other_formats(self, format):
+        """Test snapshot Feather dan CSV dapat dibaca kembali"""
+        self.write_run('2024-03-05T07:00:00', ['a', 'b'], format=format)
+
+        result = read_snapshots(self.base_dir, columns=['Title'])
+
+        assert result['Title'].tolist() == ['a', 'b']
+
+    def test_empty_or_missing_store(self):
+        """Test direktori snapshot kosong atau tidak ada"""
+        assert list_partitions(os.path.join(self.base_dir, 'missing')) == []
+        result = read_snapshots(self.base_dir, columns=['Title'])
+        assert result.empty
+        assert list(result.columns) == ['Title', 'snapshot_date', 'snapshot_run']
+
+    def test_ignores_unrelated_directories(self):
+        """Test direktori yang bukan partisi diabaikan"""
+        os.makedirs(os.path.join(self.base_dir, 'tmp'))
+        os.makedirs(os.path.join(self.base_dir, 'date=2024-03-05', 'notes'))
+        self.write_run('2024-03-05T07:00:00', ['a'])
+
+        assert [(str(d), r) for d, r, _ in list_partitions(self.base_dir)] == [('2024-03-05', 7)]
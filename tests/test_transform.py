@@ -1,9 +1,11 @@
 import pytest
+import datetime
 import pandas as pd
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.transform import transform_data
+from utils.transform import (transform_data, transform_batches, RejectionReport,
+                             compact_dtypes, standard_dtypes)
 
 class TestTransform:
     
@@ -248,4 +250,214 @@ class TestTransform:
         
         # Should return empty DataFrame on error
         assert result.empty
-        assert isinstance(result, pd.DataFrame)
\ No newline at end of file
+        assert isinstance(result, pd.DataFrame)
+    
+    def test_transform_batches_streaming(self):
+        """Test transformasi per batch menghapus duplikat lintas batch"""
+        product = {
+            'Title': 'Test Product',
+            'Price': '25.99',
+            'Rating': '4.5',
+            'Colors': '3',
+            'Size': 'M',
+            'Gender': 'Unisex',
+            'Timestamp': '2024-01-01T00:00:00'
+        }
+        other = dict(product, Title='Other Product')
+        invalid = dict(product, Title='Unknown Product')
+        
+        batches = list(transform_batches(iter([[product, invalid], [product, other], []])))
+        
+        assert [len(batch) for batch in batches] == [1, 1]
+        assert batches[1].iloc[0]['Title'] == 'Other Product'
+        assert batches[0]['Colors'].dtype == 'int64'
+    
+    def test_transform_data_accepts_iterator(self):
+        """Test transform_data menerima iterator batch dengan hasil yang sama"""
+        products = [
+            {
+                'Title': f'Test Product {i % 3}',
+                'Price': '10.00',
+                'Rating': 'Invalid' if i == 4 else '4.0',
+                'Colors': '2',
+                'Size': 'S',
+                'Gender': 'Women',
+                'Timestamp': '2024-01-01T00:00:00'
+            }
+            for i in range(6)
+        ]
+        
+        expected = transform_data(products)
+        result = transform_data(iter([products[:2], products[2:4], products[4:]]))
+        
+        pd.testing.assert_frame_equal(result, expected.reset_index(drop=True))
+    
+    def test_transform_data_messy_rating_and_colors(self):
+        """Test ekstraksi angka Rating dan Colors dari teks mentah"""
+        base = {
+            'Title': 'Test Product',
+            'Price': '10.00',
+            'Size': 'M',
+            'Gender': 'Men',
+            'Timestamp': '2024-01-01T00:00:00'
+        }
+        input_data = [
+            dict(base, Title='P1', Rating='⭐ 4.8', Colors='3 Colors'),
+            dict(base, Title='P2', Rating='Not Rated', Colors='2'),
+            dict(base, Title='P3', Rating='⭐ Invalid Rating', Colors='1'),
+            dict(base, Title='P4', Rating='3.', Colors='N/A'),
+            dict(base, Title='P5', Rating=None, Colors='4'),
+            dict(base, Title='P6', Rating='5', Colors='12'),
+        ]
+        
+        result = transform_data(input_data)
+        
+        assert list(result['Title']) == ['P1', 'P6']
+        assert list(result['Rating']) == [4.8, 5.0]
+        assert list(result['Colors']) == [3, 12]
+    
+    def test_transform_data_step_counts(self, capsys):
+        """Test jumlah baris setiap langkah tetap dicetak secara bertahap"""
+        base = {
+            'Title': 'Test Product',
+            'Price': '10.00',
+            'Rating': '4.0',
+            'Colors': '2',
+            'Size': 'M',
+            'Gender': 'Men',
+            'Timestamp': '2024-01-01T00:00:00'
+        }
+        input_data = [
+            dict(base, Title='Unknown Product'),
+            dict(base, Title='P2', Price='N/A'),
+            dict(base, Title='P3', Rating='Invalid'),
+            dict(base, Title='P4', Colors='N/A'),
+            dict(base, Title='P5', Size='N/A'),
+            dict(base, Title='P6'),
+        ]
+        
+        transform_data(input_data)
+        output = capsys.readouterr().out
+        
+        assert "Setelah menghapus 'Unknown Product': 5 baris" in output
+        assert "Setelah membersihkan Price: 4 baris" in output
+        assert "Setelah membersihkan Rating: 3 baris" in output
+        assert "Setelah membersihkan Colors: 2 baris" in output
+        assert "Setelah membersihkan Size dan Gender: 1 baris" in output
+    
+    def test_transform_data_rejection_report(self):
+        """Test laporan penolakan per aturan beserta contoh baris"""
+        base = {
+            'Title': 'Test Product',
+            'Price': '10.00',
+            'Rating': '4.0',
+            'Colors': '2',
+            'Size': 'M',
+            'Gender': 'Men',
+            'Timestamp': '2024-01-01T00:00:00'
+        }
+        input_data = [
+            dict(base, Title='Unknown Product', Price='N/A'),
+            dict(base, Title='P2', Price='N/A'),
+            dict(base, Title='P3', Rating='Invalid', Colors='N/A'),
+            dict(base, Title='P4'),
+            dict(base, Title='P4'),
+        ]
+        report = RejectionReport(sample_size=1)
+        
+        result = transform_data(input_data, report=report)
+        summary = report.to_dict()
+        
+        assert len(result) == 1
+        assert summary['input_rows'] == 5
+        assert summary['output_rows'] == 1
+        assert summary['rejected_rows'] == 4
+        assert summary['rules']['unknown_product']['rejected'] == 1
+        # Baris pertama sudah ditolak oleh aturan Unknown Product
+        assert summary['rules']['price']['rejected'] == 1
+        assert summary['rules']['price']['failed'] == 2
+        assert summary['rules']['rating']['rejected'] == 1
+        assert summary['rules']['colors']['rejected'] == 0
+        assert summary['rules']['colors']['failed'] == 1
+        assert summary['rules']['duplicate']['rejected'] == 1
+        assert summary['rules']['price']['samples'] == [dict(base, Title='P2', Price='N/A')]
+    
+    def test_transform_batches_accumulates_report(self):
+        """Test laporan penolakan diakumulasi lintas batch"""
+        product = {
+            'Title': 'Test Product',
+            'Price': '25.99',
+            'Rating': '4.5',
+            'Colors': '3',
+            'Size': 'M',
+            'Gender': 'Unisex',
+            'Timestamp': '2024-01-01T00:00:00'
+        }
+        report = RejectionReport()
+        
+        list(transform_batches(iter([[product, dict(product, Price='N/A')], [product]]), report=report))
+        
+        assert report.input_rows == 3
+        assert report.output_rows == 1
+        assert report.rules['price']['rejected'] == 1
+        assert report.rules['duplicate']['rejected'] == 1
+
+class TestCompactDtypes:
+
+    def setup_method(self):
+        sizes = ['S', 'M', 'L', 'XL', 'XXL']
+        genders = ['Men', 'Women', 'Unisex']
+        self.raw = [
+            {
+                'Title': f'Product {i}',
+                'Price': f'{10 + i % 90}.99',
+                'Rating': f'Rating: {1 + (i % 40) / 10} / 5',
+                'Colors': f'{1 + i % 8} Colors',
+                'Size': f'Size: {sizes[i % 5]}',
+                'Gender': f'Gender: {genders[i % 3]}',
+                'Timestamp': datetime.datetime(2024, 1, 1, 0, 0, i % 60, i).isoformat()
+            }
+            for i in range(1000)
+        ]
+
+    def test_compact_schema(self):
+        """Test skema ringkas memakai kategori, datetime64, int8, dan float32"""
+        result = transform_data(self.raw, verbose=False, compact=True)
+
+        assert isinstance(result['Size'].dtype, pd.CategoricalDtype)
+        assert isinstance(result['Gender'].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_datetime64_any_dtype(result['Timestamp'])
+        assert result['Colors'].dtype == 'int8'
+        assert result['Rating'].dtype == 'float32'
+
+    def test_compact_uses_less_memory(self):
+        """Test skema ringkas menghemat memori"""
+        standard = transform_data(self.raw, verbose=False)
+        compact = transform_data(self.raw, verbose=False, compact=True)
+
+        assert compact.memory_usage(deep=True).sum() < standard.memory_usage(deep=True).sum() * 0.6
+
+    def test_standard_dtypes_roundtrip(self):
+        """Test skema ringkas dapat dikembalikan tepat ke skema standar"""
+        standard = transform_data(self.raw, verbose=False)
+
+        restored = standard_dtypes(compact_dtypes(standard))
+
+        pd.testing.assert_frame_equal(restored, standard)
+        assert standard_dtypes(standard) is standard
+
+    def test_iterator_shares_categories(self):
+        """Test batch yang digabung tetap berkategori setelah dikonversi"""
+        batches = iter([self.raw[:3], self.raw[3:]])
+
+        result = transform_data(batches, compact=True)
+
+        assert isinstance(result['Size'].dtype, pd.CategoricalDtype)
+        assert set(result['Size'].cat.categories) == {'S', 'M', 'L', 'XL', 'XXL'}
+
+    def test_transform_batches_compact(self):
+        """Test mode streaming menghasilkan batch berskema ringkas"""
+        batches = list(transform_batches([self.raw[:10], self.raw[10:20]], compact=True))
+
+        assert all(batch['Rating'].dtype == 'float32' for batch in batches)
+
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# Lokasi dan batas ukuran default cache halaman
+CACHE_DIR = os.path.join('.cache', 'pages')
+MAX_BYTES = 50 * 1024 * 1024
+INDEX_FILE = 'index.json'
+
+class PageCache:
+    """
+    Cache HTTP on-disk untuk conditional GET, dengan URL sebagai kunci.
+
+    Setiap entri menyimpan body halaman beserta header ETag/Last-Modified,
+    dan secara opsional daftar produk hasil parsing di file JSON di samping
+    body-nya. Total ukuran body dan daftar produk dibatasi `max_bytes`;
+    entri yang paling lama tidak dipakai (LRU) dihapus lebih dulu. Index
+    hanya berisi metadata kecil dan ditulis ulang saat `put`; urutan
+    pemakaian dari `get` disimpan saat `put` berikutnya atau `close`. Aman
+    dipakai bersama oleh banyak thread; file dibaca di luar lock.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES, store_products=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.store_products = store_products
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(directory, exist_ok=True)
+        self._index = self._load_index()
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, f"{key}.html")
+
+    def _products_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self):
+        path = os.path.join(self.directory, INDEX_FILE)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (FileNotFoundError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Index cache rusak, cache dikosongkan: {e}")
+            return OrderedDict()
+        index = OrderedDict()
+        for entry in entries:
+            # Index lama menyimpan produk di dalam index; produk tersebut
+            # dibuang dan halaman di-parse ulang dari body saat dibutuhkan
+            entry.pop('products', None)
+            index[entry['url']] = entry
+        return index
+
+    def _save_index(self):
+        # Tulis ke file sementara lalu ganti agar index tidak pernah setengah jadi
+        path = os.path.join(self.directory, INDEX_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(list(self._index.values()), f)
+        os.replace(tmp_path, path)
+        self._dirty = False
+
+    def _remove_files(self, key):
+        for path in (self._body_path(key), self._products_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        total = sum(entry['size'] for entry in self._index.values())
+        while total > self.max_bytes and self._index:
+            _, entry = self._index.popitem(last=False)
+            total -= entry['size']
+            self._remove_files(entry['key'])
+
+    @staticmethod
+    def _write_atomic(path, data):
+        # Pembaca di thread lain tidak pernah melihat file setengah jadi
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry['size'] for entry in self._index.values())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._index)
+
+    def __contains__(self, url):
+        with self._lock:
+            return url in self._index
+
+    def get(self, url):
+        """
+        Mengambil entri cache untuk sebuah URL dan menandainya baru dipakai.
+
+        Args:
+            url (str): URL halaman
+
+        Returns:
+            dict | None: Entri berisi 'body', 'etag', 'last_modified', dan
+            'products' (bisa None), atau None jika tidak ada di cache
+        """
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return None
+            self._index.move_to_end(url)
+            self._dirty = True
+            entry = dict(entry)
+
+        try:
+            with open(self._body_path(entry['key']), encoding='utf-8') as f:
+                body = f.read()
+        except FileNotFoundError:
+            # Body hilang (misalnya dihapus dari luar atau baru saja dievict)
+            with self._lock:
+                current = self._index.get(url)
+                if current is not None and current['key'] == entry['key']:
+                    del self._index[url]
+                    self._dirty = True
+            return None
+
+        products = None
+        if entry.get('has_products'):
+            try:
+                with open(self._products_path(entry['key']), encoding='utf-8') as f:
+                    products = json.load(f)
+            except (FileNotFoundError, ValueError):
+                products = None
+        return dict(entry, body=body, products=products)
+
+    def put(self, url, body, etag=None, last_modified=None, products=None):
+        """
+        Menyimpan body halaman dan header validator ke cache.
+
+        Args:
+            url (str): URL halaman
+            body (str): Isi HTML halaman
+            etag (str): Nilai header ETag
+            last_modified (str): Nilai header Last-Modified
+            products (list): Daftar produk hasil parsing, opsional
+        """
+        key = self._key(url)
+        encoded = body.encode('utf-8')
+        size = len(encoded)
+        has_products = products is not None and self.store_products
+        self._write_atomic(self._body_path(key), encoded)
+        if has_products:
+            encoded_products = json.dumps(products).encode('utf-8')
+            self._write_atomic(self._products_path(key), encoded_products)
+            size += len(encoded_products)
+        else:
+            try:
+                os.remove(self._products_path(key))
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            self._index.pop(url, None)
+            self._index[url] = {
+                'url': url,
+                'key': key,
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': size,
+                'has_products': has_products,
+            }
+            self._evict()
+            self._save_index()
+
+    @staticmethod
+    def conditional_headers(entry):
+        """
+        Membuat header conditional GET dari sebuah entri cache.
+
+        Args:
+            entry (dict): Entri hasil `get`
+
+        Returns:
+            dict: Header If-None-Match dan/atau If-Modified-Since
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def close(self):
+        """Menyimpan urutan pemakaian entri dari `get` ke index, jika berubah."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def clear(self):
+        """Menghapus seluruh entri cache."""
+        with self._lock:
+            for entry in self._index.values():
+                self._remove_files(entry['key'])
+            self._index.clear()
+            self._save_index()
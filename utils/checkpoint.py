@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Lokasi default checkpoint dan umur maksimum hasil halaman yang dipakai ulang
+CHECKPOINT_PATH = os.path.join('.cache', 'extract_checkpoint.sqlite')
+MAX_AGE = 30 * 60
+
+STATUS_OK = 'ok'
+STATUS_ERROR = 'error'
+
+class PageCheckpoint:
+    """
+    Checkpoint ekstraksi per halaman di file SQLite.
+
+    Setiap halaman yang selesai disimpan beserta produknya dan waktu
+    pengambilan; halaman yang gagal dicatat dengan pesan error-nya. Saat
+    pipeline dijalankan ulang, halaman yang berhasil dalam `max_age` detik
+    terakhir dilayani dari checkpoint, sehingga run yang terhenti hanya
+    perlu mengambil halaman yang belum selesai atau gagal. Aman dipakai
+    bersama oleh banyak thread.
+    """
+
+    def __init__(self, path=CHECKPOINT_PATH, max_age=MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS pages (
+            page INTEGER PRIMARY KEY,
+            status TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            products TEXT,
+            error TEXT
+        )
+        """)
+        self._conn.commit()
+
+    def _put(self, page, status, products=None, error=None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (page, status, fetched_at, products, error) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (page, status, time.time(),
+                 json.dumps(products) if products is not None else None, error)
+            )
+            self._conn.commit()
+
+    def save(self, page, products):
+        """
+        Menyimpan hasil halaman yang berhasil diambil.
+
+        Args:
+            page (int): Nomor halaman
+            products (list): Produk dari halaman tersebut
+        """
+        self._put(page, STATUS_OK, products=products)
+
+    def save_error(self, page, error):
+        """
+        Mencatat halaman yang gagal diambil.
+
+        Args:
+            page (int): Nomor halaman
+            error (str): Pesan error
+        """
+        self._put(page, STATUS_ERROR, error=str(error))
+
+    def get(self, page):
+        """
+        Mengambil produk halaman jika masih dalam jendela kesegaran.
+
+        Args:
+            page (int): Nomor halaman
+
+        Returns:
+            list | None: Produk halaman, atau None jika belum ada, gagal,
+            atau sudah kedaluwarsa
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, fetched_at, products FROM pages WHERE page = ?", (page,)
+            ).fetchone()
+        if row is None or row[0] != STATUS_OK:
+            return None
+        if self.max_age is not None and time.time() - row[1] > self.max_age:
+            return None
+        return json.loads(row[2])
+
+    def failed_pages(self):
+        """
+        Daftar halaman yang gagal pada pengambilan terakhirnya.
+
+        Returns:
+            list: Nomor halaman terurut
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page FROM pages WHERE status = ? ORDER BY page", (STATUS_ERROR,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def progress(self):
+        """
+        Ringkasan isi checkpoint.
+
+        Returns:
+            dict: Jumlah halaman per status
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM pages GROUP BY status").fetchall()
+        return dict(rows)
+
+    def clear(self):
+        """Menghapus seluruh isi checkpoint."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
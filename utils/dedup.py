@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import tempfile
+import pandas as pd
+
+# Kolom yang tidak ikut membentuk kunci duplikat secara default; Timestamp
+# diisi per produk saat scraping sehingga duplikat asli hampir tidak pernah sama
+DEDUP_IGNORE_COLUMNS = ['Timestamp']
+
+# Jumlah maksimum hash kunci yang disimpan di memori (sekitar 70 byte per
+# hash pada set Python) sebelum dipindahkan ke file SQLite sementara
+DEDUP_MEMORY_KEYS = 1_000_000
+
+def dedup_key_columns(columns, key_columns=None):
+    """
+    Menentukan kolom yang membentuk kunci duplikat.
+
+    Args:
+        columns (list): Kolom data
+        key_columns (list): Kolom kunci; jika None, semua kolom kecuali
+            `DEDUP_IGNORE_COLUMNS`
+
+    Returns:
+        list: Kolom kunci sesuai urutan di `columns`
+    """
+    if key_columns is None:
+        return [column for column in columns if column not in DEDUP_IGNORE_COLUMNS]
+    missing = [column for column in key_columns if column not in columns]
+    if missing:
+        raise KeyError(f"Kolom kunci duplikat tidak ditemukan: {', '.join(missing)}")
+    return list(key_columns)
+
+class KeyDeduplicator:
+    """
+    Penyaring duplikat berdasarkan kunci yang bekerja lintas batch.
+
+    Setiap baris diringkas menjadi hash 64-bit dari kolom kuncinya. Hash
+    yang sudah terlihat disimpan di set di memori; jika jumlahnya melebihi
+    `memory_keys`, isinya dipindahkan ke file SQLite sementara dan set
+    dikosongkan, sehingga deduplikasi backfill berjuta-juta baris tidak
+    perlu menampung semua kunci di RAM. File sementara dihapus saat
+    `close` dipanggil.
+    """
+
+    def __init__(self, key_columns=None, memory_keys=DEDUP_MEMORY_KEYS, spill_dir=None):
+        self.key_columns = key_columns
+        self.memory_keys = memory_keys
+        self.spill_dir = spill_dir
+        self.seen_keys = 0
+        self.spills = 0
+        self._memory = set()
+        self._conn = None
+        self._path = None
+
+    def _spill(self):
+        if self._conn is None:
+            fd, self._path = tempfile.mkstemp(prefix='dedup-', suffix='.sqlite', dir=self.spill_dir)
+            os.close(fd)
+            self._conn = sqlite3.connect(self._path)
+            self._conn.execute("PRAGMA journal_mode = OFF")
+            self._conn.execute("PRAGMA synchronous = OFF")
+            self._conn.execute("CREATE TABLE seen (hash INTEGER PRIMARY KEY) WITHOUT ROWID")
+            self._conn.execute("CREATE TEMP TABLE candidates (hash INTEGER PRIMARY KEY)")
+        # Disisipkan terurut agar B-tree SQLite ditulis berurutan
+        self._conn.executemany("INSERT OR IGNORE INTO seen (hash) VALUES (?)",
+                               ((key,) for key in sorted(self._memory)))
+        self._conn.commit()
+        self._memory.clear()
+        self.spills += 1
+
+    def _spilled(self, keys):
+        # Hash yang sudah ada di file SQLite di antara `keys`
+        if self._conn is None or not keys:
+            return set()
+        self._conn.execute("DELETE FROM candidates")
+        self._conn.executemany("INSERT OR IGNORE INTO candidates (hash) VALUES (?)",
+                               ((key,) for key in sorted(keys)))
+        rows = self._conn.execute("SELECT hash FROM candidates JOIN seen USING (hash)")
+        return {row[0] for row in rows}
+
+    def hash_keys(self, df):
+        """
+        Menghitung hash kunci setiap baris.
+
+        Args:
+            df (pd.DataFrame): Data yang akan dideduplikasi
+
+        Returns:
+            pd.Series: Hash int64 per baris
+        """
+        columns = dedup_key_columns(list(df.columns), self.key_columns)
+        return pd.util.hash_pandas_object(df[columns], index=False).astype('int64')
+
+    def keep_mask(self, df):
+        """
+        Menandai baris yang kuncinya belum pernah terlihat, di dalam batch ini
+        maupun di batch sebelumnya, lalu mencatat kunci baris tersebut.
+
+        Args:
+            df (pd.DataFrame): Batch data
+
+        Returns:
+            pd.Series: Mask boolean, True untuk baris pertama setiap kunci
+        """
+        hashes = self.hash_keys(df)
+        keep = ~hashes.duplicated()
+        # Dicek per hash di set, bukan `Series.isin`, yang mengonversi seluruh
+        # set setiap batch sehingga waktunya tumbuh seiring jumlah kunci
+        candidates = hashes[keep].tolist()
+        if self._memory:
+            candidates = [key for key in candidates if key not in self._memory]
+        if self._conn is not None:
+            spilled = self._spilled(candidates)
+            candidates = [key for key in candidates if key not in spilled]
+        keep &= hashes.isin(candidates)
+
+        new_keys = candidates
+        self._memory.update(new_keys)
+        self.seen_keys += len(new_keys)
+        if len(self._memory) > self.memory_keys:
+            self._spill()
+        return keep
+
+    def close(self):
+        """Menutup dan menghapus file SQLite sementara, jika ada."""
+        self._memory.clear()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._path is not None:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+            self._path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,6 +1,14 @@
 import requests
-from bs4 import BeautifulSoup
 import datetime
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from utils.session import create_session
+from utils.rate_limit import RateLimiter
+from utils.parser import get_parser, extract_card
+from utils import metrics
 
 # Konstanta untuk URL dasar dan header untuk menghindari deteksi sebagai bot
 BASE_URL = "https://fashion-studio.dicoding.dev/"
@@ -8,93 +16,464 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
 
-def scrape_page(page_num):
+# Jumlah halaman katalog jika penemuan halaman gagal, dan jumlah worker
+# default untuk scraping paralel
+TOTAL_PAGES = 50
+MAX_WORKERS = 8
+
+# Batas atas pencarian jumlah halaman, agar probing selalu berhenti
+MAX_PAGES = 1000
+
+# Link pagination: `?page=N` atau `/pageN`, serta tombol "Next"
+PAGE_LINK_PATTERN = re.compile(r'href="[^"]*?(?:[?&]page=|/page)(\d+)"')
+NEXT_LINK_PATTERN = re.compile(r'class="[^"]*\bnext\b')
+
+# Batas laju request agar tetap sopan terhadap server
+REQUESTS_PER_SECOND = 5.0
+BURST = 10
+
+# Jumlah produk per batch pada mode streaming
+BATCH_SIZE = 100
+
+def page_url(page_num):
+    """URL halaman katalog ke-`page_num`."""
+    return f"{BASE_URL}?page={page_num}"
+
+def parse_products(html, html_parser, page_num):
     """
-    Mengekstrak data produk dari satu halaman.
+    Mengekstrak seluruh produk dari HTML satu halaman.
     
     Args:
-        page_num (int): Nomor halaman yang akan di-scrape
+        html (str): HTML halaman
+        html_parser (object): Backend parser dari `get_parser`
+        page_num (int): Nomor halaman, untuk pesan error
         
     Returns:
         list: Daftar produk dari halaman tersebut
     """
     products = []
-    url = f"{BASE_URL}?page={page_num}"
+    products_on_page = html_parser.cards(html)
+    
+    if not products_on_page:
+        print(f"Halaman {page_num} tidak ditemukan atau tidak ada produk.")
+        return products
+
+    for product in products_on_page:
+        try:
+            # Ekstrak seluruh detail produk dalam satu kali lintasan
+            fields = extract_card(html_parser, product)
+            fields["Timestamp"] = datetime.datetime.now().isoformat()  # Fitur Advanced: Tambah timestamp
+            
+            # Tambahkan data ke list
+            products.append(fields)
+            
+        except Exception as e:
+            print(f"Error mengekstrak produk di halaman {page_num}: {e}")
+            continue
+    
+    return products
+
+def scrape_page(page_num, session=None, parser=None, cache=None, raise_errors=False):
+    """
+    Mengekstrak data produk dari satu halaman.
     
+    Args:
+        page_num (int): Nomor halaman yang akan di-scrape
+        session (requests.Session): Session HTTP bersama; jika None,
+            digunakan `requests.get` tanpa pooling dan retry
+        parser (str | object): Nama backend parser ('selectolax', 'lxml',
+            'html.parser') atau instance dari `get_parser`; jika None,
+            dipilih backend tercepat yang terpasang
+        cache (PageCache): Cache halaman untuk conditional GET, opsional
+        raise_errors (bool): Teruskan error jaringan alih-alih mengembalikan
+            list kosong, agar pemanggil dapat membedakan halaman gagal
+        
+    Returns:
+        list: Daftar produk dari halaman tersebut
+    """
     try:
-        # Lakukan request GET ke URL
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        _, products = _fetch_page(page_num, session=session, parser=parser, cache=cache)
+    except requests.exceptions.RequestException as e:
+        # Fitur Advanced: Error handling untuk masalah jaringan
+        if raise_errors:
+            raise
+        print(f"Gagal mengakses halaman {page_num}: {e}")
+        return []
+    
+    return products
+
+def _fetch_page(page_num, session=None, parser=None, cache=None):
+    """
+    Mengambil satu halaman dengan conditional GET lalu mengurai produknya.
+    
+    Args:
+        page_num (int): Nomor halaman
+        session (requests.Session): Session HTTP bersama
+        parser (str | object): Backend parser HTML
+        cache (PageCache): Cache halaman untuk conditional GET, opsional
+        
+    Returns:
+        tuple: (HTML halaman, daftar produk); error jaringan diteruskan
+    """
+    url = page_url(page_num)
+    
+    # Kirim validator dari cache agar server dapat membalas 304
+    request_headers = HEADERS
+    cached = cache.get(url) if cache is not None else None
+    if cached:
+        request_headers = dict(HEADERS, **cache.conditional_headers(cached))
+    
+    # Lakukan request GET ke URL, melalui session bersama bila ada
+    http = session if session is not None else requests
+    response = http.get(url, headers=request_headers, timeout=10)
+    
+    not_modified = bool(cached) and response.status_code == 304
+    if not_modified:
+        print(f"Halaman {page_num} tidak berubah, memakai cache.")
+        html = cached['body']
+        if cached.get('products') is not None:
+            timestamp = datetime.datetime.now().isoformat()
+            return html, [dict(fields, Timestamp=timestamp) for fields in cached['products']]
+    else:
         # Timbulkan error jika status code bukan 200
         response.raise_for_status()
+        html = response.text
+    
+    # Cari semua kartu produk dengan backend parser yang dipilih
+    html_parser = parser if parser is not None and not isinstance(parser, str) else get_parser(parser)
+    products = parse_products(html, html_parser, page_num)
+    
+    # Simpan halaman baru ke cache jika server memberikan validator
+    if products and cache is not None and not not_modified:
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            cache.put(url, html, etag=etag, last_modified=last_modified,
+                      products=[{k: v for k, v in fields.items() if k != 'Timestamp'}
+                                for fields in products])
+    return html, products
+
+def _scrape_page_checkpointed(page, checkpoint, **kwargs):
+    """
+    Mengambil satu halaman melalui checkpoint.
+    
+    Halaman yang masih segar di checkpoint tidak diambil ulang. Hasil
+    pengambilan baru disimpan ke checkpoint, termasuk halaman yang gagal.
+    
+    Args:
+        page (int): Nomor halaman yang akan di-scrape
+        checkpoint (PageCheckpoint): Penyimpan hasil per halaman
+        **kwargs: Argumen untuk `scrape_page`
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Cari semua kartu produk
-        products_on_page = soup.find_all('div', class_='collection-card')
-        
-        if not products_on_page:
-            print(f"Halaman {page_num} tidak ditemukan atau tidak ada produk.")
-            return products
-
-        for product in products_on_page:
-            try:
-                # Ekstrak setiap detail produk dengan error handling
-                title_elem = product.find('h3', class_='product-title')
-                title = title_elem.text.strip() if title_elem else 'Unknown Product'
-                
-                price_span = product.find('span', class_='price')
-                price = price_span.text.strip().replace('$', '') if price_span else 'N/A'
-                
-                # Ekstraksi data dengan penanganan jika elemen tidak ada
-                rating_p = product.find('p', string=lambda text: text and 'Rating' in text)
-                rating = rating_p.text.split('/')[0].replace('Rating:', '').strip() if rating_p else 'Invalid'
-                
-                colors_p = product.find('p', string=lambda text: text and 'Colors' in text)
-                colors = colors_p.text.replace('Colors', '').strip() if colors_p else 'N/A'
-                
-                size_p = product.find('p', string=lambda text: text and 'Size:' in text)
-                size = size_p.text.replace('Size:', '').strip() if size_p else 'N/A'
-
-                gender_p = product.find('p', string=lambda text: text and 'Gender:' in text)
-                gender = gender_p.text.replace('Gender:', '').strip() if gender_p else 'N/A'
-                
-                # Tambahkan data ke list
-                products.append({
-                    "Title": title,
-                    "Price": price,
-                    "Rating": rating,
-                    "Colors": colors,
-                    "Size": size,
-                    "Gender": gender,
-                    "Timestamp": datetime.datetime.now().isoformat()  # Fitur Advanced: Tambah timestamp
-                })
-                
-            except Exception as e:
-                print(f"Error mengekstrak produk di halaman {page_num}: {e}")
-                continue
+    Returns:
+        list: Daftar produk dari halaman tersebut
+    """
+    products = checkpoint.get(page)
+    if products is not None:
+        print(f"Halaman {page} diambil dari checkpoint.")
+        return products
     
+    try:
+        products = scrape_page(page, raise_errors=True, **kwargs)
     except requests.exceptions.RequestException as e:
-        # Fitur Advanced: Error handling untuk masalah jaringan
-        print(f"Gagal mengakses halaman {page_num}: {e}")
+        print(f"Gagal mengakses halaman {page}: {e}")
+        checkpoint.save_error(page, e)
         return []
+    checkpoint.save(page, products)
+    return products
+
+def _scrape_page_logged(page, session=None, parser=None, cache=None, checkpoint=None,
+                        total=TOTAL_PAGES, prefetched=None):
+    """
+    Mencetak progres lalu mengekstrak satu halaman.
     
+    Args:
+        page (int): Nomor halaman yang akan di-scrape
+        session (requests.Session): Session HTTP bersama
+        parser (object): Backend parser HTML
+        cache (PageCache): Cache halaman untuk conditional GET
+        checkpoint (PageCheckpoint): Checkpoint per halaman, opsional
+        total (int): Jumlah halaman, untuk pesan progres
+        prefetched (dict): Produk halaman yang sudah diambil saat penemuan
+            jumlah halaman, agar tidak diambil ulang
+        
+    Returns:
+        list: Daftar produk dari halaman tersebut
+    """
+    print(f"Scraping halaman: {page}/{total}...")
+    with metrics.stage('extract.page', per_thread=True, page=page) as record:
+        if prefetched and page in prefetched:
+            products = prefetched.pop(page)
+            if checkpoint is not None:
+                checkpoint.save(page, products)
+        elif checkpoint is not None:
+            products = _scrape_page_checkpointed(page, checkpoint, session=session,
+                                                 parser=parser, cache=cache)
+        else:
+            products = scrape_page(page, session=session, parser=parser, cache=cache)
+        record.add_rows(len(products))
     return products
 
-def scrape_products():
+def parse_pagination(html):
+    """
+    Membaca link pagination dari HTML halaman.
+    
+    Args:
+        html (str): HTML halaman
+        
+    Returns:
+        tuple: (nomor halaman tertinggi yang di-link, minimal 1; True jika
+        ada tombol "Next")
+    """
+    linked = [int(page) for page in PAGE_LINK_PATTERN.findall(html)]
+    return max(linked, default=1), bool(NEXT_LINK_PATTERN.search(html))
+
+def find_last_page(exists, lower_bound=1, max_pages=MAX_PAGES, missing=None):
+    """
+    Mencari nomor halaman terakhir dengan probing eksponensial lalu binary search.
+    
+    Mulai dari `lower_bound` (halaman yang diketahui ada), nomor halaman
+    dilipatgandakan hingga ditemukan halaman yang tidak ada, lalu batas
+    antara halaman terakhir yang ada dan halaman pertama yang tidak ada
+    dipersempit dengan binary search. Untuk N halaman dibutuhkan sekitar
+    2 log2(N) pemeriksaan.
+    
+    Args:
+        exists (callable): Fungsi `exists(page)` yang bernilai True jika
+            halaman tersebut ada
+        lower_bound (int): Halaman yang diketahui ada
+        max_pages (int): Batas atas pencarian
+        missing (int): Halaman yang diketahui tidak ada, jika sudah
+            diketahui; probing eksponensial dilewati
+        
+    Returns:
+        int: Nomor halaman terakhir, paling besar `max_pages`
+    """
+    low = min(max(lower_bound, 1), max_pages)
+    high = missing
+    probe = low * 2
+    while high is None and probe <= max_pages:
+        if not exists(probe):
+            high = probe
+            break
+        low = probe
+        probe *= 2
+    
+    if high is None:
+        if low == max_pages or exists(max_pages):
+            return max_pages
+        high = max_pages
+    
+    # Invarian: halaman `low` ada, halaman `high` tidak ada
+    while high - low > 1:
+        middle = (low + high) // 2
+        if exists(middle):
+            low = middle
+        else:
+            high = middle
+    return low
+
+def discover_total_pages(session=None, parser=None, cache=None, max_pages=MAX_PAGES, found=None,
+                         checkpoint=None):
+    """
+    Menemukan jumlah halaman katalog.
+    
+    Link pagination di halaman 1 dibaca lebih dulu. Jika tidak ada tombol
+    "Next", halaman tertinggi yang di-link adalah halaman terakhir. Jika
+    ada, halaman tersebut diperiksa lalu menjadi titik awal (atau batas
+    atas, jika ternyata tidak ada) bagi `find_last_page`. Produk dari
+    setiap halaman yang diperiksa disimpan di `found` agar tidak diambil
+    ulang. Halaman 1 diambil dengan conditional GET melalui cache, dan
+    halaman yang masih segar di checkpoint diperiksa dari checkpoint tanpa
+    request dan tanpa masuk `found`. Jika terjadi error jaringan,
+    `TOTAL_PAGES` dipakai.
+    
+    Args:
+        session (requests.Session): Session HTTP bersama
+        parser (str | object): Backend parser HTML
+        cache (PageCache): Cache halaman untuk conditional GET
+        max_pages (int): Batas atas jumlah halaman
+        found (dict): Penampung produk per halaman yang sudah diambil
+        checkpoint (PageCheckpoint): Checkpoint per halaman, opsional
+        
+    Returns:
+        int: Jumlah halaman yang ada
+    """
+    found = {} if found is None else found
+    html_parser = parser if parser is not None and not isinstance(parser, str) else get_parser(parser)
+    
+    def checkpointed(page):
+        return checkpoint.get(page) if checkpoint is not None else None
+    
+    def exists(page):
+        products = checkpointed(page)
+        if products is not None:
+            return bool(products)
+        try:
+            products = scrape_page(page, session=session, parser=html_parser, cache=cache,
+                                   raise_errors=True)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return False
+            raise
+        found[page] = products
+        return bool(products)
+    
+    try:
+        # Link pagination selalu dibaca dari HTML halaman 1, yang dilayani
+        # dari cache jika server membalas 304
+        html, products = _fetch_page(1, session=session, parser=html_parser, cache=cache)
+        if not products:
+            return 0
+        if checkpointed(1) is None:
+            found[1] = products
+        
+        highest, has_next = parse_pagination(html)
+        if not has_next:
+            total = min(highest, max_pages)
+        else:
+            highest = min(highest, max_pages)
+            if highest > 1 and not exists(highest):
+                total = find_last_page(exists, max_pages=max_pages, missing=highest)
+            else:
+                total = find_last_page(exists, lower_bound=highest, max_pages=max_pages)
+    except requests.exceptions.RequestException as e:
+        print(f"Gagal menemukan jumlah halaman ({e}), memakai {TOTAL_PAGES} halaman.")
+        return TOTAL_PAGES
+    
+    # Halaman di luar katalog yang sempat diperiksa tidak perlu disimpan
+    for page in [page for page in found if page > total]:
+        del found[page]
+    print(f"Ditemukan {total} halaman katalog.")
+    return total
+
+def create_scrape_session(max_workers=MAX_WORKERS, requests_per_second=REQUESTS_PER_SECOND,
+                          burst=BURST):
+    """
+    Membuat session HTTP untuk scraping dengan pool seukuran jumlah worker
+    dan token bucket adaptif.
+    
+    Args:
+        max_workers (int): Jumlah maksimum halaman yang diambil bersamaan
+        requests_per_second (float): Budget request per detik
+        burst (int): Jumlah request yang boleh dikirim sekaligus
+    
+    Returns:
+        RetrySession: Session yang siap dipakai bersama oleh beberapa thread
+    """
+    rate_limiter = RateLimiter(rate=requests_per_second, burst=burst)
+    return create_session(pool_size=max(1, max_workers or 1), rate_limiter=rate_limiter)
+
+def iter_pages(max_workers=MAX_WORKERS, session=None,
+               requests_per_second=REQUESTS_PER_SECOND, burst=BURST, parser=None,
+               cache=None, checkpoint=None, pages=None):
+    """
+    Generator yang menghasilkan daftar produk per halaman sesuai urutan halaman.
+    
+    Halaman diambil secara paralel dengan thread pool berukuran `max_workers`.
+    Jumlah halaman yang sedang diproses dibatasi dua kali jumlah worker,
+    sehingga hasil tidak menumpuk di memori jika konsumen lebih lambat.
+    Gunakan `max_workers=1` untuk mode sekuensial. Semua halaman memakai satu
+    session HTTP bersama (keep-alive dan retry otomatis) yang dibatasi oleh
+    token bucket adaptif.
+    
+    Args:
+        max_workers (int): Jumlah maksimum halaman yang diambil bersamaan
+        session (requests.Session): Session yang dipakai; jika None, dibuat
+            session baru dengan pool seukuran jumlah worker
+        requests_per_second (float): Budget request per detik untuk session baru
+        burst (int): Jumlah request yang boleh dikirim sekaligus
+        parser (str): Nama backend parser HTML; jika None, dipilih otomatis
+        cache (PageCache): Cache halaman untuk conditional GET; halaman yang
+            tidak berubah (304) dilayani dari cache
+        checkpoint (PageCheckpoint): Checkpoint per halaman; halaman yang
+            masih segar tidak diambil ulang sehingga run yang terhenti dapat
+            dilanjutkan
+        pages (list): Nomor halaman yang diambil, misalnya
+            `checkpoint.failed_pages()`; default semua halaman yang
+            ditemukan oleh `discover_total_pages`
+    
+    Yields:
+        list: Daftar produk dari satu halaman (bisa kosong)
+    """
+    owns_session = session is None
+    if owns_session:
+        session = create_scrape_session(max_workers, requests_per_second, burst)
+    html_parser = get_parser(parser)
+    
+    try:
+        # Jadwalkan tepat halaman yang ada; halaman yang sudah diperiksa saat
+        # penemuan tidak diambil ulang
+        prefetched = {}
+        if pages is None:
+            total = discover_total_pages(session=session, parser=html_parser, cache=cache,
+                                         found=prefetched, checkpoint=checkpoint)
+            pages = list(range(1, total + 1))
+        fetch = partial(_scrape_page_logged, session=session, parser=html_parser, cache=cache,
+                        checkpoint=checkpoint, total=max(pages, default=0), prefetched=prefetched)
+        
+        if max_workers and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Futures diambil sesuai urutan submit agar urutan halaman terjaga
+                remaining = iter(pages)
+                pending = deque(executor.submit(fetch, page)
+                                for page in islice(remaining, max_workers * 2))
+                while pending:
+                    page_products = pending.popleft().result()
+                    for page in islice(remaining, 1):
+                        pending.append(executor.submit(fetch, page))
+                    yield page_products
+        else:
+            for page in pages:
+                yield fetch(page)
+    finally:
+        if owns_session:
+            session.close()
+
+def scrape_product_batches(batch_size=BATCH_SIZE, **kwargs):
+    """
+    Generator yang mengelompokkan produk hasil scraping menjadi batch.
+    
+    Batch dikirim segera setelah terkumpul, sehingga tahap transformasi dan
+    pemuatan dapat berjalan selagi halaman berikutnya masih diunduh.
+    
+    Args:
+        batch_size (int): Jumlah maksimum produk per batch
+        **kwargs: Argumen tambahan untuk `iter_pages`
+    
+    Yields:
+        list: Daftar produk berisi paling banyak `batch_size` item
+    """
+    batch = []
+    total = 0
+    for page_products in iter_pages(**kwargs):
+        for product in page_products:
+            batch.append(product)
+            if len(batch) >= batch_size:
+                total += len(batch)
+                yield batch
+                batch = []
+    
+    if batch:
+        total += len(batch)
+        yield batch
+    
+    print(f"Total produk berhasil di-scrape: {total}")
+
+def scrape_products(**kwargs):
     """
     Fungsi utama untuk mengekstrak data produk dari seluruh halaman.
     
+    Args:
+        **kwargs: Argumen untuk `iter_pages`, misalnya `max_workers`,
+            `session`, `parser`, atau `cache`
+    
     Returns:
         list: Daftar berisi dictionary dari semua produk yang berhasil di-scrape.
     """
     all_products = []
     
-    # Loop dari halaman 1 hingga 50
-    for page in range(1, 51):
-        print(f"Scraping halaman: {page}/50...")
-        
-        page_products = scrape_page(page)
-        
+    for page_products in iter_pages(**kwargs):
         if not page_products:
             # Jika tidak ada produk, lanjutkan ke halaman berikutnya
             continue
@@ -102,4 +481,4 @@ def scrape_products():
         all_products.extend(page_products)
     
     print(f"Total produk berhasil di-scrape: {len(all_products)}")
-    return all_products
\ No newline at end of file
+    return all_products
@@ -1,8 +1,10 @@
-import time
 import requests
 import datetime
 import pandas as pd
 from bs4 import BeautifulSoup
+from utils.session import create_session
+from utils.rate_limit import RateLimiter
+from utils.extract import parse_pagination, find_last_page
 
 HEADERS = {
     "User-Agent": (
@@ -13,26 +15,55 @@ HEADERS = {
 
 BASE_URL = "https://fashion-studio.dicoding.dev/"
 MAX_PAGES = 50
+PAGE_SEARCH_LIMIT = 1000
 TARGET_DATA = 1000
+REQUESTS_PER_SECOND = 2.0
+BURST = 5
 
-def scrape_page(url: str) -> list:
+def fetch_page(url: str, session=None) -> list:
+    """
+    Mengambil dan mem-parsing satu halaman; error jaringan dan HTTP diteruskan
+
+    Parameters:
+    url (str): URL halaman yang akan di-scrape
+    session (requests.Session): Session HTTP bersama (default: requests.get tanpa retry)
+
+    Returns:
+    list: Daftar produk pada halaman tersebut
+    """
+    http = session if session is not None else requests
+    response = http.get(url, headers=HEADERS, timeout=10)
+    response.raise_for_status()
+    return parse_products(response.text)
+
+def scrape_page(url: str, session=None) -> list:
     """
     Scrape satu halaman dan mengembalikan daftar produk
 
     Parameters:
     url (str): URL halaman yang akan di-scrape
+    session (requests.Session): Session HTTP bersama (default: requests.get tanpa retry)
 
     Returns:
     list: Daftar produk dengan atribut seperti Title, Price, Rating, Colors, Size, Gender, dan Timestamp
     """
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
+        return fetch_page(url, session=session)
     except requests.RequestException as e:
         print(f"Error fetching {url}: {e}")
         return []
-    
-    soup = BeautifulSoup(response.text, "html.parser")
+
+def parse_products(html: str) -> list:
+    """
+    Mengurai kartu produk dari HTML sebuah halaman
+
+    Parameters:
+    html (str): Isi halaman
+
+    Returns:
+    list: Daftar produk dengan atribut seperti Title, Price, Rating, Colors, Size, Gender, dan Timestamp
+    """
+    soup = BeautifulSoup(html, "html.parser")
     products = []
 
     for product in soup.find_all("div", class_="collection-card"):
@@ -68,26 +99,85 @@ def scrape_page(url: str) -> list:
 
     return products
 
+def page_url(page: int) -> str:
+    """
+    URL halaman ke-page; halaman 1 adalah BASE_URL, selanjutnya pageN
+    """
+    return BASE_URL if page == 1 else f"{BASE_URL}page{page}"
+
+def discover_pages(session, found: dict) -> int:
+    """
+    Menemukan jumlah halaman dari link pagination di halaman 1, lalu
+    probing eksponensial dan binary search jika masih ada tombol Next.
+    Hanya 404 atau halaman tanpa produk yang dianggap tidak ada; error
+    lain membuat MAX_PAGES dipakai agar katalog tidak terpotong diam-diam
+
+    Parameters:
+    session (requests.Session): Session HTTP bersama
+    found (dict): Penampung produk per halaman yang sudah diambil saat probing
+
+    Returns:
+    int: Jumlah halaman, atau MAX_PAGES jika jumlahnya tidak dapat dipastikan
+    """
+    def exists(page):
+        try:
+            products = fetch_page(page_url(page), session=session)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return False
+            raise
+        found[page] = products
+        return bool(products)
+
+    try:
+        response = session.get(BASE_URL, headers=HEADERS, timeout=10)
+        response.raise_for_status()
+        found[1] = parse_products(response.text)
+        if not found[1]:
+            return 0
+
+        highest, has_next = parse_pagination(response.text)
+        if not has_next:
+            total = min(highest, PAGE_SEARCH_LIMIT)
+        else:
+            highest = min(highest, PAGE_SEARCH_LIMIT)
+            if highest > 1 and not exists(highest):
+                total = find_last_page(exists, max_pages=PAGE_SEARCH_LIMIT, missing=highest)
+            else:
+                total = find_last_page(exists, lower_bound=highest, max_pages=PAGE_SEARCH_LIMIT)
+    except requests.RequestException as e:
+        print(f"Error menemukan jumlah halaman: {e}, memakai {MAX_PAGES} halaman")
+        return MAX_PAGES
+
+    for page in [page for page in found if page > total]:
+        del found[page]
+    print(f"Ditemukan {total} halaman")
+    return total
+
 def scrape_main():
     """
-    Scrape semua halaman hingga batas maksimum yang ditentukan
+    Scrape semua halaman yang ada; jumlah halaman ditemukan dari pagination
 
     Returns:
     list: Daftar seluruh produk yang berhasil discrape
     """
     all_products = []
-    for page in range(1, MAX_PAGES + 1):
+    rate_limiter = RateLimiter(rate=REQUESTS_PER_SECOND, burst=BURST)
+    session = create_session(headers=HEADERS, rate_limiter=rate_limiter)
+    found = {}
+    total_pages = discover_pages(session, found)
+    for page in range(1, total_pages + 1):
         try:
-            if page == 1:
-                url = BASE_URL
+            url = page_url(page)
+            if page in found:
+                page_products = found[page]
             else:
-                url = f"{BASE_URL}page{page}"
-            print(f"Scraping URL: {url}")
-            page_products = scrape_page(url)
+                print(f"Scraping URL: {url}")
+                page_products = scrape_page(url, session=session)
             print(f"Found {len(page_products)} products on page {page}")
             all_products.extend(page_products)
-            time.sleep(1)
         except Exception as e:
             print(f"Error scraping halaman {page}: {e}")
+    session.close()
     print(f"\nTotal data scraping: {len(all_products)}")
     return all_products
\ No newline at end of file
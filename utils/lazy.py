@@ -0,0 +1,59 @@
+import importlib
+
+class LazyImport:
+    """
+    Pengganti modul (atau atribut modul) yang baru di-import saat pertama
+    kali dipakai.
+
+    Dipakai untuk backend sink yang berat seperti gspread, google-auth, dan
+    psycopg2, agar proses yang hanya mengekstrak atau mentransformasi data
+    tidak ikut membayar waktu import-nya. Akses atribut dan pemanggilan
+    diteruskan ke objek aslinya, dan atribut dapat di-patch seperti pada
+    modul biasa, misalnya `patch('utils.load.psycopg2.connect')`.
+    """
+
+    def __init__(self, module, attribute=None):
+        self._module = module
+        self._attribute = attribute
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            target = importlib.import_module(self._module)
+            if self._attribute is not None:
+                target = getattr(target, self._attribute)
+            self._target = target
+        return self._target
+
+    @property
+    def loaded(self):
+        """True jika modul aslinya sudah di-import."""
+        return self._target is not None
+
+    def __getattr__(self, name):
+        # Hanya dipanggil untuk atribut yang tidak dimiliki proxy itu sendiri
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        name = self._module if self._attribute is None else f"{self._module}.{self._attribute}"
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<LazyImport {name} ({state})>"
+
+def lazy_import(module, attribute=None):
+    """
+    Membuat proxy import tertunda.
+
+    Args:
+        module (str): Nama modul, misalnya 'psycopg2.extras'
+        attribute (str): Nama atribut modul yang diambil, misalnya
+            'execute_values'; jika None, modul itu sendiri
+
+    Returns:
+        LazyImport: Proxy yang meng-import modul saat pertama kali dipakai
+    """
+    return LazyImport(module, attribute)
@@ -1,10 +1,771 @@
 import pandas as pd
+import hashlib
+import importlib.util
+import io
 import os
-from google.oauth2.service_account import Credentials
-import gspread
-import psycopg2
-from psycopg2.extras import execute_values
+import time
+from concurrent.futures import ThreadPoolExecutor
 import json
+from utils.lazy import lazy_import
+from utils.session import parse_retry_after
+from utils.dedup import dedup_key_columns
+from utils.sheets_sync import plan_sync, delete_rows_requests
+from utils.transform import standard_dtypes
+
+# Backend Google Sheets dan PostgreSQL baru di-import saat sink-nya dipakai,
+# sehingga run ekstraksi/transformasi saja tidak membayar waktu import-nya
+Credentials = lazy_import('google.oauth2.service_account', 'Credentials')
+gspread = lazy_import('gspread')
+psycopg2 = lazy_import('psycopg2')
+execute_values = lazy_import('psycopg2.extras', 'execute_values')
+
+# pyarrow opsional, hanya dibutuhkan untuk output kolumnar Parquet/Feather;
+# ketersediaannya dicek tanpa meng-import, pa bernilai None jika tidak terpasang
+if importlib.util.find_spec('pyarrow') is not None:
+    pa = lazy_import('pyarrow')
+    pq = lazy_import('pyarrow.parquet')
+    pa_ipc = lazy_import('pyarrow.ipc')
+else:
+    pa = pq = pa_ipc = None
+
+# Konfigurasi koneksi PostgreSQL
+# Dalam implementasi nyata, gunakan environment variables untuk keamanan
+DB_CONFIG = {
+    'host': 'localhost',
+    'database': 'fashion_studio',
+    'user': 'postgres',
+    'password': 'password',
+    'port': '5432'
+}
+
+# Konfigurasi Google Sheets
+CREDENTIALS_PATH = 'google-sheets-api.json'
+SPREADSHEET_NAME = "Fashion Studio ETL Data"
+SHEETS_SCOPE = ['https://spreadsheets.google.com/feeds',
+                'https://www.googleapis.com/auth/drive']
+
+# Penulisan Google Sheets per chunk dengan backoff saat kuota habis
+SHEETS_CHUNK_SIZE = 500
+SHEETS_MAX_RETRIES = 5
+SHEETS_BACKOFF_FACTOR = 2.0
+SHEETS_MAX_BACKOFF = 64
+SHEETS_RETRY_STATUS_CODES = {429, 500, 502, 503}
+
+# Mode penulisan Google Sheets: tulis ulang seluruh sheet, atau sinkronisasi
+# sel yang berubah saja. Kolom yang berubah setiap run tidak dibandingkan.
+SHEETS_MODES = ('rewrite', 'sync')
+SHEETS_SYNC_IGNORE_COLUMNS = ['Timestamp']
+# Kolom identitas baris sheet pada mode sync; Price/Rating dibandingkan per sel
+SHEETS_KEY_COLUMNS = ['Title', 'Size', 'Gender', 'Colors']
+
+# Format output kolumnar dan kompresi default masing-masing. Feather tanpa
+# kompresi dapat di-memory-map langsung saat dibaca.
+COLUMNAR_FORMATS = {
+    'parquet': {'extensions': ('.parquet', '.pq'), 'compression': 'snappy'},
+    'feather': {'extensions': ('.feather', '.arrow', '.ipc'), 'compression': None},
+}
+
+# Urutan kolom DataFrame dan kolom tabel PostgreSQL yang bersesuaian
+DATAFRAME_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'Timestamp']
+TABLE_COLUMNS = ['title', 'price', 'rating', 'colors', 'size', 'gender', 'timestamp']
+
+# Metode insert PostgreSQL: COPY FROM STDIN (default) atau execute_values
+POSTGRES_METHODS = ('copy', 'values')
+
+# Jumlah koneksi pool yang dicoba sebelum menyerah saat semuanya mati
+# (misalnya setelah server PostgreSQL di-restart)
+POSTGRES_CHECKOUT_ATTEMPTS = 3
+
+# Strategi penggantian data lama: DELETE lalu INSERT, swap isi tabel staging,
+# atau upsert inkremental berdasarkan fingerprint produk
+POSTGRES_STRATEGIES = ('delete', 'swap', 'upsert')
+
+# Kolom fingerprint produk, sama dengan kunci deduplikasi transformasi
+# (semua kolom kecuali Timestamp), sehingga baris yang dipertahankan
+# transformasi tidak digabung oleh upsert; serta penanganan produk hilang
+FINGERPRINT_COLUMNS = dedup_key_columns(DATAFRAME_COLUMNS)
+MISSING_ACTIONS = ('delete', 'flag')
+
+def fingerprint_text(series):
+    """
+    Mengubah kolom menjadi teks seperti `COALESCE(kolom::text, '')` di
+    PostgreSQL: float bulat ditulis tanpa '.0' dan NULL menjadi string kosong.
+    
+    Args:
+        series (pd.Series): Kolom data produk
+        
+    Returns:
+        pd.Series: Teks per baris
+    """
+    if pd.api.types.is_float_dtype(series):
+        return series.map(lambda value: '' if pd.isna(value) else
+                          str(int(value)) if float(value).is_integer() and abs(value) < 1e15 else
+                          repr(float(value)))
+    return series.astype(str).where(series.notna(), '')
+
+def product_fingerprint(dataframe, columns=FINGERPRINT_COLUMNS):
+    """
+    Menghitung hash konten yang stabil untuk setiap produk.
+    
+    Args:
+        dataframe (pd.DataFrame): Data produk
+        columns (list): Kolom yang membentuk identitas produk
+        
+    Returns:
+        pd.Series: Hash MD5 heksadesimal per baris
+    """
+    keys = fingerprint_text(dataframe[columns[0]])
+    for column in columns[1:]:
+        keys = keys + '\x1f' + fingerprint_text(dataframe[column])
+    return keys.map(lambda key: hashlib.md5(key.encode('utf-8')).hexdigest())
+
+# Penanda NULL pada buffer CSV untuk COPY, agar string kosong tetap string kosong
+COPY_NULL = '\\N'
+
+def copy_dataframe(cursor, dataframe, table_name, columns):
+    """
+    Memuat DataFrame ke tabel dengan `COPY ... FROM STDIN`.
+    
+    DataFrame diserialisasi sekali ke buffer CSV di memori lalu dialirkan ke
+    server dalam satu perintah, tanpa membuat tuple Python per baris.
+    
+    Args:
+        cursor: Cursor psycopg2
+        dataframe (pd.DataFrame): Data dengan urutan kolom sesuai `columns`
+        table_name (str): Nama tabel tujuan
+        columns (list): Nama kolom tabel tujuan
+    """
+    buffer = io.StringIO()
+    dataframe.to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+    buffer.seek(0)
+    copy_query = (f"COPY {table_name} ({', '.join(columns)}) FROM STDIN "
+                  f"WITH (FORMAT csv, NULL '{COPY_NULL}')")
+    cursor.copy_expert(copy_query, buffer)
+
+class CsvWriter:
+    """
+    Penulis CSV bertahap: header ditulis sekali, batch berikutnya ditambahkan.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.rows = 0
+        self._file = None
+
+    def open(self):
+        self._file = open(self.filename, 'w', newline='', encoding='utf-8')
+        self.rows = 0
+        self._header_written = False
+
+    def write(self, dataframe):
+        dataframe = standard_dtypes(dataframe)
+        dataframe.to_csv(self._file, index=False, header=not self._header_written)
+        self._header_written = True
+        self.rows += len(dataframe)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def abort(self):
+        self.close()
+
+def columnar_format(filename):
+    """
+    Menentukan format kolumnar dari ekstensi nama file.
+
+    Args:
+        filename (str): Nama file output
+
+    Returns:
+        str: 'parquet' atau 'feather'
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    for name, spec in COLUMNAR_FORMATS.items():
+        if extension in spec['extensions']:
+            return name
+    raise ValueError(f"Format kolumnar tidak dikenali dari nama file: {filename}")
+
+class ColumnarWriter:
+    """
+    Penulis kolumnar bertahap ke Parquet atau Feather (Arrow IPC) dengan
+    tipe kolom yang dipertahankan.
+
+    Skema Arrow diambil dari batch pertama dan dipakai untuk batch
+    berikutnya. Data ditulis ke file sementara lalu dipindahkan ke nama
+    akhir saat ditutup, sehingga pembaca tidak pernah melihat file setengah
+    jadi. `compression` untuk Parquet: 'snappy', 'zstd', 'gzip', 'brotli',
+    atau 'none'; untuk Feather: None, 'lz4', atau 'zstd'.
+
+    Format file Arrow IPC tidak mengizinkan dictionary berganti antar
+    batch, padahal setiap batch skema ringkas membawa kategori Size/Gender
+    sendiri. Karena itu kolom kategorikal disimpan sebagai nilai aslinya
+    (string) pada Feather; Parquet tetap menyimpannya sebagai dictionary.
+    """
+
+    def __init__(self, filename, format=None, compression='default'):
+        if pa is None:
+            raise ImportError("pyarrow belum terpasang. Jalankan 'pip install pyarrow'.")
+        self.format = format or columnar_format(filename)
+        if self.format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Format kolumnar tidak dikenal: {self.format}")
+        self.filename = filename
+        self.compression = (COLUMNAR_FORMATS[self.format]['compression']
+                            if compression == 'default' else compression)
+        self.rows = 0
+        self.schema = None
+        self._writer = None
+        self._tmp_path = f"{filename}.tmp"
+
+    def open(self):
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.rows = 0
+        self.schema = None
+        self._writer = None
+
+    def _open_writer(self, schema):
+        if self.format == 'parquet':
+            return pq.ParquetWriter(self._tmp_path, schema, compression=self.compression)
+        options = pa_ipc.IpcWriteOptions(compression=self.compression)
+        return pa_ipc.new_file(self._tmp_path, schema, options=options)
+
+    def write(self, dataframe):
+        if self.schema is None:
+            table = pa.Table.from_pandas(dataframe, preserve_index=False)
+            if self.format == 'feather':
+                table = table.cast(pa.schema([
+                    field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type)
+                    else field
+                    for field in table.schema
+                ], metadata=table.schema.metadata))
+            self.schema = table.schema
+            self._writer = self._open_writer(self.schema)
+        else:
+            table = pa.Table.from_pandas(dataframe, schema=self.schema, preserve_index=False)
+        self._writer.write_table(table)
+        self.rows += len(dataframe)
+
+    def close(self):
+        if self._writer is None:
+            # Tidak ada batch: tetap buat file kosong dengan kolom standar
+            self._writer = self._open_writer(pa.schema([(column, pa.null()) for column in DATAFRAME_COLUMNS]))
+        self._writer.close()
+        self._writer = None
+        os.replace(self._tmp_path, self.filename)
+
+    def abort(self):
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            self._writer = None
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+def authorize_sheets(credentials_path=CREDENTIALS_PATH):
+    """
+    Membuat klien gspread dari kredensial service account.
+
+    Token OAuth diperbarui otomatis oleh klien saat kedaluwarsa, sehingga
+    klien yang sama dapat dipakai ulang selama proses berjalan.
+
+    Args:
+        credentials_path (str): Lokasi file kredensial
+
+    Returns:
+        gspread.Client: Klien yang sudah terotorisasi
+    """
+    if not os.path.exists(credentials_path):
+        raise FileNotFoundError(f"File kredensial {credentials_path} tidak ditemukan.")
+
+    # Setup kredensial dan akses Google Sheets
+    credentials = Credentials.from_service_account_file(credentials_path, scopes=SHEETS_SCOPE)
+    return gspread.authorize(credentials)
+
+class GoogleSheetsWriter:
+    """
+    Penulis Google Sheets bertahap: sheet dikosongkan saat dibuka, lalu
+    setiap batch ditambahkan di bawah data sebelumnya.
+
+    Baris ditampung lalu dikirim per `chunk_size` baris dalam satu panggilan
+    `worksheet.update`, bukan satu `append_row` per baris. Jika kuota Sheets
+    API habis (status 429) atau server sedang bermasalah (5xx), panggilan
+    dicoba ulang dengan exponential backoff dan header Retry-After dihormati.
+    `client` dapat diisi objek mirip klien gspread (misalnya fake untuk
+    pengujian) agar otorisasi kredensial dilewati.
+
+    Dengan `mode='sync'`, sheet tidak dikosongkan. Isinya dibaca sekali saat
+    dibuka, batch ditampung, dan saat ditutup data dibandingkan per baris
+    berdasarkan `key_columns`: sel yang berubah dikirim dalam satu
+    `batchUpdate`, produk baru ditambahkan di akhir sheet, dan produk yang
+    hilang dihapus. Jika `checkpoint` diisi dan masih ada halaman yang
+    gagal, produk yang hilang tidak dihapus agar run parsial tidak
+    mengosongkan sheet. Ringkasan perubahan tersedia di atribut `changes`.
+    Karena perbandingan membutuhkan data lengkap, mode ini menampung isi
+    sheet dan seluruh baris run (sebagai string) hingga ditutup, juga pada
+    mode streaming; ukurannya dibatasi kapasitas Google Sheets (10 juta
+    sel). Pakai `mode='rewrite'` jika memori harus dibatasi per batch.
+    """
+
+    def __init__(self, credentials_path=CREDENTIALS_PATH, spreadsheet_name=SPREADSHEET_NAME,
+                 chunk_size=SHEETS_CHUNK_SIZE, max_retries=SHEETS_MAX_RETRIES,
+                 backoff_factor=SHEETS_BACKOFF_FACTOR, max_backoff=SHEETS_MAX_BACKOFF,
+                 client=None, mode='rewrite', key_columns=SHEETS_KEY_COLUMNS,
+                 ignore_columns=SHEETS_SYNC_IGNORE_COLUMNS, checkpoint=None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size harus lebih dari 0")
+        if mode not in SHEETS_MODES:
+            raise ValueError(f"Mode Google Sheets tidak dikenal: {mode}")
+        self.credentials_path = credentials_path
+        self.spreadsheet_name = spreadsheet_name
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.client = client
+        self.mode = mode
+        self.key_columns = key_columns
+        self.ignore_columns = ignore_columns
+        self.checkpoint = checkpoint
+        self.changes = {}
+        self.rows = 0
+        self.requests = 0
+        self.spreadsheet = None
+        self.worksheet = None
+
+    def open(self):
+        gc = self.client if self.client is not None else authorize_sheets(self.credentials_path)
+
+        # Buka atau buat spreadsheet
+        try:
+            # Coba buka spreadsheet yang sudah ada
+            self.spreadsheet = gc.open(self.spreadsheet_name)
+        except gspread.SpreadsheetNotFound:
+            # Jika tidak ada, buat spreadsheet baru
+            self.spreadsheet = gc.create(self.spreadsheet_name)
+            # Bagikan dengan akses edit untuk siapa saja dengan link
+            self.spreadsheet.share('', perm_type='anyone', role='writer')
+
+        # Pilih worksheet pertama; mode sync membaca isinya sekali, mode
+        # rewrite menghapus data lama
+        self.worksheet = self.spreadsheet.sheet1
+        self.rows = 0
+        self.requests = 0
+        self.changes = {}
+        self._next_row = 1
+        self._pending = []
+        self._header = None
+        self._header_written = False
+        if self.mode == 'sync':
+            self._current = self._call(self.worksheet.get_all_values)
+        else:
+            self._call(self.worksheet.clear)
+
+    def _retry_delay(self, error, attempt):
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+
+    def _call(self, func, *args, **kwargs):
+        # Coba ulang hanya untuk kuota habis dan error sementara dari server
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = func(*args, **kwargs)
+                self.requests += 1
+                return result
+            except gspread.exceptions.APIError as e:
+                code = getattr(e, 'code', None)
+                if code not in SHEETS_RETRY_STATUS_CODES or attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                print(f"Kuota/API Google Sheets ({code}), mencoba lagi dalam {delay:.1f} detik...")
+                time.sleep(delay)
+
+    def _flush(self, size):
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        self._call(self.worksheet.update, values=chunk, range_name=f"A{self._next_row}")
+        self._next_row += len(chunk)
+
+    def write(self, dataframe):
+        dataframe = standard_dtypes(dataframe)
+        if self.mode == 'sync':
+            # Ditampung hingga close karena baris yang hilang baru diketahui
+            # setelah seluruh data diterima
+            self._header = dataframe.columns.tolist()
+            self._pending.extend([str(cell) for cell in row] for row in dataframe.values.tolist())
+            self.rows += len(dataframe)
+            return
+
+        if not self._header_written:
+            # Tulis header
+            self._pending.append(dataframe.columns.tolist())
+            self._header_written = True
+
+        # Konversi semua nilai ke string untuk menghindari error
+        self._pending.extend([str(cell) for cell in row] for row in dataframe.values.tolist())
+        self.rows += len(dataframe)
+
+        # Kirim setiap chunk yang sudah penuh
+        while len(self._pending) >= self.chunk_size:
+            self._flush(self.chunk_size)
+
+    def close(self):
+        if self.mode == 'sync':
+            self._sync()
+        elif self._pending:
+            self._flush(len(self._pending))
+
+    def _sync(self):
+        if self._header is None:
+            return
+
+        plan = plan_sync(self._current, self._header, self._pending,
+                         self.key_columns, self.ignore_columns)
+        if plan['rewrite']:
+            # Sheet kosong atau header berubah: tulis ulang seluruhnya
+            print("Header Google Sheets berbeda, sheet ditulis ulang.")
+            self._call(self.worksheet.clear)
+            self._pending.insert(0, self._header)
+            while self._pending:
+                self._flush(self.chunk_size)
+            self.changes = {'inserted': self.rows, 'updated': 0, 'deleted': 0,
+                            'unchanged': 0, 'cells': 0}
+            return
+
+        # Run parsial tidak mewakili seluruh katalog: produk yang hilang dibiarkan
+        deletes = plan['deletes']
+        failed = self.checkpoint.failed_pages() if self.checkpoint is not None else []
+        if deletes and failed:
+            print(f"⚠️ Produk yang hilang di Google Sheets tidak dihapus: "
+                  f"{len(failed)} halaman gagal diambil.")
+            deletes = []
+
+        # Nomor baris pada update mengacu ke sheet sebelum baris dihapus
+        if plan['updates']:
+            self._call(self.worksheet.batch_update, plan['updates'])
+        if deletes:
+            self._call(self.spreadsheet.batch_update,
+                       {'requests': delete_rows_requests(self.worksheet.id, deletes)})
+        appends = plan['appends']
+        for start in range(0, len(appends), self.chunk_size):
+            self._call(self.worksheet.append_rows, appends[start:start + self.chunk_size])
+
+        self._pending = []
+        self.changes = {
+            'inserted': len(appends),
+            'updated': plan['updated'],
+            'deleted': sum(end - start + 1 for start, end in deletes),
+            'unchanged': plan['unchanged'],
+            'cells': plan['cells'],
+        }
+
+    def abort(self):
+        self._pending = []
+
+class PostgresWriter:
+    """
+    Penulis PostgreSQL bertahap dalam satu transaksi: data lama dihapus saat
+    dibuka, setiap batch di-insert, dan perubahan di-commit saat ditutup.
+
+    `method='copy'` mengalirkan setiap batch lewat `COPY ... FROM STDIN`,
+    sedangkan `method='values'` memakai `execute_values` seperti sebelumnya.
+
+    Dengan `strategy='swap'`, data lama tidak dihapus saat dibuka. Batch
+    ditulis ke tabel sementara tanpa index dan tanpa WAL, lalu saat ditutup
+    tabel utama dikosongkan dengan TRUNCATE dan diisi `INSERT ... SELECT`
+    dari tabel sementara dalam transaksi yang sama. Tabel utama tidak
+    diganti, sehingga GRANT, pemilik, trigger, foreign key, RLS, constraint,
+    index, dan view yang bergantung padanya tetap utuh, dan tidak ada dead
+    tuple dari DELETE. TRUNCATE memegang lock eksklusif hingga commit,
+    sehingga pembaca menunggu selama `INSERT ... SELECT` berjalan.
+
+    Dengan `strategy='upsert'`, setiap produk diberi fingerprint dari
+    kolom kunci deduplikasi (semua kolom kecuali Timestamp). Batch dimuat
+    ke tabel sementara, lalu saat ditutup hanya produk baru yang ditulis
+    lewat `INSERT ... ON CONFLICT`, sehingga `id` produk yang tidak berubah
+    tetap stabil. Produk yang tidak muncul lagi dihapus (`missing='delete'`)
+    atau ditandai `is_active = FALSE` (`missing='flag'`). Langkah ini
+    dilewati jika run tidak menghasilkan baris, atau jika `checkpoint`
+    diisi dan masih ada halaman yang gagal, agar run parsial tidak
+    menghapus produk dari halaman yang tidak terambil.
+
+    Jika `pool` diisi (misalnya `psycopg2.pool.ThreadedConnectionPool`),
+    koneksi dipinjam dari pool saat dibuka dan dikembalikan saat ditutup,
+    bukan dibuat baru setiap run. Koneksi yang dipinjam dicek dengan
+    `SELECT 1`; koneksi yang sudah mati dibuang dan diganti koneksi lain.
+    """
+
+    def __init__(self, table_name, db_config=None, method='copy', strategy='delete',
+                 missing='delete', pool=None, checkpoint=None):
+        if method not in POSTGRES_METHODS:
+            raise ValueError(f"Metode PostgreSQL tidak dikenal: {method}")
+        if strategy not in POSTGRES_STRATEGIES:
+            raise ValueError(f"Strategi PostgreSQL tidak dikenal: {strategy}")
+        if missing not in MISSING_ACTIONS:
+            raise ValueError(f"Penanganan produk hilang tidak dikenal: {missing}")
+        self.table_name = table_name
+        self.db_config = db_config or DB_CONFIG
+        self.method = method
+        self.strategy = strategy
+        self.missing = missing
+        self.pool = pool
+        self.checkpoint = checkpoint
+        self.staging_table = f"{table_name}_staging"
+        self.incoming_table = f"{table_name}_incoming"
+        self.rows = 0
+        self.changes = {}
+        self.conn = None
+        self.cursor = None
+
+    @property
+    def target_table(self):
+        """Tabel yang menerima batch: staging (swap), sementara (upsert), atau tabel utama."""
+        if self.strategy == 'swap':
+            return self.staging_table
+        if self.strategy == 'upsert':
+            return self.incoming_table
+        return self.table_name
+
+    def open(self):
+        # Koneksi ke database
+        if self.pool is not None:
+            self.conn = self._checkout()
+        else:
+            self.conn = psycopg2.connect(**self.db_config)
+        self.cursor = self.conn.cursor()
+        self.rows = 0
+
+        # Buat tabel jika belum ada
+        create_table_query = f"""
+        CREATE TABLE IF NOT EXISTS {self.table_name} (
+            id SERIAL PRIMARY KEY,
+            title VARCHAR(255),
+            price FLOAT,
+            rating FLOAT,
+            colors INTEGER,
+            size VARCHAR(50),
+            gender VARCHAR(20),
+            timestamp VARCHAR(50)
+        );
+        """
+        self.cursor.execute(create_table_query)
+
+        if self.strategy == 'upsert':
+            self._prepare_upsert()
+        elif self.strategy == 'swap':
+            # Tabel sementara tanpa index dan tanpa WAL untuk bulk load cepat;
+            # kolom dan default (termasuk sequence id) mengikuti tabel utama
+            self.cursor.execute(
+                f"CREATE TEMP TABLE {self.staging_table} "
+                f"(LIKE {self.table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+        else:
+            # Hapus data lama
+            self.cursor.execute(f"DELETE FROM {self.table_name}")
+
+    def _checkout(self):
+        # Koneksi pool bisa terputus di antara run daemon (server restart,
+        # idle timeout); koneksi seperti itu dibuang dan pool membuat yang baru
+        for attempt in range(1, POSTGRES_CHECKOUT_ATTEMPTS + 1):
+            conn = self.pool.getconn()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.close()
+                return conn
+            except psycopg2.Error as e:
+                self.pool.putconn(conn, close=True)
+                if attempt == POSTGRES_CHECKOUT_ATTEMPTS:
+                    raise
+                print(f"Koneksi pool PostgreSQL mati, diganti: {e}")
+
+    def _backfill_fingerprints(self):
+        # Baris lama (sebelum strategi upsert dipakai) belum memiliki
+        # fingerprint; tanpa backfill semuanya akan dihapus lalu di-insert
+        # ulang dengan id baru pada run upsert pertama
+        table = self.table_name
+        self.cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table} WHERE fingerprint IS NULL)")
+        if not self.cursor.fetchone()[0]:
+            return
+
+        # Sama dengan product_fingerprint: MD5 dari FINGERPRINT_COLUMNS yang
+        # dipisahkan karakter unit separator
+        expression = " || chr(31) || ".join(
+            f"COALESCE({column.lower()}::text, '')" for column in FINGERPRINT_COLUMNS
+        )
+        # Baris lama dengan fingerprint yang sama dibuang lebih dulu agar
+        # unique index dapat dibuat; baris yang sudah ber-fingerprint, lalu
+        # id terkecil, yang dipertahankan
+        self.cursor.execute(f"""
+        DELETE FROM {table} USING (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY COALESCE(fingerprint, md5({expression}))
+                ORDER BY fingerprint IS NULL, id
+            ) AS rank
+            FROM {table}
+        ) ranked
+        WHERE {table}.id = ranked.id AND ranked.rank > 1 AND {table}.fingerprint IS NULL
+        """)
+        self.cursor.execute(
+            f"UPDATE {table} SET fingerprint = md5({expression}) WHERE fingerprint IS NULL"
+        )
+
+    def _prepare_upsert(self):
+        # Kolom fingerprint dengan unique index sebagai kunci upsert
+        self.cursor.execute(f"ALTER TABLE {self.table_name} ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(32)")
+        self._backfill_fingerprints()
+        self.cursor.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {self.table_name}_fingerprint_key "
+            f"ON {self.table_name} (fingerprint)"
+        )
+        if self.missing == 'flag':
+            self.cursor.execute(
+                f"ALTER TABLE {self.table_name} ADD COLUMN IF NOT EXISTS is_active BOOLEAN DEFAULT TRUE"
+            )
+
+        # Tabel sementara untuk hasil run ini; seq menjaga urutan kedatangan
+        self.cursor.execute(f"""
+        CREATE TEMP TABLE {self.incoming_table} (
+            seq BIGSERIAL,
+            title VARCHAR(255),
+            price FLOAT,
+            rating FLOAT,
+            colors INTEGER,
+            size VARCHAR(50),
+            gender VARCHAR(20),
+            timestamp VARCHAR(50),
+            fingerprint VARCHAR(32)
+        ) ON COMMIT DROP;
+        """)
+
+    def write(self, dataframe):
+        data = standard_dtypes(dataframe[DATAFRAME_COLUMNS])
+        columns = TABLE_COLUMNS
+        if self.strategy == 'upsert':
+            data = data.assign(fingerprint=product_fingerprint(data))
+            columns = TABLE_COLUMNS + ['fingerprint']
+
+        # Insert data baru
+        if self.method == 'copy':
+            copy_dataframe(self.cursor, data, self.target_table, columns)
+        else:
+            values = [tuple(row) for row in data.values]
+
+            insert_query = f"INSERT INTO {self.target_table} ({', '.join(columns)}) VALUES %s"
+            execute_values(self.cursor, insert_query, values)
+        self.rows += len(dataframe)
+
+    def _missing_pass_skipped(self):
+        # Run tanpa baris atau dengan halaman gagal tidak mewakili seluruh katalog
+        if self.rows == 0:
+            return "tidak ada baris yang dimuat"
+        if self.checkpoint is not None:
+            failed = self.checkpoint.failed_pages()
+            if failed:
+                return f"{len(failed)} halaman gagal diambil"
+        return None
+
+    def _apply_upsert(self):
+        table = self.table_name
+        incoming = self.incoming_table
+        columns = ', '.join(TABLE_COLUMNS + ['fingerprint'])
+        # Fingerprint mencakup semua kolom kecuali Timestamp, sehingga konflik
+        # berarti produk tidak berubah; hanya status aktifnya yang dipulihkan
+        if self.missing == 'flag':
+            conflict = (f"DO UPDATE SET is_active = TRUE "
+                        f"WHERE {table}.is_active IS NOT TRUE")
+        else:
+            conflict = "DO NOTHING"
+
+        # Tulis hanya produk baru; jika fingerprint muncul lebih dari sekali,
+        # data terakhir yang dipakai
+        self.cursor.execute(f"""
+        INSERT INTO {table} ({columns})
+        SELECT DISTINCT ON (fingerprint) {columns}
+        FROM {incoming}
+        ORDER BY fingerprint, seq DESC
+        ON CONFLICT (fingerprint) {conflict};
+        """)
+        self.changes['upserted'] = self.cursor.rowcount
+
+        reason = self._missing_pass_skipped()
+        if reason:
+            print(f"⚠️ Produk yang hilang di {table} tidak diproses: {reason}.")
+            self.changes['skipped_missing'] = reason
+            return
+
+        # Produk yang tidak muncul di run ini
+        missing_filter = (f"NOT EXISTS (SELECT 1 FROM {incoming} "
+                          f"WHERE {incoming}.fingerprint = {table}.fingerprint)")
+        if self.missing == 'flag':
+            self.cursor.execute(
+                f"UPDATE {table} SET is_active = FALSE WHERE is_active IS NOT FALSE AND {missing_filter}"
+            )
+            self.changes['flagged'] = self.cursor.rowcount
+        else:
+            self.cursor.execute(f"DELETE FROM {table} WHERE {missing_filter}")
+            self.changes['deleted'] = self.cursor.rowcount
+
+    def _swap_tables(self):
+        # Tabel utama dipertahankan agar hak akses dan constraint-nya tidak
+        # hilang; isinya diganti dalam transaksi yang sama dengan commit
+        self.cursor.execute(f"TRUNCATE {self.table_name}")
+        self.cursor.execute(f"INSERT INTO {self.table_name} SELECT * FROM {self.staging_table}")
+
+    def close(self):
+        if self.strategy == 'swap':
+            self._swap_tables()
+        elif self.strategy == 'upsert':
+            self._apply_upsert()
+
+        # Commit perubahan lalu tutup koneksi
+        self.conn.commit()
+        self.cursor.close()
+        self._release()
+
+    def _release(self, discard=False):
+        # Koneksi dari pool dikembalikan; koneksi yang gagal dibuang dari pool
+        if self.pool is not None:
+            self.pool.putconn(self.conn, close=discard)
+        else:
+            self.conn.close()
+        self.conn = None
+
+    def abort(self):
+        # Batalkan transaksi sehingga data lama tetap utuh
+        if self.conn is not None:
+            try:
+                self.conn.rollback()
+            finally:
+                self._release(discard=True)
+
+def write_batches(writer, batches):
+    """
+    Menulis serangkaian batch DataFrame melalui sebuah writer.
+
+    Args:
+        writer (object): CsvWriter, GoogleSheetsWriter, atau PostgresWriter
+        batches (iterable): DataFrame yang akan ditulis secara berurutan
+
+    Returns:
+        int: Total baris yang ditulis
+    """
+    try:
+        writer.open()
+        for batch in batches:
+            writer.write(batch)
+        writer.close()
+    except Exception:
+        writer.abort()
+        raise
+    return writer.rows
 
 def load_to_csv(dataframe, filename):
     """
@@ -13,134 +774,146 @@ def load_to_csv(dataframe, filename):
     Args:
         dataframe (pd.DataFrame): Data yang akan disimpan
         filename (str): Nama file CSV
+        
+    Returns:
+        bool: True jika data berhasil disimpan
     """
     try:
-        dataframe.to_csv(filename, index=False)
+        write_batches(CsvWriter(filename), [dataframe])
         print(f"Data berhasil disimpan ke {filename}")
         print(f"Total baris yang disimpan: {len(dataframe)}")
+        return True
     except FileNotFoundError as e:
         print(f"Error: File tidak dapat dibuat - {e}")
     except Exception as e:
         print(f"Error saat menyimpan ke CSV: {e}")
+    return False
+
+def load_to_columnar(dataframe, filename, format=None, compression='default'):
+    """
+    Menyimpan DataFrame ke file Parquet atau Feather dengan tipe kolom terjaga.
+    
+    Args:
+        dataframe (pd.DataFrame): Data yang akan disimpan
+        filename (str): Nama file; format ditentukan dari ekstensinya
+            (.parquet/.pq atau .feather/.arrow/.ipc) jika `format` kosong
+        format (str): 'parquet' atau 'feather'
+        compression (str): Kompresi; 'default' memakai default format
+        
+    Returns:
+        bool: True jika data berhasil disimpan
+    """
+    try:
+        write_batches(ColumnarWriter(filename, format=format, compression=compression), [dataframe])
+        print(f"Data berhasil disimpan ke {filename}")
+        print(f"Total baris yang disimpan: {len(dataframe)}")
+        return True
+    except ImportError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        print(f"Error saat menyimpan ke file kolumnar: {e}")
+    return False
 
-def load_to_google_sheets(dataframe):
+def load_to_google_sheets(dataframe, mode='rewrite'):
     """
     Menyimpan DataFrame ke Google Sheets.
     
     Args:
         dataframe (pd.DataFrame): Data yang akan disimpan
+        mode (str): 'rewrite' untuk menulis ulang sheet, atau 'sync' untuk
+            mengirim sel yang berubah saja
+        
+    Returns:
+        bool: True jika data berhasil disimpan
     """
     try:
         # Path ke file kredensial Google Sheets API
-        credentials_path = 'google-sheets-api.json'
-        
-        if not os.path.exists(credentials_path):
-            print(f"File kredensial {credentials_path} tidak ditemukan.")
+        if not os.path.exists(CREDENTIALS_PATH):
+            print(f"File kredensial {CREDENTIALS_PATH} tidak ditemukan.")
             print("Silakan buat service account di Google Cloud Console dan download kredensialnya.")
-            return
+            return False
         
-        # Setup kredensial dan akses Google Sheets
-        scope = ['https://spreadsheets.google.com/feeds',
-                'https://www.googleapis.com/auth/drive']
+        writer = GoogleSheetsWriter(mode=mode)
+        write_batches(writer, [dataframe])
         
-        credentials = Credentials.from_service_account_file(credentials_path, scopes=scope)
-        gc = gspread.authorize(credentials)
-        
-        # Buka atau buat spreadsheet
-        try:
-            # Coba buka spreadsheet yang sudah ada
-            spreadsheet = gc.open("Fashion Studio ETL Data")
-        except gspread.SpreadsheetNotFound:
-            # Jika tidak ada, buat spreadsheet baru
-            spreadsheet = gc.create("Fashion Studio ETL Data")
-            # Bagikan dengan akses edit untuk siapa saja dengan link
-            spreadsheet.share('', perm_type='anyone', role='writer')
-        
-        # Pilih worksheet pertama
-        worksheet = spreadsheet.sheet1
-        
-        # Hapus data lama dan tulis data baru
-        worksheet.clear()
-        
-        # Tulis header
-        headers = dataframe.columns.tolist()
-        worksheet.append_row(headers)
-        
-        # Tulis data
-        data_rows = dataframe.values.tolist()
-        for row in data_rows:
-            # Konversi semua nilai ke string untuk menghindari error
-            str_row = [str(cell) for cell in row]
-            worksheet.append_row(str_row)
-        
-        print(f"Data berhasil disimpan ke Google Sheets: {spreadsheet.url}")
+        print(f"Data berhasil disimpan ke Google Sheets: {writer.spreadsheet.url}")
         print(f"Total baris yang disimpan: {len(dataframe)}")
+        if writer.changes:
+            print(f"Perubahan: {writer.changes}")
+        return True
         
     except FileNotFoundError as e:
         print(f"Error: File kredensial tidak ditemukan - {e}")
     except Exception as e:
         print(f"Error saat menyimpan ke Google Sheets: {e}")
+    return False
 
-def load_to_postgresql(dataframe, table_name):
+def load_to_postgresql(dataframe, table_name, method='copy', strategy='delete', missing='delete'):
     """
     Menyimpan DataFrame ke database PostgreSQL.
     
     Args:
         dataframe (pd.DataFrame): Data yang akan disimpan
         table_name (str): Nama tabel di database
+        method (str): 'copy' untuk bulk load via COPY FROM STDIN, atau
+            'values' untuk insert dengan execute_values
+        strategy (str): 'delete' untuk DELETE lalu INSERT, 'swap' untuk
+            memuat ke tabel sementara lalu mengganti isi tabel dengan
+            TRUNCATE dan INSERT ... SELECT dalam satu transaksi, atau
+            'upsert' untuk hanya menulis produk baru/berubah
+        missing (str): Pada strategi upsert, 'delete' atau 'flag' untuk
+            produk yang tidak muncul lagi
+            
+    Returns:
+        bool: True jika data berhasil disimpan
     """
     try:
-        # Konfigurasi koneksi PostgreSQL
-        # Dalam implementasi nyata, gunakan environment variables untuk keamanan
-        db_config = {
-            'host': 'localhost',
-            'database': 'fashion_studio',
-            'user': 'postgres',
-            'password': 'password',
-            'port': '5432'
-        }
-        
-        # Koneksi ke database
-        conn = psycopg2.connect(**db_config)
-        cursor = conn.cursor()
-        
-        # Buat tabel jika belum ada
-        create_table_query = f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            id SERIAL PRIMARY KEY,
-            title VARCHAR(255),
-            price FLOAT,
-            rating FLOAT,
-            colors INTEGER,
-            size VARCHAR(50),
-            gender VARCHAR(20),
-            timestamp VARCHAR(50)
-        );
-        """
-        cursor.execute(create_table_query)
-        
-        # Hapus data lama
-        cursor.execute(f"DELETE FROM {table_name}")
-        
-        # Insert data baru
-        columns = ['title', 'price', 'rating', 'colors', 'size', 'gender', 'timestamp']
-        values = [tuple(row) for row in dataframe[['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'Timestamp']].values]
-        
-        insert_query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES %s"
-        execute_values(cursor, insert_query, values)
-        
-        # Commit perubahan
-        conn.commit()
+        writer = PostgresWriter(table_name, method=method, strategy=strategy, missing=missing)
+        write_batches(writer, [dataframe])
         
         print(f"Data berhasil disimpan ke PostgreSQL tabel '{table_name}'")
         print(f"Total baris yang disimpan: {len(dataframe)}")
-        
-        # Tutup koneksi
-        cursor.close()
-        conn.close()
+        if writer.changes:
+            print(f"Perubahan inkremental: {writer.changes}")
+        return True
         
     except psycopg2.Error as e:
         print(f"Error koneksi PostgreSQL: {e}")
         print("Pastikan PostgreSQL berjalan dan konfigurasi koneksi benar.")
     except Exception as e:
-        print(f"Error saat menyimpan ke PostgreSQL: {e}")
\ No newline at end of file
+        print(f"Error saat menyimpan ke PostgreSQL: {e}")
+    return False
+
+def run_loaders(dataframe, loaders, max_workers=None):
+    """
+    Menjalankan beberapa loader secara paralel pada DataFrame yang sama.
+    
+    Setiap loader berjalan di thread terpisah, sehingga waktu tahap pemuatan
+    mengikuti loader paling lambat, bukan jumlah waktu semua loader.
+    
+    Args:
+        dataframe (pd.DataFrame): Data bersih yang akan dimuat
+        loaders (list): Pasangan (nama, fungsi) dengan fungsi menerima
+            DataFrame dan mengembalikan True jika berhasil
+        max_workers (int): Jumlah thread; default satu thread per loader
+        
+    Returns:
+        list: Hasil per loader berisi 'name', 'success', 'seconds', dan
+        'error', sesuai urutan `loaders`
+    """
+    def run(name, loader):
+        start = time.perf_counter()
+        error = None
+        try:
+            success = loader(dataframe) is not False
+        except Exception as e:
+            success = False
+            error = str(e)
+        return {'name': name, 'success': success,
+                'seconds': time.perf_counter() - start, 'error': error}
+    
+    if not loaders:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers or len(loaders)) as executor:
+        futures = [executor.submit(run, name, loader) for name, loader in loaders]
+        return [future.result() for future in futures]
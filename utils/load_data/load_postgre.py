@@ -1,6 +1,7 @@
 import psycopg2
 import pandas as pd
 import logging
+from utils.load import copy_dataframe
 
 logging.basicConfig(level=logging.INFO)
 
@@ -12,13 +13,17 @@ DB_CONFIG = {
     "port": "[PSQL_PORT]"
 }
 
-def load_to_postgres(df, table_name="products"):
+COLUMNS = ["title", "price", "rating", "colors", "size", "gender", "timestamp"]
+
+def load_to_postgres(df, table_name="products", method="copy"):
     """
     Menyimpan dataframe ke PostgreSQL
 
     Parameters:
     df (pd.DataFrame): Data yang akan dimasukkan
     table_name (str): Nama tabel tujuan (default: "products")
+    method (str): "copy" untuk bulk load via COPY FROM STDIN (default),
+        atau "rows" untuk INSERT per baris
 
     Returns:
     None
@@ -45,12 +50,15 @@ def load_to_postgres(df, table_name="products"):
         """
         cur.execute(create_table_query)
 
-        for _, row in df.iterrows():
-            insert_query = f"""
-            INSERT INTO {table_name} (title, price, rating, colors, size, gender, timestamp)
-            VALUES (%s, %s, %s, %s, %s, %s, %s);
-            """
-            cur.execute(insert_query, tuple(row))
+        if method == "copy":
+            copy_dataframe(cur, df, table_name, COLUMNS)
+        else:
+            for _, row in df.iterrows():
+                insert_query = f"""
+                INSERT INTO {table_name} ({', '.join(COLUMNS)})
+                VALUES (%s, %s, %s, %s, %s, %s, %s);
+                """
+                cur.execute(insert_query, tuple(row))
 
         conn.commit()
         cur.close()
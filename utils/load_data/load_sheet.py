@@ -2,12 +2,21 @@ import pandas as pd
 import logging
 from googleapiclient.discovery import build
 from google.oauth2 import service_account
+from utils.sheets_sync import plan_sync, delete_rows_requests
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 SPREADSHEET_ID = "19vweQTnSLL-9Qy52-YH0OZOJlevBm0uBqRRSpRS8dl8"
 SHEET_NAME = "Sheet1"
+KEY_COLUMNS = ["Title", "Size", "Gender", "Colors"]
+IGNORE_COLUMNS = ["Timestamp"]
+
+def _sheets_service():
+    creds = service_account.Credentials.from_service_account_file(
+        "google-sheets-api.json", scopes=["https://www.googleapis.com/auth/spreadsheets"]
+    )
+    return build("sheets", "v4", credentials=creds).spreadsheets()
 
 def load_to_google_sheets(df: pd.DataFrame):
     """
@@ -24,11 +33,7 @@ def load_to_google_sheets(df: pd.DataFrame):
         return
     
     try:
-        creds = service_account.Credentials.from_service_account_file(
-            "google-sheets-api.json", scopes=["https://www.googleapis.com/auth/spreadsheets"]
-        )
-        service = build("sheets", "v4", credentials=creds)
-        sheet = service.spreadsheets()
+        sheet = _sheets_service()
 
         values = [df.columns.tolist()] + df.values.tolist()
 
@@ -45,4 +50,87 @@ def load_to_google_sheets(df: pd.DataFrame):
 
     except Exception as e:
         logger.error(f"Error saat mengupload ke Google Sheets: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def sync_to_google_sheets(df: pd.DataFrame, key_columns=KEY_COLUMNS, ignore_columns=IGNORE_COLUMNS):
+    """
+    Sinkronisasi dataframe ke Google Sheets dengan mengirim sel yang berubah saja
+
+    Isi sheet dibaca sekali dan dibandingkan per baris berdasarkan key_columns.
+    Sel yang berubah dikirim dalam satu values.batchUpdate, baris baru
+    ditambahkan dengan values.append, dan baris yang hilang dihapus dalam satu
+    spreadsheets.batchUpdate. Jika header berbeda, sheet ditulis ulang penuh.
+
+    Parameters:
+    df (pd.DataFrame): Data yang akan disinkronkan
+    key_columns (list): Kolom yang membentuk kunci baris
+    ignore_columns (list): Kolom yang tidak dibandingkan
+
+    Returns:
+    dict | None: Ringkasan perubahan jika berhasil, None jika terjadi kesalahan.
+    """
+    if df.empty:
+        logger.warning("Tidak terdapat data untuk disinkronkan ke Google Sheets.")
+        return
+
+    try:
+        sheet = _sheets_service()
+        header = df.columns.tolist()
+        rows = [[str(cell) for cell in row] for row in df.values.tolist()]
+
+        current = sheet.values().get(
+            spreadsheetId=SPREADSHEET_ID, range=SHEET_NAME
+        ).execute().get("values", [])
+        plan = plan_sync(current, header, rows, key_columns, ignore_columns)
+
+        if plan["rewrite"]:
+            logger.info("Header sheet berbeda, sheet ditulis ulang.")
+            sheet.values().clear(spreadsheetId=SPREADSHEET_ID, range=SHEET_NAME).execute()
+            sheet.values().update(
+                spreadsheetId=SPREADSHEET_ID,
+                range=SHEET_NAME,
+                valueInputOption="RAW",
+                body={"values": [header] + rows}
+            ).execute()
+            return {"inserted": len(rows), "updated": 0, "deleted": 0, "unchanged": 0, "cells": 0}
+
+        # Nomor baris pada update mengacu ke sheet sebelum baris dihapus
+        if plan["updates"]:
+            data = [{"range": f"{SHEET_NAME}!{update['range']}", "values": update["values"]}
+                    for update in plan["updates"]]
+            sheet.values().batchUpdate(
+                spreadsheetId=SPREADSHEET_ID,
+                body={"valueInputOption": "RAW", "data": data}
+            ).execute()
+
+        if plan["deletes"]:
+            metadata = sheet.get(spreadsheetId=SPREADSHEET_ID, fields="sheets.properties").execute()
+            sheet_id = next(s["properties"]["sheetId"] for s in metadata["sheets"]
+                            if s["properties"]["title"] == SHEET_NAME)
+            sheet.batchUpdate(
+                spreadsheetId=SPREADSHEET_ID,
+                body={"requests": delete_rows_requests(sheet_id, plan["deletes"])}
+            ).execute()
+
+        if plan["appends"]:
+            sheet.values().append(
+                spreadsheetId=SPREADSHEET_ID,
+                range=SHEET_NAME,
+                valueInputOption="RAW",
+                insertDataOption="INSERT_ROWS",
+                body={"values": plan["appends"]}
+            ).execute()
+
+        changes = {
+            "inserted": len(plan["appends"]),
+            "updated": plan["updated"],
+            "deleted": sum(end - start + 1 for start, end in plan["deletes"]),
+            "unchanged": plan["unchanged"],
+            "cells": plan["cells"],
+        }
+        logger.info(f"\nData berhasil disinkronkan ke Google Sheets: {changes}")
+        return changes
+
+    except Exception as e:
+        logger.error(f"Error saat sinkronisasi ke Google Sheets: {e}")
+        return None
@@ -0,0 +1,270 @@
+import json
+import os
+import sys
+import threading
+import time
+
+# resource hanya tersedia di Unix; di platform lain puncak RSS tidak dicatat
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Prefix nama metrik pada format Prometheus textfile
+PROMETHEUS_PREFIX = 'etl'
+
+def process_max_rss_bytes():
+    """
+    Mengambil puncak resident set size proses sejak dimulai (high-water
+    mark `ru_maxrss`). Nilainya tidak pernah turun, sehingga bukan memori
+    yang dipakai satu tahap saja.
+
+    Returns:
+        int | None: Puncak RSS proses dalam byte, None jika tidak didukung platform
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KiB, macOS melaporkan byte
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class StageRecord:
+    """
+    Hasil pengukuran satu tahap: waktu wall, waktu CPU, jumlah baris, dan
+    puncak RSS proses saat tahap selesai. `labels` membedakan pengukuran
+    dengan nama yang sama, misalnya nomor halaman.
+    """
+
+    __slots__ = ('name', 'labels', 'wall_seconds', 'cpu_seconds', 'process_max_rss_bytes', 'rows')
+
+    def __init__(self, name, labels=None):
+        self.name = name
+        self.labels = labels or {}
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.process_max_rss_bytes = None
+        self.rows = None
+
+    def add_rows(self, count):
+        self.rows = (self.rows or 0) + count
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'labels': dict(self.labels),
+            'wall_seconds': self.wall_seconds,
+            'cpu_seconds': self.cpu_seconds,
+            'process_max_rss_bytes': self.process_max_rss_bytes,
+            'rows': self.rows,
+        }
+
+class _NoopRecord:
+    """Record pengganti saat instrumentasi nonaktif; semua operasi diabaikan."""
+
+    __slots__ = ()
+
+    def add_rows(self, count):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NOOP = _NoopRecord()
+
+class _Stage:
+    def __init__(self, collector, name, per_thread, labels):
+        self.collector = collector
+        self.record = StageRecord(name, labels)
+        self.cpu_clock = time.thread_time if per_thread else time.process_time
+
+    def __enter__(self):
+        self._wall = time.perf_counter()
+        self._cpu = self.cpu_clock()
+        return self.record
+
+    def __exit__(self, *exc_info):
+        self.record.wall_seconds = time.perf_counter() - self._wall
+        self.record.cpu_seconds = self.cpu_clock() - self._cpu
+        self.record.process_max_rss_bytes = process_max_rss_bytes()
+        self.collector.add(self.record)
+        return False
+
+class Collector:
+    """
+    Penampung hasil pengukuran yang aman dipakai banyak thread, beserta
+    exporter JSON dan Prometheus textfile.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def stage(self, name, per_thread=False, **labels):
+        """
+        Context manager yang mengukur satu tahap.
+
+        Args:
+            name (str): Nama tahap, misalnya 'extract' atau 'extract.page'
+            per_thread (bool): Ukur waktu CPU thread saat ini saja; pakai
+                untuk pekerjaan di dalam thread pool
+            **labels: Label tambahan, misalnya `page=3`
+
+        Returns:
+            context manager: Menghasilkan StageRecord untuk mencatat baris
+        """
+        return _Stage(self, name, per_thread, labels)
+
+    def summary(self):
+        """
+        Menggabungkan record per nama tahap.
+
+        Returns:
+            list: Dictionary per tahap berisi jumlah pengukuran, total waktu
+            wall dan CPU, puncak RSS proses tertinggi, dan total baris, sesuai urutan
+            kemunculan pertama
+        """
+        with self._lock:
+            records = list(self.records)
+
+        stages = {}
+        for record in records:
+            entry = stages.setdefault(record.name, {
+                'name': record.name, 'count': 0, 'wall_seconds': 0.0,
+                'cpu_seconds': 0.0, 'process_max_rss_bytes': None, 'rows': None,
+            })
+            entry['count'] += 1
+            entry['wall_seconds'] += record.wall_seconds
+            entry['cpu_seconds'] += record.cpu_seconds
+            rss = record.process_max_rss_bytes
+            if rss is not None:
+                entry['process_max_rss_bytes'] = max(entry['process_max_rss_bytes'] or 0, rss)
+            if record.rows is not None:
+                entry['rows'] = (entry['rows'] or 0) + record.rows
+        return list(stages.values())
+
+    def to_dict(self):
+        with self._lock:
+            records = [record.to_dict() for record in self.records]
+        return {'stages': self.summary(), 'records': records}
+
+    def export_json(self, path):
+        """
+        Menyimpan ringkasan dan seluruh record ke file JSON.
+
+        Args:
+            path (str): Lokasi file JSON
+        """
+        _write_atomic(path, json.dumps(self.to_dict(), indent=2))
+
+    def to_prometheus(self):
+        """
+        Membuat teks format Prometheus exposition dari ringkasan per tahap.
+
+        Record per halaman digabung per nama tahap agar jumlah series tetap
+        kecil; rinciannya tersedia di export JSON. Puncak RSS adalah
+        high-water mark seluruh proses, sehingga diekspor sekali tanpa
+        label tahap.
+
+        Returns:
+            str: Teks metrik untuk textfile collector node_exporter
+        """
+        metrics = [
+            ('stage_runs', 'count', 'Jumlah pengukuran per tahap'),
+            ('stage_wall_seconds', 'wall_seconds', 'Total waktu wall per tahap'),
+            ('stage_cpu_seconds', 'cpu_seconds', 'Total waktu CPU per tahap'),
+            ('stage_rows', 'rows', 'Jumlah baris yang diproses per tahap'),
+        ]
+        stages = self.summary()
+        lines = []
+        for metric, key, help_text in metrics:
+            name = f"{PROMETHEUS_PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for entry in stages:
+                if entry[key] is not None:
+                    lines.append(f'{name}{{stage="{entry["name"]}"}} {entry[key]}')
+
+        peaks = [entry['process_max_rss_bytes'] for entry in stages
+                 if entry['process_max_rss_bytes'] is not None]
+        if peaks:
+            name = f"{PROMETHEUS_PREFIX}_process_max_rss_bytes"
+            lines.append(f"# HELP {name} Puncak RSS proses sejak dimulai (high-water mark)")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {max(peaks)}")
+        return '\n'.join(lines) + '\n'
+
+    def export_prometheus(self, path):
+        """
+        Menyimpan metrik ke file .prom untuk textfile collector.
+
+        Args:
+            path (str): Lokasi file .prom
+        """
+        _write_atomic(path, self.to_prometheus())
+
+    def export(self, path):
+        """Menyimpan metrik; format Prometheus untuk ekstensi .prom, selain itu JSON."""
+        if path.endswith('.prom'):
+            self.export_prometheus(path)
+        else:
+            self.export_json(path)
+
+def _write_atomic(path, text):
+    # File sementara lalu rename agar collector tidak membaca file setengah jadi
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+# Collector aktif; None berarti instrumentasi nonaktif
+_collector = None
+
+def enable(collector=None):
+    """
+    Mengaktifkan instrumentasi global.
+
+    Args:
+        collector (Collector): Collector yang dipakai; default collector baru
+
+    Returns:
+        Collector: Collector yang aktif
+    """
+    global _collector
+    _collector = collector or Collector()
+    return _collector
+
+def disable():
+    """Menonaktifkan instrumentasi global."""
+    global _collector
+    _collector = None
+
+def get_collector():
+    """Mengembalikan collector aktif, atau None jika nonaktif."""
+    return _collector
+
+def stage(name, per_thread=False, **labels):
+    """
+    Mengukur satu tahap pada collector aktif.
+
+    Jika instrumentasi nonaktif, yang dikembalikan adalah objek no-op
+    bersama tanpa membaca jam atau memori sama sekali.
+
+    Args:
+        name (str): Nama tahap
+        per_thread (bool): Ukur waktu CPU thread saat ini saja
+        **labels: Label tambahan, misalnya `page=3`
+
+    Returns:
+        context manager: Menghasilkan StageRecord (atau no-op) untuk `add_rows`
+    """
+    collector = _collector
+    if collector is None:
+        return NOOP
+    return collector.stage(name, per_thread=per_thread, **labels)
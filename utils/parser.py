@@ -0,0 +1,212 @@
+from bs4 import BeautifulSoup
+
+# Backend parser opsional, dipakai hanya jika terpasang
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Urutan prioritas backend jika tidak dipilih secara eksplisit
+BACKEND_PRIORITY = ['selectolax', 'lxml', 'html.parser']
+
+def _clean_rating(text):
+    return text.split('/')[0].replace('Rating:', '').strip()
+
+def _clean_colors(text):
+    return text.replace('Colors', '').strip()
+
+def _clean_size(text):
+    return text.replace('Size:', '').strip()
+
+def _clean_gender(text):
+    return text.replace('Gender:', '').strip()
+
+# Kolom yang diambil dari elemen <p>: (kolom, kata kunci, pembersih, nilai default)
+PARAGRAPH_FIELDS = [
+    ('Rating', 'Rating', _clean_rating, 'Invalid'),
+    ('Colors', 'Colors', _clean_colors, 'N/A'),
+    ('Size', 'Size:', _clean_size, 'N/A'),
+    ('Gender', 'Gender:', _clean_gender, 'N/A'),
+]
+
+class SoupBackend:
+    """Backend BeautifulSoup dengan `html.parser` bawaan Python."""
+
+    name = 'html.parser'
+
+    def cards(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        return soup.find_all('div', class_='collection-card')
+
+    def title(self, card):
+        element = card.find('h3', class_='product-title')
+        return element.text if element else None
+
+    def price(self, card):
+        element = card.find('span', class_='price')
+        return element.text if element else None
+
+    def paragraphs(self, card):
+        for p in card.find_all('p'):
+            yield p.string, p.text
+
+class LxmlBackend:
+    """Backend lxml (parser C berbasis libxml2)."""
+
+    name = 'lxml'
+
+    @staticmethod
+    def _class_xpath(tag, class_name):
+        return f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+    def cards(self, html):
+        if not html.strip():
+            return []
+        root = lxml.html.fromstring(html)
+        return root.xpath(self._class_xpath('div', 'collection-card'))
+
+    def _first_text(self, card, tag, class_name):
+        elements = card.xpath(self._class_xpath(tag, class_name))
+        return elements[0].text_content() if elements else None
+
+    def title(self, card):
+        return self._first_text(card, 'h3', 'product-title')
+
+    def price(self, card):
+        return self._first_text(card, 'span', 'price')
+
+    def _single_string(self, element):
+        # Meniru perilaku `Tag.string` milik BeautifulSoup
+        children = list(element)
+        if not children:
+            return element.text
+        if len(children) > 1 or element.text or children[0].tail:
+            return None
+        child = children[0]
+        if not isinstance(child.tag, str):
+            # Komentar dianggap sebagai string oleh BeautifulSoup
+            return child.text
+        return self._single_string(child)
+
+    def paragraphs(self, card):
+        for p in card.iter('p'):
+            yield self._single_string(p), p.text_content()
+
+class SelectolaxBackend:
+    """Backend selectolax (parser C lexbor)."""
+
+    name = 'selectolax'
+
+    def cards(self, html):
+        return LexborHTMLParser(html).css('div.collection-card')
+
+    def _first_text(self, card, selector):
+        element = card.css_first(selector)
+        return element.text(deep=True) if element is not None else None
+
+    def title(self, card):
+        return self._first_text(card, 'h3.product-title')
+
+    def price(self, card):
+        return self._first_text(card, 'span.price')
+
+    def _single_string(self, node):
+        # Meniru perilaku `Tag.string` milik BeautifulSoup
+        children = list(node.iter(include_text=True))
+        if len(children) != 1:
+            return None
+        child = children[0]
+        if child.tag == '-text':
+            return child.text_content
+        if child.tag.startswith('-'):
+            return None
+        return self._single_string(child)
+
+    def paragraphs(self, card):
+        for p in card.css('p'):
+            yield self._single_string(p), p.text(deep=True)
+
+BACKENDS = {
+    'selectolax': SelectolaxBackend,
+    'lxml': LxmlBackend,
+    'html.parser': SoupBackend,
+}
+
+def available_backends():
+    """
+    Mengembalikan daftar backend parser yang terpasang.
+
+    Returns:
+        list: Nama backend sesuai urutan prioritas
+    """
+    installed = {
+        'selectolax': LexborHTMLParser is not None,
+        'lxml': lxml is not None,
+        'html.parser': True,
+    }
+    return [name for name in BACKEND_PRIORITY if installed[name]]
+
+def get_parser(name=None):
+    """
+    Memilih backend parser HTML.
+
+    Args:
+        name (str): 'selectolax', 'lxml', atau 'html.parser'; jika None,
+            dipilih backend tercepat yang terpasang
+
+    Returns:
+        object: Instance backend parser
+    """
+    if name is None:
+        name = available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Backend parser tidak dikenal: {name}")
+    if name not in available_backends():
+        raise ImportError(f"Backend parser '{name}' tidak terpasang")
+    return BACKENDS[name]()
+
+def extract_card(parser, card):
+    """
+    Mengekstrak seluruh kolom dari satu kartu produk.
+
+    Semua elemen <p> di dalam kartu hanya dibaca satu kali; setiap kolom
+    diisi oleh <p> pertama yang teksnya mengandung kata kunci kolom tersebut.
+
+    Args:
+        parser (object): Backend parser dari `get_parser`
+        card (object): Node kartu produk dari `parser.cards`
+
+    Returns:
+        dict: Title, Price, Rating, Colors, Size, dan Gender
+    """
+    title = parser.title(card)
+    price = parser.price(card)
+
+    fields = {
+        "Title": title.strip() if title is not None else 'Unknown Product',
+        "Price": price.strip().replace('$', '') if price is not None else 'N/A',
+    }
+
+    pending = list(PARAGRAPH_FIELDS)
+    for string, text in parser.paragraphs(card):
+        if not pending:
+            break
+        if not string:
+            continue
+        for field in list(pending):
+            column, keyword, clean, _ = field
+            if keyword in string:
+                fields[column] = clean(text)
+                pending.remove(field)
+
+    for column, _, _, default in pending:
+        fields[column] = default
+
+    # Pertahankan urutan kolom seperti hasil scraping sebelumnya
+    return {column: fields[column] for column in
+            ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']}
@@ -0,0 +1,82 @@
+import threading
+import time
+
+# Budget default: rata-rata request per detik dan jumlah burst yang diizinkan
+REQUESTS_PER_SECOND = 5.0
+BURST = 10
+
+# Status code yang menandakan server kewalahan
+THROTTLE_STATUS_CODES = {429, 503}
+
+class RateLimiter:
+    """
+    Token bucket adaptif untuk membatasi laju request ke server.
+
+    Bucket diisi `rate` token per detik hingga maksimal `burst` token, dan
+    setiap request mengambil satu token. Laju efektif diturunkan secara
+    multiplikatif saat server membalas 429/503 atau latensi melewati
+    `latency_threshold`, lalu dinaikkan kembali sedikit demi sedikit
+    setelah response normal (AIMD). Aman dipakai bersama oleh banyak thread.
+    """
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=BURST, min_rate=None,
+                 latency_threshold=2.0, backoff_ratio=0.5, recovery_step=None):
+        if rate <= 0:
+            raise ValueError("rate harus lebih besar dari 0")
+        if burst < 1:
+            raise ValueError("burst minimal 1")
+
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else self.max_rate / 10
+        self.latency_threshold = latency_threshold
+        self.backoff_ratio = backoff_ratio
+        self.recovery_step = recovery_step if recovery_step is not None else self.max_rate / 10
+
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def acquire(self):
+        """
+        Menunggu hingga tersedia satu token lalu mengambilnya.
+
+        Returns:
+            float: Total waktu tunggu dalam detik
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def record(self, latency, status_code=None):
+        """
+        Menyesuaikan laju berdasarkan hasil sebuah request.
+
+        Args:
+            latency (float): Waktu respons request dalam detik
+            status_code (int): Status code response, None jika request gagal
+        """
+        with self._lock:
+            self._refill()
+            if status_code in THROTTLE_STATUS_CODES:
+                self.rate = max(self.min_rate, self.rate * self.backoff_ratio)
+                # Kosongkan bucket agar burst berikutnya tidak langsung dikirim
+                self._tokens = min(self._tokens, 0.0)
+            elif status_code is None or latency > self.latency_threshold:
+                self.rate = max(self.min_rate, self.rate * (1 + self.backoff_ratio) / 2)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.recovery_step)
@@ -0,0 +1,92 @@
+import os
+from utils.lazy import lazy_import
+from utils.cache import PageCache
+from utils.checkpoint import PageCheckpoint, MAX_AGE
+from utils.extract import create_scrape_session
+from utils.load import (GoogleSheetsWriter, PostgresWriter, authorize_sheets, CREDENTIALS_PATH,
+                        DB_CONFIG, SHEETS_CHUNK_SIZE)
+from utils.sinks import register_sink, POSTGRES_BATCH_SIZE
+
+psycopg2 = lazy_import('psycopg2')
+pg_pool = lazy_import('psycopg2.pool')
+
+# Jumlah maksimum koneksi PostgreSQL yang disimpan di pool
+POSTGRES_POOL_SIZE = 4
+
+class PipelineResources:
+    """
+    Sumber daya yang dipakai ulang antar run pipeline: session HTTP
+    (keep-alive dan rate limiter), cache halaman, checkpoint ekstraksi,
+    klien Google Sheets beserta token OAuth-nya, dan pool koneksi
+    PostgreSQL.
+
+    Klien Sheets dan pool PostgreSQL dibuat saat pertama dibutuhkan. Jika
+    pembuatannya gagal, None dikembalikan agar writer membuat koneksinya
+    sendiri dan error-nya dilaporkan sebagai kegagalan sink; pembuatan
+    dicoba lagi pada run berikutnya.
+    """
+
+    def __init__(self, checkpoint_max_age=MAX_AGE, credentials_path=CREDENTIALS_PATH,
+                 db_config=None, pool_size=POSTGRES_POOL_SIZE):
+        self.session = create_scrape_session()
+        self.cache = PageCache()
+        self.checkpoint = PageCheckpoint(max_age=checkpoint_max_age)
+        self.credentials_path = credentials_path
+        self.db_config = db_config or DB_CONFIG
+        self.pool_size = pool_size
+        self._sheets_client = None
+        self._postgres_pool = None
+
+    def sheets_client(self):
+        """
+        Mengambil klien Google Sheets, mengotorisasi hanya sekali.
+
+        Returns:
+            gspread.Client | None: Klien, atau None jika otorisasi gagal
+        """
+        if self._sheets_client is None and os.path.exists(self.credentials_path):
+            try:
+                self._sheets_client = authorize_sheets(self.credentials_path)
+            except Exception as e:
+                print(f"Otorisasi Google Sheets gagal: {e}")
+        return self._sheets_client
+
+    def postgres_pool(self):
+        """
+        Mengambil pool koneksi PostgreSQL, membuatnya hanya sekali.
+
+        Returns:
+            ThreadedConnectionPool | None: Pool, atau None jika koneksi gagal
+        """
+        if self._postgres_pool is None:
+            try:
+                self._postgres_pool = pg_pool.ThreadedConnectionPool(
+                    1, self.pool_size, **self.db_config)
+            except psycopg2.Error as e:
+                print(f"Pool koneksi PostgreSQL gagal dibuat: {e}")
+        return self._postgres_pool
+
+    def register_sinks(self):
+        """
+        Mendaftarkan ulang sink Google Sheets dan PostgreSQL agar memakai
+        klien dan pool bersama ini, bukan membuat koneksi baru setiap run.
+        """
+        register_sink('Google Sheets',
+                      lambda: GoogleSheetsWriter(client=self.sheets_client(),
+                                                 credentials_path=self.credentials_path,
+                                                 checkpoint=self.checkpoint),
+                      batch_size=SHEETS_CHUNK_SIZE)
+        register_sink('PostgreSQL',
+                      lambda: PostgresWriter('products', db_config=self.db_config,
+                                             pool=self.postgres_pool(), checkpoint=self.checkpoint),
+                      batch_size=POSTGRES_BATCH_SIZE)
+
+    def close(self):
+        """Menutup session, cache, checkpoint, dan seluruh koneksi di pool."""
+        self.session.close()
+        self.cache.close()
+        self.checkpoint.close()
+        if self._postgres_pool is not None:
+            self._postgres_pool.closeall()
+            self._postgres_pool = None
+        self._sheets_client = None
@@ -0,0 +1,256 @@
+import datetime
+import os
+import threading
+import time
+
+# fcntl hanya tersedia di Unix; di platform lain run hanya dicegah tumpang
+# tindih di dalam satu proses
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Lock file bersama agar run terjadwal tidak tumpang tindih antar proses
+LOCK_PATH = os.path.join('.cache', 'pipeline.lock')
+
+# Selang waktu maksimum satu kali tidur, agar permintaan berhenti cepat diproses
+POLL_INTERVAL = 1.0
+
+# Nama, nilai minimum, dan nilai maksimum lima field ekspresi cron
+CRON_FIELDS = (
+    ('menit', 0, 59),
+    ('jam', 0, 23),
+    ('tanggal', 1, 31),
+    ('bulan', 1, 12),
+    ('hari', 0, 7),
+)
+
+def parse_cron_field(text, name, low, high):
+    """
+    Mengurai satu field cron menjadi himpunan nilai.
+
+    Mendukung `*`, angka, rentang `a-b`, langkah `*/n` atau `a-b/n`, dan
+    daftar yang dipisahkan koma.
+
+    Args:
+        text (str): Isi field, misalnya '*/15' atau '1-5'
+        name (str): Nama field untuk pesan error
+        low (int): Nilai minimum field
+        high (int): Nilai maksimum field
+
+    Returns:
+        set: Nilai yang cocok dengan field
+    """
+    values = set()
+    for part in text.split(','):
+        base, _, step = part.partition('/')
+        try:
+            step = int(step) if step else 1
+            if base == '*':
+                start, end = low, high
+            elif '-' in base:
+                start, end = (int(value) for value in base.split('-', 1))
+            else:
+                start = end = int(base)
+                if step != 1:
+                    end = high
+        except ValueError:
+            raise ValueError(f"Field cron {name} tidak valid: {text}")
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Field cron {name} di luar rentang {low}-{high}: {text}")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronSchedule:
+    """
+    Jadwal dari ekspresi cron lima field (menit jam tanggal bulan hari)
+    menurut waktu lokal. Seperti cron, jika field tanggal dan hari
+    sama-sama dibatasi, waktu cocok bila salah satunya cocok. Hari 0 dan 7
+    sama-sama berarti Minggu.
+    """
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Ekspresi cron harus terdiri dari 5 field: {expression}")
+        self.expression = expression
+        (self.minutes, self.hours, self.days, self.months, weekdays) = (
+            parse_cron_field(text, *spec) for text, spec in zip(fields, CRON_FIELDS)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        # datetime: Senin = 0; cron: Minggu = 0
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, timestamp):
+        """
+        Menghitung waktu run berikutnya setelah `timestamp`.
+
+        Args:
+            timestamp (float): Waktu acuan (detik sejak epoch)
+
+        Returns:
+            float: Waktu run berikutnya (detik sejak epoch)
+        """
+        moment = datetime.datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0)
+        moment += datetime.timedelta(minutes=1)
+        limit = moment.year + 5
+        while moment.year <= limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0)
+                          + datetime.timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + datetime.timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += datetime.timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError(f"Ekspresi cron tidak pernah cocok: {self.expression}")
+
+class IntervalSchedule:
+    """Jadwal dengan selang waktu tetap dalam detik."""
+
+    def __init__(self, seconds):
+        if seconds <= 0:
+            raise ValueError("Selang waktu harus lebih dari 0 detik")
+        self.seconds = seconds
+
+    def next_after(self, timestamp):
+        return timestamp + self.seconds
+
+class RunLock:
+    """
+    Lock non-blocking yang mencegah dua run berjalan bersamaan, baik di
+    dalam satu proses maupun antar proses (misalnya daemon dan run manual)
+    melalui `flock` pada lock file bersama.
+    """
+
+    def __init__(self, path=LOCK_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def acquire(self):
+        """
+        Mencoba mengambil lock tanpa menunggu.
+
+        Returns:
+            bool: True jika lock didapat, False jika run lain masih berjalan
+        """
+        if not self._lock.acquire(blocking=False):
+            return False
+        if fcntl is None or self.path is None:
+            return True
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a')
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._file.close()
+            self._file = None
+            self._lock.release()
+            return False
+        return True
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._lock.release()
+
+class Scheduler:
+    """
+    Menjalankan sebuah job berulang kali sesuai jadwal di dalam satu proses.
+
+    Run tidak pernah tumpang tindih: jika sebuah run melewati waktu jadwal
+    berikutnya, jadwal yang terlewat tidak dikejar dan run berikutnya
+    mengikuti jadwal setelah run selesai. Error pada job dicetak tanpa
+    menghentikan scheduler.
+    """
+
+    def __init__(self, job, schedule, lock=None):
+        self.job = job
+        self.schedule = schedule
+        self.lock = lock or RunLock()
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self._stopped = threading.Event()
+
+    def run_once(self):
+        """
+        Menjalankan job sekali jika tidak ada run lain yang sedang berjalan.
+
+        Returns:
+            bool: True jika job dijalankan tanpa error
+        """
+        if not self.lock.acquire():
+            print("⏭️ Run sebelumnya masih berjalan, run ini dilewati.")
+            self.skipped += 1
+            return False
+        try:
+            self.runs += 1
+            self.job()
+            return True
+        except Exception as e:
+            self.failures += 1
+            print(f"❌ Error saat menjalankan pipeline: {e}")
+            return False
+        finally:
+            self.lock.release()
+
+    def stop(self):
+        """Meminta scheduler berhenti setelah run yang sedang berjalan selesai."""
+        self._stopped.set()
+
+    def _wait_until(self, timestamp):
+        while not self._stopped.is_set():
+            remaining = timestamp - time.time()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, POLL_INTERVAL))
+
+    def run_forever(self, run_immediately=False, max_runs=None):
+        """
+        Menjalankan job sesuai jadwal hingga `stop` dipanggil.
+
+        Args:
+            run_immediately (bool): Jalankan job sekali saat mulai
+            max_runs (int): Batas jumlah run, opsional
+        """
+        next_run = time.time() if run_immediately else self.schedule.next_after(time.time())
+        attempts = 0
+        try:
+            while not self._stopped.is_set() and (max_runs is None or attempts < max_runs):
+                print(f"🕒 Run berikutnya: {datetime.datetime.fromtimestamp(next_run):%Y-%m-%d %H:%M:%S}")
+                self._wait_until(next_run)
+                if self._stopped.is_set():
+                    break
+                self.run_once()
+                attempts += 1
+
+                # Jadwal yang terlewat selama run berjalan tidak dikejar
+                following = self.schedule.next_after(next_run)
+                now = time.time()
+                if following <= now:
+                    self.skipped += 1
+                    print("⏭️ Run melewati jadwal berikutnya, jadwal yang terlewat dilewati.")
+                    following = self.schedule.next_after(now)
+                next_run = following
+        except KeyboardInterrupt:
+            print("\nScheduler dihentikan.")
+        finally:
+            self._stopped.set()
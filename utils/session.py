@@ -0,0 +1,144 @@
+import random
+import time
+import datetime
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Status code server yang layak dicoba ulang
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+TOO_MANY_REQUESTS = 429
+
+# Konfigurasi default untuk retry dan connection pool
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+MAX_BACKOFF = 30
+POOL_SIZE = 10
+
+def parse_retry_after(value):
+    """
+    Mengubah header Retry-After menjadi jumlah detik tunggu.
+
+    Args:
+        value (str): Nilai header, berupa jumlah detik atau tanggal HTTP
+
+    Returns:
+        float | None: Jumlah detik yang harus ditunggu, None jika tidak valid
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+class RetrySession(requests.Session):
+    """
+    Session HTTP dengan connection pooling, keep-alive, dan retry otomatis.
+
+    Setiap request dicoba ulang dengan jittered exponential backoff ketika
+    terjadi timeout, error koneksi, atau status 5xx. Untuk status 429,
+    header Retry-After dihormati bila tersedia.
+
+    Jika `rate_limiter` diberikan, setiap percobaan menunggu token terlebih
+    dahulu dan latensi serta status response dilaporkan kembali ke limiter.
+    """
+
+    def __init__(self, max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR,
+                 max_backoff=MAX_BACKOFF, pool_size=POOL_SIZE, rate_limiter=None):
+        super().__init__()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.rate_limiter = rate_limiter
+
+        # Adapter dengan pool koneksi yang dipakai ulang (keep-alive)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def backoff_delay(self, attempt):
+        """
+        Menghitung waktu tunggu dengan "full jitter" exponential backoff.
+
+        Args:
+            attempt (int): Nomor percobaan yang gagal, dimulai dari 0
+
+        Returns:
+            float: Jumlah detik yang harus ditunggu
+        """
+        ceiling = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def request(self, method, url, *args, **kwargs):
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            started_at = time.monotonic()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record(time.monotonic() - started_at)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                reason = type(e).__name__
+            else:
+                status = response.status_code
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record(time.monotonic() - started_at, status)
+                if attempt >= self.max_retries:
+                    return response
+                if status == TOO_MANY_REQUESTS:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if retry_after is None:
+                        delay = self.backoff_delay(attempt)
+                    else:
+                        delay = min(self.max_backoff, retry_after)
+                elif status in RETRY_STATUS_CODES:
+                    delay = self.backoff_delay(attempt)
+                else:
+                    return response
+                reason = f"status {status}"
+                # Kembalikan koneksi ke pool sebelum mencoba ulang
+                response.close()
+
+            attempt += 1
+            print(f"Mencoba ulang {url} ({reason}), percobaan {attempt}/{self.max_retries} "
+                  f"dalam {delay:.1f} detik...")
+            time.sleep(delay)
+
+def create_session(headers=None, max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR,
+                   pool_size=POOL_SIZE, rate_limiter=None):
+    """
+    Membuat session HTTP bersama untuk proses scraping.
+
+    Args:
+        headers (dict): Header default yang dikirim di setiap request
+        max_retries (int): Jumlah maksimum percobaan ulang per request
+        backoff_factor (float): Basis waktu tunggu exponential backoff (detik)
+        pool_size (int): Jumlah koneksi yang disimpan di pool per host
+        rate_limiter (RateLimiter): Pembatas laju request, opsional
+
+    Returns:
+        RetrySession: Session yang siap dipakai bersama oleh beberapa thread
+    """
+    session = RetrySession(max_retries=max_retries, backoff_factor=backoff_factor,
+                           pool_size=pool_size, rate_limiter=rate_limiter)
+    if headers:
+        session.headers.update(headers)
+    return session
@@ -0,0 +1,134 @@
+from collections import deque
+
+def column_letter(index):
+    """
+    Mengubah indeks kolom (mulai 0) menjadi huruf kolom A1.
+
+    Args:
+        index (int): Indeks kolom, 0 untuk kolom A
+
+    Returns:
+        str: Huruf kolom, misalnya 'A', 'Z', 'AA'
+    """
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+def _pad(values, width):
+    values = list(values[:width])
+    return values + [''] * (width - len(values))
+
+def _runs(indexes):
+    # Mengelompokkan indeks terurut menjadi rentang berurutan [awal, akhir]
+    runs = []
+    for index in indexes:
+        if runs and runs[-1][1] == index - 1:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+    return runs
+
+def plan_sync(current, header, rows, key_columns, ignore_columns=()):
+    """
+    Menyusun rencana sinkronisasi sel dari isi sheet saat ini ke data baru.
+
+    Baris dicocokkan berdasarkan kunci `key_columns`; kunci yang muncul
+    beberapa kali dicocokkan sesuai urutan kemunculan. Untuk baris yang
+    cocok, hanya sel yang berbeda yang dikirim, dikelompokkan per rentang
+    sel berurutan dalam satu baris. Perbedaan pada `ignore_columns`
+    (misalnya Timestamp yang berubah setiap run) saja tidak membuat baris
+    ditulis ulang, tetapi ikut ditulis jika baris tersebut memang berubah.
+    Baris baru ditambahkan di akhir sheet dan baris yang hilang dihapus,
+    sehingga urutan baris di sheet tidak selalu sama dengan urutan data.
+
+    Jika sheet kosong atau header-nya berbeda, rencana berisi
+    `rewrite=True` dan sheet perlu ditulis ulang seluruhnya.
+
+    Args:
+        current (list): Isi sheet saat ini termasuk baris header, sebagai
+            list baris berisi string
+        header (list): Nama kolom data baru
+        rows (list): Baris data baru sebagai list string
+        key_columns (list): Kolom yang membentuk kunci baris
+        ignore_columns (list): Kolom yang tidak dibandingkan
+
+    Returns:
+        dict: Rencana berisi `rewrite`, `updates` (list `{'range', 'values'}`
+        dengan notasi A1), `appends` (baris baru), `deletes` (rentang nomor
+        baris sheet `(awal, akhir)` inklusif, terurut menurun), serta jumlah
+        baris `updated`, `unchanged`, dan sel `cells` yang diubah
+    """
+    header = list(header)
+    width = len(header)
+    plan = {'rewrite': False, 'updates': [], 'appends': [], 'deletes': [],
+            'updated': 0, 'unchanged': 0, 'cells': 0}
+
+    current_header = list(current[0]) if current else []
+    while current_header and current_header[-1] == '':
+        current_header.pop()
+    if current_header != header:
+        plan['rewrite'] = True
+        return plan
+
+    key_indexes = [header.index(column) for column in key_columns]
+    compare_indexes = [i for i, column in enumerate(header) if column not in ignore_columns]
+
+    # Nomor baris sheet (1 = header) per kunci, sesuai urutan kemunculan
+    existing = {}
+    for row_number, values in enumerate(current[1:], start=2):
+        values = _pad(values, width)
+        key = tuple(values[i] for i in key_indexes)
+        existing.setdefault(key, deque()).append((row_number, values))
+
+    for row in rows:
+        row = _pad(row, width)
+        slots = existing.get(tuple(row[i] for i in key_indexes))
+        if not slots:
+            plan['appends'].append(row)
+            continue
+
+        row_number, old = slots.popleft()
+        if all(old[i] == row[i] for i in compare_indexes):
+            plan['unchanged'] += 1
+            continue
+
+        changed = [i for i in range(width) if old[i] != row[i]]
+        for start, end in _runs(changed):
+            cell_range = f"{column_letter(start)}{row_number}"
+            if end != start:
+                cell_range += f":{column_letter(end)}{row_number}"
+            plan['updates'].append({'range': cell_range, 'values': [row[start:end + 1]]})
+        plan['updated'] += 1
+        plan['cells'] += len(changed)
+
+    # Baris lama yang tidak cocok dengan data baru dihapus dari bawah ke atas
+    # agar nomor baris rentang berikutnya tidak bergeser
+    leftover = sorted(row_number for slots in existing.values() for row_number, _ in slots)
+    plan['deletes'] = [tuple(run) for run in reversed(_runs(leftover))]
+    return plan
+
+def delete_rows_requests(sheet_id, ranges):
+    """
+    Membuat request `deleteDimension` untuk `spreadsheets.batchUpdate`.
+
+    Args:
+        sheet_id (int): ID worksheet
+        ranges (list): Rentang nomor baris `(awal, akhir)` inklusif, terurut
+            menurun seperti pada `plan_sync`
+
+    Returns:
+        list: Request batchUpdate, satu per rentang
+    """
+    return [{
+        'deleteDimension': {
+            'range': {
+                'sheetId': sheet_id,
+                'dimension': 'ROWS',
+                'startIndex': start - 1,
+                'endIndex': end,
+            }
+        }
+    } for start, end in ranges]
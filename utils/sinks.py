@@ -0,0 +1,273 @@
+import time
+import pandas as pd
+from utils import metrics
+from utils.load import (CsvWriter, ColumnarWriter, GoogleSheetsWriter, PostgresWriter,
+                        SHEETS_CHUNK_SIZE, pa, run_loaders)
+from utils.snapshot import SnapshotWriter
+
+# Ukuran batch yang disukai PostgreSQL: satu COPY besar lebih efisien
+POSTGRES_BATCH_SIZE = 5000
+
+# Ukuran row group Parquet: batch kecil menghasilkan banyak row group kecil
+COLUMNAR_BATCH_SIZE = 10000
+
+# Pesan kegagalan sink jika tidak ada baris yang dialirkan
+NO_DATA_ERROR = "Tidak ada data untuk dimuat"
+
+# Registry sink: nama -> {'factory': pembuat writer, 'batch_size': int | None}
+SINK_REGISTRY = {}
+
+class Sink:
+    """
+    Pembungkus writer (CsvWriter, GoogleSheetsWriter, PostgresWriter, atau
+    objek lain dengan open/write/close/abort) dengan antarmuka
+    open/write_batch/close.
+
+    Batch yang masuk ditampung lalu diteruskan ke writer per `batch_size`
+    baris, sehingga setiap tujuan menerima ukuran batch yang paling efisien
+    baginya. Jika `batch_size` None, batch diteruskan apa adanya. Waktu yang
+    dihabiskan di dalam writer dicatat untuk menghitung baris per detik.
+    """
+
+    def __init__(self, name, writer, batch_size=None):
+        self.name = name
+        self.writer = writer
+        self.batch_size = batch_size
+        self.rows = 0
+        self.batches = 0
+        self.seconds = 0.0
+        self._pending = []
+        self._pending_rows = 0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def _send(self, dataframe):
+        self._timed(self.writer.write, dataframe)
+        self.rows += len(dataframe)
+        self.batches += 1
+
+    def _flush(self):
+        if not self._pending:
+            return
+        frames, self._pending, self._pending_rows = self._pending, [], 0
+        self._send(frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True))
+
+    def open(self):
+        self.rows = 0
+        self.batches = 0
+        self.seconds = 0.0
+        self._pending = []
+        self._pending_rows = 0
+        self._timed(self.writer.open)
+
+    def write_batch(self, dataframe):
+        """
+        Menerima satu batch dan meneruskannya ke writer per `batch_size` baris.
+
+        Args:
+            dataframe (pd.DataFrame): Batch data bersih
+        """
+        if self.batch_size is None:
+            if len(dataframe):
+                self._send(dataframe)
+            return
+
+        start = 0
+        while start < len(dataframe):
+            take = min(self.batch_size - self._pending_rows, len(dataframe) - start)
+            self._pending.append(dataframe.iloc[start:start + take])
+            self._pending_rows += take
+            start += take
+            if self._pending_rows >= self.batch_size:
+                self._flush()
+
+    def close(self):
+        self._flush()
+        self._timed(self.writer.close)
+
+    def abort(self):
+        self._pending = []
+        self._pending_rows = 0
+        self.writer.abort()
+
+    def load(self, dataframe):
+        """
+        Memuat satu DataFrame utuh: open, write_batch, lalu close.
+
+        Args:
+            dataframe (pd.DataFrame): Data bersih yang akan dimuat
+
+        Returns:
+            bool: True jika berhasil; error diteruskan setelah writer di-abort
+        """
+        try:
+            with metrics.stage(f'load.{self.name}', per_thread=True) as record:
+                self.open()
+                self.write_batch(dataframe)
+                self.close()
+                record.add_rows(self.rows)
+        except Exception:
+            self.abort()
+            raise
+        return True
+
+    def stats(self):
+        """
+        Ringkasan kinerja sink.
+
+        Returns:
+            dict: Nama, jumlah baris dan batch, detik, serta baris per detik
+        """
+        return {
+            'name': self.name,
+            'rows': self.rows,
+            'batches': self.batches,
+            'seconds': self.seconds,
+            'rows_per_second': self.rows_per_second,
+        }
+
+def register_sink(name, factory, batch_size=None):
+    """
+    Mendaftarkan sink baru ke registry.
+
+    Args:
+        name (str): Nama sink yang ditampilkan pada ringkasan
+        factory (callable): Fungsi tanpa argumen yang membuat writer baru
+        batch_size (int): Ukuran batch yang disukai, None untuk apa adanya
+    """
+    SINK_REGISTRY[name] = {'factory': factory, 'batch_size': batch_size}
+
+def unregister_sink(name):
+    """Menghapus sink dari registry."""
+    SINK_REGISTRY.pop(name, None)
+
+def create_sinks(names=None, max_batch_size=None):
+    """
+    Membuat instance sink dari registry.
+
+    Args:
+        names (list): Nama sink yang dipakai; default semua sink terdaftar
+        max_batch_size (int): Batas atas buffer setiap sink. Pada mode
+            streaming diisi ukuran batch pipeline agar baris langsung
+            diteruskan dan memori tidak ditentukan oleh buffer sink terbesar
+
+    Returns:
+        list: Objek Sink sesuai urutan pendaftaran atau urutan `names`
+    """
+    selected = list(SINK_REGISTRY) if names is None else names
+    sinks = []
+    for name in selected:
+        if name not in SINK_REGISTRY:
+            raise ValueError(f"Sink tidak dikenal: {name}")
+        entry = SINK_REGISTRY[name]
+        batch_size = entry['batch_size']
+        if max_batch_size is not None and batch_size is not None:
+            batch_size = min(batch_size, max_batch_size)
+        sinks.append(Sink(name, entry['factory'](), batch_size=batch_size))
+    return sinks
+
+def load_dataframe(dataframe, sinks):
+    """
+    Memuat satu DataFrame ke semua sink secara paralel.
+
+    Args:
+        dataframe (pd.DataFrame): Data bersih yang akan dimuat
+        sinks (list): Objek Sink dari `create_sinks`
+
+    Returns:
+        list: Hasil `run_loaders` per sink, ditambah statistik sink
+    """
+    results = run_loaders(dataframe, [(sink.name, sink.load) for sink in sinks])
+    for sink, result in zip(sinks, results):
+        result.update(sink.stats(), seconds=result['seconds'])
+    return results
+
+def stream_batches(batches, sinks):
+    """
+    Mengalirkan batch ke semua sink. Sink yang gagal dibuka atau ditulis
+    di-abort dan dilewati tanpa menghentikan sink lainnya.
+
+    Sink baru dibuka saat batch tidak kosong pertama tiba. Jika tidak ada
+    baris sama sekali (misalnya website tidak dapat diakses), tidak ada
+    sink yang dibuka sehingga file, sheet, dan tabel lama tetap utuh, dan
+    semua sink dilaporkan gagal.
+
+    Args:
+        batches (iterable): DataFrame bersih secara berurutan
+        sinks (list): Objek Sink dari `create_sinks`
+
+    Returns:
+        list: Hasil per sink berisi 'success' dan 'error' beserta statistik sink
+    """
+    errors = {}
+
+    def fail(sink, e):
+        try:
+            sink.abort()
+        except Exception:
+            pass
+        errors[sink.name] = str(e)
+        print(f"❌ Error pada sink {sink.name}: {e}")
+
+    def open_sinks():
+        opened = []
+        for sink in sinks:
+            try:
+                sink.open()
+                opened.append(sink)
+            except Exception as e:
+                fail(sink, e)
+        return opened
+
+    active = None
+    try:
+        for batch in batches:
+            if len(batch) == 0:
+                continue
+            if active is None:
+                active = open_sinks()
+            for sink in list(active):
+                try:
+                    sink.write_batch(batch)
+                except Exception as e:
+                    active.remove(sink)
+                    fail(sink, e)
+    except BaseException as e:
+        # Sumber batch gagal: semua sink yang masih terbuka di-abort agar
+        # transaksi, koneksi pool, dan file sementara tidak tertinggal
+        for sink in active or []:
+            fail(sink, e)
+        raise
+
+    if active is None:
+        print(f"⚠️ {NO_DATA_ERROR}, data lama di semua sink tidak diubah.")
+        for sink in sinks:
+            errors[sink.name] = NO_DATA_ERROR
+
+    for sink in active or []:
+        try:
+            sink.close()
+        except Exception as e:
+            fail(sink, e)
+
+    return [dict(sink.stats(), success=sink.name not in errors, error=errors.get(sink.name))
+            for sink in sinks]
+
+# Sink bawaan
+register_sink('CSV', lambda: CsvWriter('products.csv'))
+if pa is not None:
+    register_sink('Parquet', lambda: ColumnarWriter('products.parquet'), batch_size=COLUMNAR_BATCH_SIZE)
+# Snapshot historis per tanggal/jam run; CSV jika pyarrow tidak tersedia
+register_sink('Snapshot', lambda: SnapshotWriter(format='parquet' if pa is not None else 'csv'),
+              batch_size=COLUMNAR_BATCH_SIZE)
+register_sink('Google Sheets', lambda: GoogleSheetsWriter(), batch_size=SHEETS_CHUNK_SIZE)
+register_sink('PostgreSQL', lambda: PostgresWriter('products'), batch_size=POSTGRES_BATCH_SIZE)
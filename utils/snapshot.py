@@ -0,0 +1,154 @@
+import datetime
+import os
+import re
+import pandas as pd
+from utils.load import CsvWriter, ColumnarWriter
+
+# Direktori akar snapshot; partisi berbentuk date=YYYY-MM-DD/run=HH
+SNAPSHOT_DIR = 'snapshots'
+SNAPSHOT_FILE = 'products'
+SNAPSHOT_FORMATS = {'parquet': '.parquet', 'feather': '.feather', 'csv': '.csv'}
+DATE_PARTITION = re.compile(r'^date=(\d{4}-\d{2}-\d{2})$')
+RUN_PARTITION = re.compile(r'^run=(\d{2})$')
+
+def partition_path(base_dir, timestamp):
+    """
+    Membuat path partisi snapshot untuk sebuah waktu run.
+
+    Args:
+        base_dir (str): Direktori akar snapshot
+        timestamp (str | datetime): Waktu run
+
+    Returns:
+        str: Path berbentuk `base_dir/date=YYYY-MM-DD/run=HH`
+    """
+    moment = pd.Timestamp(timestamp)
+    return os.path.join(base_dir, f"date={moment:%Y-%m-%d}", f"run={moment:%H}")
+
+class SnapshotWriter:
+    """
+    Penulis snapshot historis yang dipartisi per tanggal dan jam run.
+
+    Partisi ditentukan dari `Timestamp` terawal pada batch pertama, sehingga
+    seluruh baris satu run masuk ke satu partisi walaupun ekstraksi melewati
+    pergantian jam. Run ulang pada jam yang sama menggantikan snapshot
+    partisi tersebut. Penulisan diteruskan ke ColumnarWriter (Parquet atau
+    Feather) atau CsvWriter.
+    """
+
+    def __init__(self, base_dir=SNAPSHOT_DIR, format='parquet', compression='default'):
+        if format not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Format snapshot tidak dikenal: {format}")
+        self.base_dir = base_dir
+        self.format = format
+        self.compression = compression
+        self.rows = 0
+        self.path = None
+        self._writer = None
+
+    def _create_writer(self, directory):
+        filename = os.path.join(directory, SNAPSHOT_FILE + SNAPSHOT_FORMATS[self.format])
+        if self.format == 'csv':
+            return CsvWriter(filename)
+        return ColumnarWriter(filename, format=self.format, compression=self.compression)
+
+    def open(self):
+        self.rows = 0
+        self.path = None
+        self._writer = None
+
+    def write(self, dataframe):
+        if self._writer is None:
+            run_start = pd.to_datetime(dataframe['Timestamp']).min()
+            directory = partition_path(self.base_dir, run_start)
+            os.makedirs(directory, exist_ok=True)
+            self._writer = self._create_writer(directory)
+            self._writer.open()
+            self.path = self._writer.filename
+        self._writer.write(dataframe)
+        self.rows += len(dataframe)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.abort()
+
+def _parse_date(value):
+    if value is None or isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
+def list_partitions(base_dir=SNAPSHOT_DIR, start=None, end=None):
+    """
+    Mencari partisi snapshot dalam rentang tanggal tanpa membuka file data.
+
+    Args:
+        base_dir (str): Direktori akar snapshot
+        start (str | date): Tanggal awal (inklusif), None untuk tanpa batas
+        end (str | date): Tanggal akhir (inklusif), None untuk tanpa batas
+
+    Returns:
+        list: Tuple (tanggal, jam run, path file) terurut secara kronologis
+    """
+    start, end = _parse_date(start), _parse_date(end)
+    if not os.path.isdir(base_dir):
+        return []
+
+    partitions = []
+    for date_dir in sorted(os.listdir(base_dir)):
+        match = DATE_PARTITION.match(date_dir)
+        if not match:
+            continue
+        date = datetime.date.fromisoformat(match.group(1))
+        # Pruning: partisi di luar rentang tidak pernah dibuka
+        if (start and date < start) or (end and date > end):
+            continue
+        for run_dir in sorted(os.listdir(os.path.join(base_dir, date_dir))):
+            run_match = RUN_PARTITION.match(run_dir)
+            if not run_match:
+                continue
+            directory = os.path.join(base_dir, date_dir, run_dir)
+            for extension in SNAPSHOT_FORMATS.values():
+                path = os.path.join(directory, SNAPSHOT_FILE + extension)
+                if os.path.exists(path):
+                    partitions.append((date, int(run_match.group(1)), path))
+                    break
+    return partitions
+
+def _read_file(path, columns):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+    if path.endswith('.feather'):
+        return pd.read_feather(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+def read_snapshots(base_dir=SNAPSHOT_DIR, start=None, end=None, columns=None):
+    """
+    Membaca snapshot historis dalam rentang tanggal.
+
+    Hanya file pada partisi di dalam rentang yang dibuka, dan untuk Parquet
+    serta Feather hanya kolom yang diminta yang dibaca dari disk.
+
+    Args:
+        base_dir (str): Direktori akar snapshot
+        start (str | date): Tanggal awal (inklusif)
+        end (str | date): Tanggal akhir (inklusif)
+        columns (list): Kolom yang dibaca; None untuk semua kolom
+
+    Returns:
+        pd.DataFrame: Gabungan snapshot dengan kolom tambahan
+        `snapshot_date` dan `snapshot_run`
+    """
+    frames = []
+    for date, run, path in list_partitions(base_dir, start, end):
+        frame = _read_file(path, columns)
+        frame['snapshot_date'] = pd.Timestamp(date)
+        frame['snapshot_run'] = run
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=list(columns or []) + ['snapshot_date', 'snapshot_run'])
+    return pd.concat(frames, ignore_index=True)
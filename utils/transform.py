@@ -1,19 +1,331 @@
 import pandas as pd
-import re
+from collections.abc import Iterator
+from utils import metrics
+from utils.dedup import KeyDeduplicator, dedup_key_columns, DEDUP_MEMORY_KEYS
 
 # Nilai tukar Dolar ke Rupiah
 EXCHANGE_RATE = 16000
 
-def transform_data(data: list):
+# Tipe data akhir setiap kolom hasil transformasi
+COLUMN_TYPES = {
+    'Title': 'object',
+    'Price': 'float64',
+    'Rating': 'float64',
+    'Colors': 'int64',
+    'Size': 'object',
+    'Gender': 'object',
+    'Timestamp': 'object'
+}
+
+def compact_dtypes(df):
+    """
+    Mengubah DataFrame hasil transformasi ke skema ringkas (compact=True)
+    untuk menghemat memori. Colors diturunkan ke integer terkecil yang muat
+    (int8 untuk data normal).
+    
+    Args:
+        df (pd.DataFrame): Data dengan tipe `COLUMN_TYPES`
+        
+    Returns:
+        pd.DataFrame: Salinan dengan Size/Gender kategorikal, Timestamp
+        datetime64, Colors integer kecil, dan Rating float32
+    """
+    return df.assign(
+        Rating=df['Rating'].astype('float32'),
+        Colors=pd.to_numeric(df['Colors'], downcast='integer'),
+        Size=df['Size'].astype('category'),
+        Gender=df['Gender'].astype('category'),
+        # format='ISO8601' (pandas>=2.0) menerima Timestamp dengan dan tanpa mikrodetik
+        Timestamp=pd.to_datetime(df['Timestamp'], format='ISO8601'),
+    )
+
+def standard_dtypes(df):
+    """
+    Mengembalikan DataFrame berskema ringkas ke tipe `COLUMN_TYPES`.
+    
+    Timestamp dikembalikan ke string ISO seperti hasil ekstraksi, dan
+    float32 dikonversi lewat representasi teksnya agar 4.8 tetap 4.8.
+    DataFrame yang sudah bertipe standar dikembalikan apa adanya.
+    
+    Args:
+        df (pd.DataFrame): Data berskema ringkas atau standar
+        
+    Returns:
+        pd.DataFrame: Data dengan tipe `COLUMN_TYPES`
+    """
+    converted = {}
+    for column, dtype in COLUMN_TYPES.items():
+        if column not in df.columns or str(df[column].dtype) == dtype:
+            continue
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            converted[column] = series.map(lambda value: value.isoformat()).astype(dtype)
+        elif series.dtype == 'float32':
+            converted[column] = series.astype(str).astype(dtype)
+        else:
+            converted[column] = series.astype(dtype)
+    return df.assign(**converted) if converted else df
+
+# Pola angka pada kolom Rating dan Colors
+RATING_PATTERN = r'(\d+\.?\d*)'
+COLORS_PATTERN = r'(\d+)'
+
+def extract_number(series, pattern, invalid_value):
+    """
+    Mengekstrak angka pertama dari setiap nilai secara vektor.
+    
+    Args:
+        series (pd.Series): Kolom berisi teks mentah
+        pattern (str): Regex dengan satu grup tangkapan untuk angka
+        invalid_value (str): Penanda nilai tidak valid dari tahap ekstraksi
+        
+    Returns:
+        pd.Series: Angka bertipe float, NaN jika tidak valid
+    """
+    invalid = series.isna() | (series == invalid_value)
+    numbers = pd.to_numeric(series.astype(str).str.extract(pattern, expand=False), errors='coerce')
+    return numbers.mask(invalid)
+
+# Aturan validasi sesuai urutan pembersihan: (nama aturan, label langkah)
+VALIDATION_RULES = [
+    ('unknown_product', "Setelah menghapus 'Unknown Product'"),
+    ('price', "Setelah membersihkan Price"),
+    ('rating', "Setelah membersihkan Rating"),
+    ('colors', "Setelah membersihkan Colors"),
+    ('size_gender', "Setelah membersihkan Size dan Gender"),
+    ('duplicate', "Setelah menghapus duplikat"),
+]
+
+class RejectionReport:
+    """
+    Laporan baris yang ditolak per aturan validasi.
+
+    Setiap baris ditolak oleh aturan pertama yang gagal sesuai urutan
+    `VALIDATION_RULES` (`rejected`), sedangkan `failed` menghitung semua baris
+    yang gagal pada aturan tersebut. Jika `sample_size` > 0, beberapa baris
+    mentah yang ditolak ikut disimpan sebagai contoh. Laporan dapat diisi
+    berulang kali, misalnya untuk setiap batch pada mode streaming.
+    """
+
+    def __init__(self, sample_size=0):
+        self.sample_size = sample_size
+        self.input_rows = 0
+        self.output_rows = 0
+        self.rules = {
+            name: {'rejected': 0, 'failed': 0, 'samples': []}
+            for name, _ in VALIDATION_RULES
+        }
+
+    def record(self, rule, rejected, failed=None, raw=None):
+        """
+        Mencatat hasil sebuah aturan.
+
+        Args:
+            rule (str): Nama aturan dari `VALIDATION_RULES`
+            rejected (pd.Series): Mask baris yang pertama kali ditolak aturan ini
+            failed (pd.Series): Mask semua baris yang gagal; default `rejected`
+            raw (pd.DataFrame): Data mentah untuk diambil contohnya
+        """
+        entry = self.rules[rule]
+        entry['rejected'] += int(rejected.sum())
+        entry['failed'] += int((failed if failed is not None else rejected).sum())
+
+        room = self.sample_size - len(entry['samples'])
+        if raw is not None and room > 0 and rejected.any():
+            entry['samples'].extend(raw[rejected.values].head(room).to_dict('records'))
+
+    def merge(self, other):
+        """
+        Menambahkan isi laporan lain ke laporan ini.
+
+        Args:
+            other (RejectionReport): Laporan yang akan digabung
+        """
+        self.input_rows += other.input_rows
+        self.output_rows += other.output_rows
+        for name, entry in other.rules.items():
+            merged = self.rules[name]
+            merged['rejected'] += entry['rejected']
+            merged['failed'] += entry['failed']
+            room = max(self.sample_size - len(merged['samples']), 0)
+            merged['samples'].extend(entry['samples'][:room])
+
+    @property
+    def rejected_rows(self):
+        return sum(entry['rejected'] for entry in self.rules.values())
+
+    def step_counts(self):
+        """
+        Menghitung jumlah baris tersisa setelah setiap langkah.
+
+        Returns:
+            list: Pasangan (label langkah, jumlah baris tersisa)
+        """
+        remaining = self.input_rows
+        counts = []
+        for name, label in VALIDATION_RULES:
+            remaining -= self.rules[name]['rejected']
+            counts.append((label, remaining))
+        return counts
+
+    def to_dict(self):
+        """
+        Mengubah laporan menjadi dictionary yang siap diserialisasi.
+
+        Returns:
+            dict: Jumlah baris masuk, keluar, dan rincian per aturan
+        """
+        return {
+            'input_rows': self.input_rows,
+            'output_rows': self.output_rows,
+            'rejected_rows': self.rejected_rows,
+            'rules': {name: dict(entry, samples=list(entry['samples']))
+                      for name, entry in self.rules.items()},
+        }
+
+def _clean_frame(df, report):
+    """
+    Menjalankan langkah pembersihan 1-5 pada sebuah DataFrame.
+    
+    Setiap aturan dihitung sekali secara vektor atas seluruh baris sebagai
+    kolom boolean, lalu digabung menjadi satu mask validitas; baris tidak
+    valid dibuang dalam satu langkah filter.
+    
+    Args:
+        df (pd.DataFrame): Data mentah; kolom hasil konversi ditulis ulang
+            langsung pada DataFrame ini
+        report (RejectionReport): Laporan yang diisi jumlah baris per aturan
+        
+    Returns:
+        pd.DataFrame: Data yang sudah dibersihkan, belum dideduplikasi
+    """
+    # 1. Produk yang tidak valid
+    title = df['Title'] != 'Unknown Product'
+
+    # 2. Kolom 'Price': ubah menjadi numerik lalu kalikan dengan kurs
+    price = pd.to_numeric(df['Price'], errors='coerce') * EXCHANGE_RATE
+
+    # 3. Kolom 'Rating': ekstrak angka rating saja sebagai float
+    rating = extract_number(df['Rating'], RATING_PATTERN, 'Invalid')
+
+    # 4. Kolom 'Colors': ekstrak angka jumlah warna
+    colors = extract_number(df['Colors'], COLORS_PATTERN, 'N/A')
+    
+    # 5. Bersihkan kolom Size dan Gender dari prefix
+    size = df['Size'].astype(str).str.replace('Size:', '').str.strip()
+    gender = df['Gender'].astype(str).str.replace('Gender:', '').str.strip()
+    
+    rules = [
+        ('unknown_product', title),
+        ('price', price.notna()),
+        ('rating', rating.notna()),
+        ('colors', colors.notna()),
+        ('size_gender', (size != 'N/A') & (gender != 'N/A')),
+    ]
+    
+    report.input_rows += len(df)
+    raw = df if report.sample_size > 0 else None
+    valid = pd.Series(True, index=df.index)
+    for name, rule in rules:
+        report.record(name, valid & ~rule, failed=~rule, raw=raw)
+        valid &= rule
+    
+    df['Price'] = price
+    df['Rating'] = rating
+    df['Colors'] = colors
+    df['Size'] = size
+    df['Gender'] = gender
+    
+    # Buang semua baris tidak valid dalam satu langkah
+    return df[valid.values]
+
+def transform_batches(batches, report=None, compact=False, key_columns=None,
+                      memory_keys=DEDUP_MEMORY_KEYS):
+    """
+    Membersihkan data produk secara bertahap, batch demi batch.
+    
+    Duplikat dihapus lintas batch berdasarkan hash kolom kunci setiap baris
+    yang sudah dikirim (lihat `KeyDeduplicator`), sehingga hasilnya sama
+    dengan `transform_data` pada seluruh data sekaligus tanpa perlu
+    menampung semua baris di memori.
+    
+    Args:
+        batches (iterable): Batch berisi daftar produk mentah
+        report (RejectionReport): Laporan penolakan yang diakumulasi lintas batch
+        compact (bool): Ubah setiap batch ke skema ringkas `compact_dtypes`
+        key_columns (list): Kolom kunci duplikat; default semua kolom kecuali
+            Timestamp
+        memory_keys (int): Jumlah hash kunci di memori sebelum dipindahkan
+            ke file SQLite sementara
+        
+    Yields:
+        pd.DataFrame: Batch yang sudah bersih dan siap dimuat
+    """
+    if report is None:
+        report = RejectionReport()
+    deduplicator = KeyDeduplicator(key_columns, memory_keys=memory_keys)
+    try:
+        for batch in batches:
+            if len(batch) == 0:
+                continue
+            try:
+                with metrics.stage('transform.batch') as record:
+                    df = pd.DataFrame(batch)
+                    if isinstance(batch, pd.DataFrame):
+                        df = df.copy()
+                    df = _clean_frame(df, report)
+                    df = df.astype(COLUMN_TYPES)
+                    
+                    # 6. Hapus duplikat di dalam batch dan terhadap batch sebelumnya
+                    keep = deduplicator.keep_mask(df)
+                    report.record('duplicate', ~keep, raw=df if report.sample_size > 0 else None)
+                    df = df[keep.values]
+                    record.add_rows(len(df))
+            except Exception as e:
+                print(f"Terjadi error saat transformasi batch: {e}")
+                continue
+            
+            report.output_rows += len(df)
+            if not df.empty:
+                yield compact_dtypes(df) if compact else df
+    finally:
+        deduplicator.close()
+
+def transform_data(data: list, report=None, verbose=True, compact=False, key_columns=None):
     """
     Membersihkan dan mentransformasi data produk.
     
     Args:
-        data (list): Daftar produk mentah dari tahap ekstraksi.
+        data (list | iterator): Daftar produk mentah dari tahap ekstraksi,
+            atau iterator berisi batch produk (misalnya dari
+            `scrape_product_batches`) yang dibersihkan batch demi batch.
+        report (RejectionReport): Laporan yang diisi jumlah baris yang
+            ditolak per aturan; jika None, laporan hanya dipakai internal
+        verbose (bool): Cetak jumlah baris setelah setiap langkah
+        compact (bool): Kembalikan skema ringkas `compact_dtypes`
+            (kategori, datetime64, int8, float32) untuk menghemat memori;
+            loader mengembalikannya ke tipe standar saat menulis
+        key_columns (list): Kolom yang menentukan duplikat; default semua
+            kolom kecuali Timestamp, yang berbeda untuk setiap produk
         
     Returns:
         pd.DataFrame: DataFrame yang sudah bersih dan siap dimuat.
     """
+    if report is None:
+        report = RejectionReport()
+    
+    if isinstance(data, Iterator):
+        cleaned_batches = list(transform_batches(data, report, key_columns=key_columns))
+        if not cleaned_batches:
+            print("Tidak ada data untuk ditransformasi.")
+            return pd.DataFrame()
+        df = pd.concat(cleaned_batches, ignore_index=True)
+        if compact:
+            # Setelah digabung agar kategori Size/Gender sama untuk semua baris
+            df = compact_dtypes(df)
+        print(f"Transformasi selesai. Jumlah data bersih: {len(df)}")
+        return df
+    
     if not data:
         print("Tidak ada data untuk ditransformasi.")
         return pd.DataFrame()
@@ -21,71 +333,28 @@ def transform_data(data: list):
     try:
         # Buat DataFrame dari data mentah
         df = pd.DataFrame(data)
-        print(f"Data awal: {len(df)} baris")
-
-        # 1. Hapus produk yang tidak valid
-        df = df[df['Title'] != 'Unknown Product'].copy()
-        print(f"Setelah menghapus 'Unknown Product': {len(df)} baris")
-
-        # 2. Transformasi kolom 'Price'
-        # Ubah menjadi numerik, kalikan dengan kurs, tangani nilai yang tidak valid
-        df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
-        df = df.dropna(subset=['Price']).copy()
-        df['Price'] = df['Price'] * EXCHANGE_RATE
-        print(f"Setelah membersihkan Price: {len(df)} baris")
-
-        # 3. Transformasi kolom 'Rating'
-        # Ekstrak angka rating saja dan konversi ke float
-        def clean_rating(rating_str):
-            if pd.isna(rating_str) or rating_str == 'Invalid':
-                return None
-            # Ekstrak angka dari string rating
-            match = re.search(r'(\d+\.?\d*)', str(rating_str))
-            if match:
-                return float(match.group(1))
-            return None
         
-        df['Rating'] = df['Rating'].apply(clean_rating)
-        df = df.dropna(subset=['Rating']).copy()
-        print(f"Setelah membersihkan Rating: {len(df)} baris")
-
-        # 4. Transformasi kolom 'Colors'
-        # Ekstrak angka jumlah warna dan konversi ke integer
-        def clean_colors(colors_str):
-            if pd.isna(colors_str) or colors_str == 'N/A':
-                return None
-            # Ekstrak angka dari string colors
-            match = re.search(r'(\d+)', str(colors_str))
-            if match:
-                return int(match.group(1))
-            return None
+        # Laporan terpisah untuk panggilan ini agar jumlah per langkah tepat
+        step_report = RejectionReport(sample_size=report.sample_size)
+        df = _clean_frame(df, step_report)
         
-        df['Colors'] = df['Colors'].apply(clean_colors)
-        df = df.dropna(subset=['Colors']).copy()
-        print(f"Setelah membersihkan Colors: {len(df)} baris")
-        
-        # 5. Bersihkan kolom Size dan Gender dari prefix
-        df['Size'] = df['Size'].astype(str).str.replace('Size:', '').str.strip()
-        df['Gender'] = df['Gender'].astype(str).str.replace('Gender:', '').str.strip()
-        
-        # Hapus data dengan Size atau Gender yang tidak valid
-        df = df[(df['Size'] != 'N/A') & (df['Gender'] != 'N/A')].copy()
-        print(f"Setelah membersihkan Size dan Gender: {len(df)} baris")
-        
-        # 6. Hapus duplikat
-        df = df.drop_duplicates().copy()
-        print(f"Setelah menghapus duplikat: {len(df)} baris")
+        # 6. Hapus duplikat berdasarkan kolom kunci
+        duplicated = df.duplicated(subset=dedup_key_columns(list(df.columns), key_columns))
+        step_report.record('duplicate', duplicated,
+                           raw=df if step_report.sample_size > 0 else None)
+        df = df[~duplicated.values]
         
         # 7. Pastikan tipe data sesuai
-        df = df.astype({
-            'Title': 'object',
-            'Price': 'float64',
-            'Rating': 'float64',
-            'Colors': 'int64',
-            'Size': 'object',
-            'Gender': 'object',
-            'Timestamp': 'object'
-        })
+        df = df.astype(COLUMN_TYPES)
+        if compact:
+            df = compact_dtypes(df)
+        step_report.output_rows = len(df)
+        report.merge(step_report)
+        
+        if verbose:
+            print(f"Data awal: {step_report.input_rows} baris")
+            for label, remaining in step_report.step_counts():
+                print(f"{label}: {remaining} baris")
         
         print(f"Transformasi selesai. Jumlah data bersih: {len(df)}")
         return df
@@ -93,4 +362,4 @@ def transform_data(data: list):
     except Exception as e:
         # Fitur Advanced: Tangani error tak terduga selama transformasi
         print(f"Terjadi error saat transformasi: {e}")
-        return pd.DataFrame()  # Kembalikan DataFrame kosong jika error
\ No newline at end of file
+        return pd.DataFrame()  # Kembalikan DataFrame kosong jika error
@@ -1,4 +1,5 @@
 import pandas as pd
+from utils.dedup import dedup_key_columns
 
 EXCHANGE_RATE = 16000
 
@@ -35,7 +36,8 @@ def transform_data(data):
         df.dropna(subset=["Rating"], inplace=True)
         df["Colors"] = pd.to_numeric(df["Colors"], errors="coerce").fillna(0).astype(int, errors="ignore")
 
-        df.drop_duplicates(inplace=True)
+        # Timestamp berbeda untuk setiap produk, sehingga tidak ikut dibandingkan
+        df.drop_duplicates(subset=dedup_key_columns(list(df.columns)), inplace=True)
         df.dropna(inplace=True)
         df = df[df["Title"] != "Unknown Product"]
 